@@ -0,0 +1,148 @@
+"""
+Accoun-T AI 해설 생성 (Streamlit 없이 import 가능)
+
+해설은 모델이 만드는 대로 조각(chunk) 단위로 받아서 화면에 바로 흘려보낸다 (st.write_stream).
+SolutionStream 이 조각을 모으면서 취소 여부를 확인하고, 끝까지 받은 경우에만 저장할 텍스트가 된다.
+
+모델 클라이언트는 stream(prompt) -> 텍스트 조각 iterator 하나만 있으면 되므로 교체할 수 있다.
+  - GeminiClient : google-generativeai (generate_content(stream=True))
+  - FakeStreamClient : 네트워크 없이 정해진 텍스트를 조금씩 흘려보내는 로컬/테스트용
+
+secrets.toml [gemini] api_key = "...", model = "gemini-2.5-flash"
+환경변수 ACCOUNT_T_AI_CLIENT=fake 이면 API 키 없이 가짜 클라이언트로 실행
+"""
+import os
+import threading
+import time
+
+MODEL_NAME = "gemini-2.5-flash"
+SOLUTION_TITLE = "🤖 AI 선생님의 해설"
+
+FAKE_SOLUTION = (
+    "### 1단계: 문제 파악\n"
+    "문제에서 묻는 금액과 주어진 조건을 정리합니다.\n\n"
+    "### 2단계: 계산\n"
+    "관련 기준서의 산식에 숫자를 대입해 차례로 계산합니다.\n\n"
+    "### 3단계: 결론\n"
+    "계산 결과와 보기를 비교해 정답을 고릅니다."
+)
+
+
+def solution_prompt(question):
+    """구조화된 단계별 해설을 유도하는 프롬프트"""
+    return f"""
+    문제: {question.get('content_markdown', '')}
+    위 문제에 대해 초심자도 이해하기 쉬운 단계별 해설을 작성해줘.
+    형식은 자유롭게 하되, 마크다운을 적절히 사용해.
+    """
+
+
+def solution_steps(text):
+    """DB 에 저장할 해설 포맷 (questions.solution_steps)"""
+    return [{"title": SOLUTION_TITLE, "content": text}]
+
+
+# =========================================================
+# 1. 모델 클라이언트
+# =========================================================
+class GeminiClient:
+    def __init__(self, api_key=None, model_name=MODEL_NAME):
+        import google.generativeai as genai
+        if api_key:
+            genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self._model = genai.GenerativeModel(model_name)
+
+    def stream(self, prompt):
+        response = self._model.generate_content(prompt, stream=True)
+        for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:  # 안전 필터 등으로 텍스트 part 가 없는 조각
+                continue
+            if text:
+                yield text
+
+
+class FakeStreamClient:
+    """text 를 chunk_size 글자씩 delay 초 간격으로 흘려보내는 가짜 클라이언트 (받은 프롬프트는 prompts 에 기록)"""
+
+    def __init__(self, text=FAKE_SOLUTION, chunk_size=12, delay=0.02):
+        self.text, self.chunk_size, self.delay = text, chunk_size, delay
+        self.prompts = []
+
+    def stream(self, prompt):
+        self.prompts.append(prompt)
+        for i in range(0, len(self.text), self.chunk_size):
+            if self.delay: time.sleep(self.delay)
+            yield self.text[i:i + self.chunk_size]
+
+
+def ai_config_from_env(section=None):
+    """secrets.toml [gemini] 섹션(dict)에 환경변수를 덮어써서 최종 설정 (client: 'gemini' | 'fake' | None)"""
+    conf = dict(section or {})
+    if os.environ.get("ACCOUNT_T_AI_CLIENT"): conf["client"] = os.environ["ACCOUNT_T_AI_CLIENT"]
+    conf.setdefault("client", "gemini" if conf.get("api_key") else None)
+    return conf
+
+
+def create_client(conf):
+    """conf['client'] 에 맞는 클라이언트 (None 이면 AI 기능 끔)"""
+    kind = conf.get("client")
+    if kind is None:
+        return None
+    if kind == "gemini":
+        return GeminiClient(conf.get("api_key"), conf.get("model", MODEL_NAME))
+    if kind == "fake":
+        return FakeStreamClient(delay=float(conf.get("fake_delay", 0.02)))
+    raise ValueError(f"알 수 없는 AI 클라이언트: {kind}")
+
+
+# =========================================================
+# 2. 스트림 (누적 / 취소)
+# =========================================================
+class SolutionStream:
+    """
+    클라이언트 조각 iterator 를 감싸서 받은 텍스트를 모은다. st.write_stream 에 그대로 넘긴다.
+    cancel() 되거나 소비가 중간에 끊기면(rerun) 원본 스트림을 닫고 completed 는 False 로 남는다.
+    """
+
+    def __init__(self, chunks, cancel_event=None):
+        self._chunks = chunks
+        self.cancel_event = cancel_event or threading.Event()
+        self._parts = []
+        self.completed = False
+        self.cancelled = False
+        self.first_chunk_ms = None
+        self.total_ms = None
+
+    def __iter__(self):
+        t0 = time.perf_counter()
+        it = iter(self._chunks)
+        try:
+            for piece in it:
+                if self.cancel_event.is_set():
+                    self.cancelled = True
+                    break
+                if self.first_chunk_ms is None:
+                    self.first_chunk_ms = (time.perf_counter() - t0) * 1000.0
+                self._parts.append(piece)
+                yield piece
+            else:
+                self.completed = True
+        finally:
+            self.total_ms = (time.perf_counter() - t0) * 1000.0
+            close = getattr(it, "close", None)
+            if close: close()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def text(self):
+        return "".join(self._parts)
+
+
+def stream_solution(client, question, cancel_event=None):
+    """문제 하나의 해설 스트림"""
+    return SolutionStream(client.stream(solution_prompt(question)), cancel_event)
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+Accoun-T 학습 분석 (Streamlit / DB 없이 import 가능)
+
+Tab 3(유형별 기출) 채점과 Tab 4(모의고사) 제출에서 나온 풀이 기록을 사용자별 문서 하나
+(user_stats/{user_id}) 의 누적 집계(rollup)로 반영한다. 집계는 차원(주제/태그/연도)별로
+    {"topic": {"감가상각": {"attempts": 12, "correct": 7, "last_at": 1767225600.0, "last_correct": false}}, ...}
+형태이고, 횟수는 저장소의 increment_document 로 '더하기'만 하므로 전체 이력을 다시 읽지 않는다.
+약점 주제 화면과 필터 프리셋은 이 문서 한 개만 읽는다.
+"""
+import time
+
+DIMENSIONS = {"topic": "주제", "tag": "태그", "year": "연도"}
+WEAK_ACCURACY = 0.6      # 정답률이 이보다 낮으면 약점
+MIN_ATTEMPTS = 2         # 시도 횟수가 이보다 적으면 판단 보류
+
+
+def answer_event(question, correct, source, at=None):
+    """문항 하나를 풀었다는 기록 (source: 'tab3' | 'tab4')"""
+    info = question.get('exam_info') or {}
+    tags = question.get('tags') or []
+    return {
+        "question_id": question.get('question_id'),
+        "topic": question.get('topic') or "기타",
+        "tags": tags if isinstance(tags, list) else [],
+        "year": info.get('year'),
+        "correct": bool(correct),
+        "source": source,
+        "at": time.time() if at is None else at,
+    }
+
+
+def attempt_events(attempt, questions, at=None):
+    """제출한 ExamAttempt 에서 응답한 문항들의 기록 (미응답 문항은 제외)"""
+    answered = attempt.answers != 0
+    hit = answered & (attempt.answers == attempt.key)
+    return [answer_event(q, hit[i], "tab4", at) for i, q in enumerate(questions) if answered[i]]
+
+
+def _buckets(event):
+    """기록 하나가 반영되는 (차원, 키) 목록"""
+    keys = [("topic", str(event["topic"]))]
+    keys += [("tag", str(t)) for t in dict.fromkeys(event["tags"])]
+    if event.get("year"): keys.append(("year", str(event["year"])))
+    return keys
+
+
+def rollup_updates(events):
+    """
+    기록 묶음 -> (increments, fields)
+    increments: 더할 횟수 (중첩 dict, 숫자만), fields: 덮어쓸 최신 값 (last_at, last_correct)
+    같은 묶음 안에서는 미리 합쳐서 저장소 쓰기는 한 번이면 된다.
+    """
+    increments, fields = {"total": {"attempts": 0, "correct": 0}}, {}
+    for ev in sorted(events, key=lambda e: e["at"]):
+        ok = int(ev["correct"])
+        increments["total"]["attempts"] += 1
+        increments["total"]["correct"] += ok
+        for dim, key in _buckets(ev):
+            inc = increments.setdefault(dim, {}).setdefault(key, {"attempts": 0, "correct": 0})
+            inc["attempts"] += 1
+            inc["correct"] += ok
+            fields.setdefault(dim, {})[key] = {"last_at": ev["at"], "last_correct": ev["correct"]}
+    fields["updated_at"] = max((ev["at"] for ev in events), default=None)
+    return increments, fields
+
+
+def weak_topics(stats, dim="topic", min_attempts=MIN_ATTEMPTS, threshold=WEAK_ACCURACY, limit=None):
+    """
+    user_stats 문서 -> 정답률 낮은 순 행 리스트 (같은 정답률이면 많이 틀린 순, 최근 순)
+    threshold=None 이면 약점 여부와 상관없이 전체
+    """
+    rows = []
+    for key, b in ((stats or {}).get(dim) or {}).items():
+        attempts = int(b.get("attempts", 0))
+        if attempts < min_attempts: continue
+        acc = b.get("correct", 0) / attempts
+        if threshold is not None and acc >= threshold: continue
+        rows.append({
+            "name": key, "attempts": attempts, "correct": int(b.get("correct", 0)), "accuracy": round(acc, 3),
+            "last_at": b.get("last_at"), "last_correct": b.get("last_correct"),
+        })
+    rows.sort(key=lambda r: (r["accuracy"], -(r["attempts"] - r["correct"]), -(r["last_at"] or 0)))
+    return rows[:limit] if limit else rows
+
+
+def weak_filter_preset(stats, base_filters=None, limit=5):
+    """
+    advanced_filter_questions 용 필터: 약점 주제/태그를 keywords 로 (없으면 None)
+    연도/시험/난이도 조건은 base_filters 를 그대로 쓴다.
+    """
+    names = [r["name"] for r in weak_topics(stats, "topic", limit=limit)]
+    names += [r["name"] for r in weak_topics(stats, "tag", limit=limit) if r["name"] not in names]
+    if not names:
+        return None
+    filters = dict(base_filters or {})
+    filters['keywords'] = names
+    return filters
\ No newline at end of file
@@ -1,246 +1,214 @@
 import re
 import time
+import threading
 import streamlit as st
+from streamlit.errors import StreamlitInvalidLayoutContextError
 import pandas as pd
+import numpy as np
 import json
 import firebase_admin
-from firebase_admin import credentials, firestore
-import google.generativeai as genai
+from firebase_admin import credentials
 from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, DataReturnMode
 import uuid  # 블록 ID 생성을 위해 추가
+import os
+import snapshot
+import storage
+import perf
+import ai_tutor
+
+_rerun_t0 = time.perf_counter()  # rerun 전체 시간 (스크립트 끝에서 기록)
 
 # =========================================================
 # 1. 시스템 설정 및 초기화
 # =========================================================
 st.set_page_config(page_title="Accoun-T Cloud", layout="wide", page_icon="☁️")
 
-# (1) Firebase 초기화
-if "firestore_db" not in st.session_state:
-    if not firebase_admin._apps:
-        try:
-            key_dict = dict(st.secrets["firestore"])
-            if "private_key" in key_dict:
-                key_dict["private_key"] = key_dict["private_key"].replace("\\n", "\n")
-            cred = credentials.Certificate(key_dict)
-            firebase_admin.initialize_app(cred)
-        except Exception as e:
-            st.error(f"🔥 Firebase 연결 실패: {e}")
-            st.stop()
-    st.session_state.firestore_db = firestore.client()
-
-db = st.session_state.firestore_db
-
-# (2) Gemini API 초기화
-GEMINI_AVAILABLE = False
-if "gemini" in st.secrets:
+def get_secret_section(name):
+    """secrets.toml 섹션 조회 (secrets 파일이 없는 로컬/스냅샷 실행에서는 None)"""
     try:
-        genai.configure(api_key=st.secrets["gemini"]["api_key"])
-        GEMINI_AVAILABLE = True
-    except:
-        pass
+        return dict(st.secrets[name]) if name in st.secrets else None
+    except Exception:
+        return None
+
+# (1) 저장소 초기화 (Firestore 또는 로컬 SQLite)
+# secrets.toml: [storage] backend = "sqlite", path = "data/account_t.db", seed_snapshot = "snapshots/..."
+# 스냅샷 경로만 주면 (seed_snapshot 또는 ACCOUNT_T_SNAPSHOT) 메모리 SQLite에 올려서 부팅
+def _firestore_client():
+    from firebase_admin import firestore
+    if not firebase_admin._apps:
+        key_dict = dict(st.secrets["firestore"])
+        if "private_key" in key_dict:
+            key_dict["private_key"] = key_dict["private_key"].replace("\\n", "\n")
+        cred = credentials.Certificate(key_dict)
+        firebase_admin.initialize_app(cred)
+    return firestore.client()
+
+STORAGE_CONF = storage.storage_config_from_env(get_secret_section("storage"))
+SNAPSHOT_PATH = STORAGE_CONF.get("seed_snapshot")
+
+@st.cache_resource
+def get_store(backend, path, seed_snapshot):
+    """프로세스당 한 번만 저장소 생성 (모든 세션이 공유)"""
+    conf = {"backend": backend, "path": path, "seed_snapshot": seed_snapshot}
+    # 문서 읽기/쓰기/삭제 수를 세션·기능별로 집계 (Performance 탭)
+    store = storage.MeteredStorage(storage.create_storage(conf, firestore_client_factory=_firestore_client))
+    # 저장소 읽기/쓰기 호출마다 시간 측정 (Performance 탭)
+    return perf.instrument_object(store, [
+        "list_documents", "list_document_fields", "get_document", "find_exam_questions", "find_user_notes",
+        "set_document", "update_document", "delete_document", "save_batch", "increment_document",
+    ], f"storage.{backend}")
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+_run_ctx = get_script_run_ctx()
+storage.set_current_session(_run_ctx.session_id if _run_ctx else None)
+
+try:
+    store = get_store(STORAGE_CONF["backend"], STORAGE_CONF.get("path", ":memory:"), STORAGE_CONF.get("seed_snapshot"))
+except Exception as e:
+    st.error(f"🔥 저장소 연결 실패 ({STORAGE_CONF['backend']}): {e}")
+    st.stop()
+
+# (2) AI 해설 클라이언트 (Gemini 스트리밍, ACCOUNT_T_AI_CLIENT=fake 이면 로컬 가짜 스트림)
+AI_CONF = ai_tutor.ai_config_from_env(get_secret_section("gemini"))
+
+@st.cache_resource
+def get_ai_client(client, model, api_key):
+    try: return ai_tutor.create_client(dict(AI_CONF, client=client, model=model, api_key=api_key))
+    except: return None
+
+ai_client = get_ai_client(AI_CONF.get("client"), AI_CONF.get("model", ai_tutor.MODEL_NAME), AI_CONF.get("api_key"))
+GEMINI_AVAILABLE = ai_client is not None
 
 # =========================================================
-# 2. Simulator Engine
+# 2. Simulator Engine (simulators.py) / 순수 데이터 로직 (data_logic.py)
 # =========================================================
-class Simulators:
-    @staticmethod
-    def bond_basic(face, crate, mrate, periods, redeem_stats=None):
-        """
-        redeem_stats = {'period': 2, 'amount': 98000} (선택사항)
-        """
-        cash_flow = face * crate
-        pv_principal = face / ((1 + mrate) ** periods)
-        pv_interest = sum([cash_flow / ((1 + mrate) ** t) for t in range(1, periods + 1)])
-        price = pv_principal + pv_interest
-        
-        data = []
-        book_value = price
-        data.append({"기간": 0, "유효이자": "-", "표시이자": "-", "상각액": "-", "장부금액": f"{int(book_value):,}"})
-        
-        # 상각표 작성
-        bv_dict = {0: book_value} # 기간별 장부금액 저장
-        
-        for t in range(1, periods + 1):
-            ie = book_value * mrate
-            cp = face * crate
-            am = ie - cp
-            book_value += am
-            bv_dict[t] = book_value
-            data.append({
-                "기간": t,
-                "유효이자": f"{int(ie):,}", "표시이자": f"{int(cp):,}",
-                "상각액": f"{int(am):,}", "장부금액": f"{int(book_value):,}"
-            })
-            
-        # [Insight 생성]
-        diff_type = "할인" if mrate > crate else ("할증" if mrate < crate else "액면")
-        
-        # (A) 기본 리포트
-        insight = f"""
-        **📊 분석 리포트**
-        1. **발행 형태**: 시장이자율({mrate*100}%)이 표시이자율({crate*100}%)보다 {('높아' if mrate > crate else '낮아')} **{diff_type}발행**되었습니다.
-        2. **장부금액 추세**: 만기({periods}년)로 갈수록 장부금액이 **{int(price):,}원**에서 **{int(face):,}원**을 향해 {('증가' if diff_type=='할인' else '감소')}합니다.
-        """
-
-        # (B) 조기상환 리포트 (추가된 부분 ✨)
-        if redeem_stats:
-            r_period = redeem_stats['period']
-            r_amt = redeem_stats['amount']
-            r_bv = bv_dict.get(r_period, 0)
-            
-            gain_loss = r_bv - r_amt
-            gl_text = "상환이익(Gain)" if gain_loss >= 0 else "상환손실(Loss)"
-            
-            insight += f"""
-            ---
-            **💰 조기상환 손익 분석 ({r_period}년 말 상환 가정)**
-            1. **장부상 빚**: {r_period}년 말 시점의 장부금액은 **{int(r_bv):,}원**입니다.
-            2. **실제 갚은 돈**: **{int(r_amt):,}원**을 지급하고 빚을 청산했습니다.
-            3. **결론**: 장부보다 {('적게' if gain_loss > 0 else '많이')} 주었으므로, **{abs(int(gain_loss)):,}원의 {gl_text}**이 발생합니다.
-            """
-            
-        return int(price), pd.DataFrame(data).set_index("기간"), insight
-
-    @staticmethod
-    def depreciation(cost, residual, life, method, rate=None):
-        data = []
-        book_value = cost
-        data.append({"연도": 0, "기초장부": "-", "상각비": "-", "기말장부": f"{int(cost):,}"})
-
-        for t in range(1, life + 1):
-            start_bv = book_value
-            dep_expense = 0
-            if method == "SL":
-                dep_expense = (cost - residual) / life
-            elif method == "DB":
-                if t == life: dep_expense = start_bv - residual
-                else: dep_expense = start_bv * (rate if rate else (1 - (residual/cost)**(1/life)))
-            elif method == "SYD":
-                syd = life * (life + 1) / 2
-                dep_expense = (cost - residual) * ((life - t + 1) / syd)
-
-            book_value -= dep_expense
-            data.append({
-                "연도": t, "기초장부": f"{int(start_bv):,}",
-                "상각비": f"{int(dep_expense):,}", "기말장부": f"{int(book_value):,}"
-            })
-            
-        # [Insight 생성]
-        method_map = {"SL": "정액법", "DB": "정률법", "SYD": "연수합계법"}
-        trend = "매년 일정합니다" if method == "SL" else "초기에 크고 점차 감소합니다 (가속상각)"
-        insight = f"""
-        **📊 분석 리포트**
-        1. **상각 방법**: **{method_map.get(method, method)}**을 적용했습니다.
-        2. **비용 추세**: 감가상각비가 **{trend}**.
-        3. **최종 잔액**: {life}년 후 장부금액(**{int(book_value):,}원**)은 잔존가치(**{int(residual):,}원**)와 정확히 일치합니다.
-        """
-        return pd.DataFrame(data).set_index("연도"), insight
-
-    @staticmethod
-    def inventory_fifo(base_qty, base_price, buy_qty, buy_price, sell_qty):
-        cogs = 0
-        rem_base = base_qty
-        rem_buy = buy_qty
-        
-        sold_from_base = min(sell_qty, rem_base)
-        cogs += sold_from_base * base_price
-        rem_base -= sold_from_base
-        
-        sold_from_buy = min(sell_qty - sold_from_base, rem_buy)
-        cogs += sold_from_buy * buy_price
-        rem_buy -= sold_from_buy
-        
-        ending = (rem_base * base_price) + (rem_buy * buy_price)
-        
-        # [Insight 생성]
-        price_trend = "상승" if buy_price > base_price else "하락"
-        profit_effect = "과대계상(이익 ↑)" if price_trend == "상승" else "과소계상(이익 ↓)"
-        insight = f"""
-        **📊 분석 리포트 (FIFO 가정)**
-        1. **물가 추세**: 단가가 {base_price}원에서 {buy_price}원으로 **{price_trend}**했습니다.
-        2. **손익 효과**: 선입선출법은 옛날 싼 재고를 먼저 비용(원가) 처리하므로, 현재 시점에는 이익이 **{profit_effect}**되는 경향이 있습니다.
-        3. **재고 상태**: 기말재고({int(ending):,}원)는 가장 **최근에 구입한 단가**로 구성되어 현행가치에 가깝습니다.
-        """
-        return cogs, ending, rem_base, rem_buy, insight
-
-    @staticmethod
-    def entity_equity(cost, share_rate, net_income, dividends):
-        equity_income = net_income * share_rate
-        div_received = dividends * share_rate
-        ending_bv = cost + equity_income - div_received
-        
-        data = [
-            {"구분": "1. 기초 취득원가", "금액": cost, "효과": "자산(+)"},
-            {"구분": "2. 지분법이익(NI)", "금액": equity_income, "효과": "자산 증가(↑)"},
-            {"구분": "3. 배당금수령(Div)", "금액": div_received, "효과": "자산 감소(↓)"},
-            {"구분": "4. 기말 장부금액", "금액": ending_bv, "효과": "최종 잔액"}
-        ]
-        
-        # [Insight 생성]
-        insight = f"""
-        **📊 분석 리포트**
-        1. **성장의 공유**: 피투자회사가 번 돈({int(net_income):,}) 중 내 몫(**{int(equity_income):,}**)만큼 내 자산도 늘어났습니다.
-        2. **배당의 의미**: 배당금(**{int(div_received):,}**)은 수익이 아니라, 투자했던 돈을 일부 **회수(자산 감소)**한 것으로 처리됩니다.
-        3. **최종 결과**: 기초보다 장부금액이 **{int(ending_bv - cost):,}원** 변동했습니다.
-        """
-        return int(ending_bv), pd.DataFrame(data), insight
-    
+from simulators import Simulators, INV_METHOD_NAMES, SWEEP_PARAMS, PAYMENT_TIMING, bond_prices, sweep_kind
+from exam import ExamAttempt
+import analytics
+from data_logic import advanced_filter_questions, get_exam_questions, parse_markdown_to_blocks, block_title, note_page_window, NOTE_PAGE_SIZE, ChapterQuestionIndex, passes_filters, question_bank_version, bump_version
+from search import SearchIndex
+import dedupe
+import related
+import catalog
+SEARCH_TOP_K = 50
+RELATED_SHOW = 5
+perf.instrument_class(Simulators, "simulator")
 
 # =========================================================
 # 3. Data Logic & Dan-gwon-hwa (Note Manager) ✨
 # =========================================================
 @st.cache_data(ttl=60)
 def load_courses():
-    try:
-        docs = db.collection("courses").stream()
-        return [doc.to_dict() for doc in docs]
+    """관리자용: 챕터 본문까지 포함한 전체 과목 (embedded 형태로 맞춰서)"""
+    try: return catalog.load_full_courses(store)
     except: return []
 
 @st.cache_data(ttl=60)
-def load_questions():
-    try:
-        docs = db.collection("questions").stream()
-        return [doc.to_dict() for doc in docs]
+def load_course_catalog():
+    """사이드바용: 과목 헤더 + 챕터 제목만"""
+    try: return catalog.load_catalog(store)
     except: return []
 
-def advanced_filter_questions(all_qs, filters):
-    filtered = []
-    for q in all_qs:
-        if filters.get('keywords'):
-            search_text = (q.get('topic', '') + q.get('content_markdown', '')).lower()
-            tags = q.get('tags', [])
-            if isinstance(tags, list): search_text += " ".join(tags).lower()
-            if not any(k.lower() in search_text for k in filters['keywords']): continue
-        try: q_year = int(q.get('exam_info', {}).get('year', 0))
-        except: q_year = 0
-        if filters.get('years'):
-            min_y, max_y = filters['years']
-            if q_year != 0 and not (min_y <= q_year <= max_y): continue
-        q_exam = q.get('exam_info', {}).get('type', '기타')
-        if filters.get('exams') and q_exam not in filters['exams']: continue
-        try: q_diff = int(q.get('difficulty', 0))
-        except: q_diff = 0
-        if filters.get('difficulty'):
-            min_d, max_d = filters['difficulty']
-            if q_diff != 0 and not (min_d <= q_diff <= max_d): continue
-        filtered.append(q)
-    return filtered
+@st.cache_resource
+def get_chapter_cache():
+    """챕터 본문 LRU 캐시 (모든 세션이 공유, 최근 CHAPTER_CACHE_SIZE 개, CHAPTER_CACHE_TTL 초 뒤 다시 읽음)"""
+    return catalog.ChapterCache()
+
+def load_chapter(course_id, chapter_id):
+    return get_chapter_cache().get(store, course_id, chapter_id)
+
+@st.cache_data(ttl=60)
+def load_question_bank():
+    """(문제 목록, 데이터 버전). 버전은 읽어 온 문제들의 색인 필드(주제/태그/본문) 해시라 목록과 항상 짝이 맞는다"""
+    try: questions = store.list_questions()
+    except: questions = []
+    return questions, question_bank_version(questions)
+
+def load_questions():
+    return load_question_bank()[0]
+
+@st.cache_resource(max_entries=1)
+def get_search_index(data_version, _questions):
+    """문제은행 BM25 검색 색인. 색인 필드(주제/태그/본문) 버전이 같으면 해설·난이도 수정 후에도 그대로 재사용한다"""
+    with perf.span("search.build", tag=False):
+        return SearchIndex.build(_questions)
+
+@st.cache_resource
+def _dedupe_slot():
+    """프로세스 공유 MinHash 색인 자리 (get_dedupe_index 가 채운다)"""
+    return {"lock": threading.Lock(), "index": None}
+
+def get_dedupe_index():
+    """유사 문제 탐지용 MinHash/LSH 색인. 관리자 문제 관리 화면이 처음 열릴 때 한 번 만든다"""
+    slot = _dedupe_slot()
+    with slot["lock"]:
+        if slot["index"] is None:
+            with perf.span("dedupe.build", tag=False):
+                slot["index"] = dedupe.DuplicateIndex.build(load_questions())
+        return slot["index"]
+
+@st.cache_data(ttl=600)
+def load_related():
+    """question_id -> 비슷한 기출 [(question_id, 점수), ...] (오프라인/관리자 저장 때 미리 계산된 이웃 목록)"""
+    try: return related.load_neighbors(store)
+    except: return {}
+
+@st.cache_resource
+def get_related_index():
+    """관련 문제 증분 갱신용 벡터 색인. 오프라인 build 가 저장한 벡터/이웃을 읽기만 한다 (저장된 색인이 없으면 None)"""
+    with perf.span("related.load", tag=False):
+        try: return related.RelatedIndex.load(store)
+        except: return None
+
+def _refresh_related(items=(), deleted_ids=()):
+    """저장/삭제된 문제의 벡터와 이웃 목록이 바뀐 문제들의 shard 만 다시 저장 (전체 생성은 CLI / 관리자 버튼으로만)"""
+    index = get_related_index()
+    if index is None: return
+    with perf.span("related.update", tag=False):
+        changed = index.update(items, deleted_ids)
+    with perf.span("related.save", tag=False):
+        related.save_neighbors(store, index.neighbors, changed)
+        related.save_vectors(store, index, [q.get('question_id') for q in items] + list(deleted_ids))
+    load_related.clear()
+
+@st.cache_resource
+def get_chapter_index():
+    """(과목, 챕터) -> 키워드 매칭 문제 ID 캐시 (모든 세션이 공유)"""
+    return ChapterQuestionIndex()
+
+def _refresh_chapter_index(collection_name, items=(), deleted_ids=()):
+    """관리자 저장/삭제 후 챕터-문제 캐시에서 영향받는 항목만 갱신 (검색 색인은 데이터 버전이 바뀐 경우에만 다음 검색 때 다시 생성)"""
+    index = get_chapter_index()
+    if collection_name == "questions":
+        # 저장 전 목록에서 바뀐 문제만 빼고 더해 다음 버전을 구한다 -> 다시 읽은 목록의 버전과 같으면 캐시 항목 유지
+        old_qs, version = load_question_bank()
+        items = [q for q in items if 'question_id' in q]
+        touched = {q['question_id'] for q in items} | set(deleted_ids)
+        new_version = bump_version(version, [q for q in old_qs if q.get('question_id') in touched], items)
+        index.update_questions(items, deleted_ids, version, new_version)
+        dup_index = _dedupe_slot()["index"]  # 아직 안 만들었으면 건너뜀 (저장 경로에서는 전체 색인을 만들지 않는다)
+        if dup_index is not None: dup_index.update(items, deleted_ids)
+        _refresh_related(items, deleted_ids)
+    elif collection_name == "courses":
+        for course_id in [c.get('course_id') for c in items] + list(deleted_ids):
+            index.invalidate_course(course_id)
+            get_chapter_cache().invalidate(course_id)
+        load_course_catalog.clear()
 
 def save_json_batch(collection_name, items, id_field):
-    batch = db.batch()
-    count = 0
-    for item in items:
-        if id_field in item:
-            doc_ref = db.collection(collection_name).document(str(item[id_field]))
-            batch.set(doc_ref, item)
-            count += 1
-    batch.commit()
+    count = store.save_batch(collection_name, items, id_field)
+    _refresh_chapter_index(collection_name, items=items)
     return count
 
+def find_import_duplicates(items):
+    """가져올 문제 중 문제은행(또는 같은 묶음의 앞 문항)과 거의 같은 신규 문제 [{question_id, duplicate_of, similarity}]"""
+    with perf.span("dedupe.check_batch", tag=False):
+        return dedupe.check_batch(get_dedupe_index(), items)
+
 def update_question_solution(question_id, solution_steps):
     """특정 문제의 해설 필드만 업데이트"""
     try:
-        db.collection("questions").document(str(question_id)).update({
+        store.update_document("questions", question_id, {
             "solution_steps": solution_steps
         })
         return True
@@ -248,18 +216,74 @@ def update_question_solution(question_id, solution_steps):
         st.error(f"데이터베이스 저장 실패: {e}")
         return False
 
+def render_ai_solution(qid, q_data):
+    """
+    AI 해설을 받는 대로 화면에 흘려보내고 (st.write_stream) 끝까지 받았을 때만 DB 에 저장.
+    생성 중 '중지'(또는 다른 조작)로 rerun 되면 스트림은 닫히고 아무것도 저장하지 않는다.
+    """
+    if st.session_state.get(f"ai_stop_{qid}"):
+        st.info("해설 생성을 중지했습니다. 받은 내용은 저장하지 않았습니다.")
+    if not st.button("🤖 AI 해설 요청 및 저장", key=f"ai_btn_{qid}"):
+        return
+    stop_slot = st.empty()
+    stop_slot.button("⏹ 생성 중지", key=f"ai_stop_{qid}")
+    stream = ai_tutor.stream_solution(ai_client, q_data)
+    try:
+        with perf.span("ai.stream"):
+            st.write_stream(stream)
+    except Exception as e:
+        st.error(f"오류 발생: {e}")
+        return
+    finally:
+        if stream.first_chunk_ms is not None:
+            perf.record("ai.first_chunk", stream.first_chunk_ms)
+    stop_slot.empty()
+    if not stream.completed or not stream.text.strip():
+        st.warning("AI 응답이 비어 있거나 중간에 끊겨 저장하지 않았습니다.")
+        return
+    with perf.span("ai.save_solution"):
+        saved = update_question_solution(qid, ai_tutor.solution_steps(stream.text))
+    if saved:
+        st.success("해설이 저장되었습니다! 새로고침합니다.")
+        load_question_bank.clear() # 캐시 초기화 (중요)
+        st.rerun() # 화면 새로고침하여 해설 표시
+
 def delete_document(collection_name, doc_id):
-    db.collection(collection_name).document(str(doc_id)).delete()
-
-def get_exam_questions(all_q, exam_type, exam_year):
-    """특정 시험(예: 2024 CPA)의 문제들을 번호순으로 가져오기"""
-    filtered = [
-        q for q in all_q 
-        if q.get('exam_info', {}).get('type') == exam_type 
-        and q.get('exam_info', {}).get('year') == exam_year
-    ]
-    # question_id 기준으로 정렬 (예: 2024_CPA_01 -> 02 -> 03 ...)
-    return sorted(filtered, key=lambda x: x.get('question_id', ''))
+    store.delete_document(collection_name, doc_id)
+    _refresh_chapter_index(collection_name, deleted_ids=[doc_id])
+
+def save_courses(items):
+    """과목 JSON(embedded 형태) -> 헤더 문서 + chapters 서브컬렉션으로 저장"""
+    count = catalog.save_courses(store, items)
+    _refresh_chapter_index("courses", items=items)
+    return count
+
+def delete_course(course_id):
+    catalog.delete_course(store, course_id)
+    _refresh_chapter_index("courses", deleted_ids=[course_id])
+
+def save_exam_attempt(attempt, user_id):
+    """제출한 모의고사 답안지를 문서 하나로 저장 (풀이 중에는 쓰지 않음)"""
+    try:
+        store.set_document("exam_attempts", attempt.attempt_id, attempt.to_doc(user_id))
+        return True
+    except Exception as e:
+        st.error(f"데이터베이스 저장 실패: {e}")
+        return False
+
+def record_answer_events(user_id, events):
+    """풀이 기록을 user_stats/{user_id} 누적 집계에 더하기 (기록 묶음당 쓰기 1회)"""
+    if not events: return
+    increments, fields = analytics.rollup_updates(events)
+    fields["user_id"] = user_id
+    try:
+        store.increment_document("user_stats", user_id, increments, fields)
+    except Exception as e:
+        st.error(f"학습 기록 저장 실패: {e}")
+
+def load_user_stats(user_id):
+    """약점 분석용 누적 집계 문서 (읽기 1회)"""
+    return store.get_document("user_stats", user_id) or {}
 
 # [NEW] 단권화 관리 클래스
 class NoteManager:
@@ -270,71 +294,614 @@ class NoteManager:
 
     @staticmethod
     def parse_markdown_to_blocks(text):
-        """기존 통짜 마크다운을 ## 제목 기준으로 잘라서 블록 리스트로 변환"""
-        if not text: return []
-        lines = text.split('\n')
-        blocks = []
-        current_content = []
-        
-        for line in lines:
-            if line.strip().startswith("## "):
-                # 이전 내용 저장
-                if current_content:
-                    blocks.append({
-                        "id": str(uuid.uuid4())[:8],
-                        "content": "\n".join(current_content),
-                        "type": "system"
-                    })
-                current_content = [line]
-            else:
-                current_content.append(line)
-        
-        # 마지막 블록 저장
-        if current_content:
-            blocks.append({
-                "id": str(uuid.uuid4())[:8],
-                "content": "\n".join(current_content),
-                "type": "system"
-            })
-        return blocks
+        """기존 통짜 마크다운을 ## 제목 기준으로 잘라서 블록 리스트로 변환 (data_logic.py)"""
+        return parse_markdown_to_blocks(text)
 
     @staticmethod
+    @perf.timed("notes.load", tag=True)
     def load_user_notes(user_id, course_id, chapter_id, default_text):
         """DB에서 유저 노트를 불러오거나, 없으면 시스템 기본 텍스트를 블록화해서 리턴"""
         doc_id = NoteManager.get_doc_id(user_id, course_id, chapter_id)
-        doc_ref = db.collection("user_notes").document(doc_id)
-        doc = doc_ref.get()
+        doc = store.get_document("user_notes", doc_id)
         
-        if doc.exists:
+        if doc is not None:
             # 유저가 저장한 단권화 데이터가 있으면 그걸 씀
-            return doc.to_dict().get("blocks", [])
+            return doc.get("blocks", [])
         else:
             # 없으면 시스템 기본 텍스트를 최초 1회 블록화
             return NoteManager.parse_markdown_to_blocks(default_text)
 
     @staticmethod
+    @perf.timed("notes.save", tag=True)
     def save_user_notes(user_id, course_id, chapter_id, blocks):
         doc_id = NoteManager.get_doc_id(user_id, course_id, chapter_id)
-        db.collection("user_notes").document(doc_id).set({
+        store.set_document("user_notes", doc_id, {
             "user_id": user_id,
             "course_id": course_id,
             "chapter_id": chapter_id,
             "blocks": blocks,
-            "updated_at": firestore.SERVER_TIMESTAMP
+            "updated_at": store.server_timestamp()
         })
 
 # =========================================================
-# 4. UI Layout
+# 4. UI Fragments (위젯을 건드리면 해당 fragment 만 다시 실행)
+# =========================================================
+def _rerun_fragment():
+    """fragment 부분 rerun 중이면 그 fragment 만, 전체 실행 중이면(첫 로드/AppTest) 전체 rerun"""
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitInvalidLayoutContextError:
+        st.rerun()
+
+
+@st.fragment
+@perf.timed("fragment.note_editor", tag=True)
+def render_note_editor(cid, chid, sys_text):
+    """단권화 노트 블록 편집기 (블록 편집/삭제/추가는 이 영역만 rerun)"""
+    blocks = st.session_state.note_blocks
+
+    # 블록이 수백 개인 챕터도 한 페이지(NOTE_PAGE_SIZE 개) 분량의 위젯만 만든다
+    start, end, n_pages, page = note_page_window(len(blocks), st.session_state.get("note_page", 0))
+    st.session_state.note_page = page
+    if n_pages > 1:
+        c_prev, c_sel, c_next = st.columns([0.15, 0.7, 0.15])
+        if c_prev.button("◀", key="note_prev", disabled=(page == 0)):
+            st.session_state.note_page = page - 1
+            _rerun_fragment()
+        picked = c_sel.selectbox(
+            "목차", range(n_pages), index=page, label_visibility="collapsed",
+            format_func=lambda pg: f"{pg + 1}/{n_pages} · {block_title(blocks[pg * NOTE_PAGE_SIZE])}",
+        )
+        if picked != page:
+            st.session_state.note_page = picked
+            st.session_state.editing_idx = None
+            _rerun_fragment()
+        if c_next.button("▶", key="note_next", disabled=(page == n_pages - 1)):
+            st.session_state.note_page = page + 1
+            _rerun_fragment()
+
+    # 2. 블록 렌더링 Loop (현재 페이지만)
+    for i in range(start, end):
+        block = blocks[i]
+        # 편집 모드인지 확인
+        is_editing = (st.session_state.get('editing_idx') == i)
+
+        col_content, col_btn = st.columns([0.9, 0.1])
+
+        with col_content:
+            if is_editing:
+                # [편집 모드] 텍스트 에디터 표시
+                new_content = st.text_area(f"Block {i}", value=block['content'], height=200, key=f"txt_{i}")
+                c1, c2 = st.columns(2)
+                if c1.button("💾 저장", key=f"save_{i}"):
+                    blocks[i]['content'] = new_content
+                    blocks[i]['type'] = 'user_edited'
+                    NoteManager.save_user_notes(USER_ID, cid, chid, blocks)
+                    st.session_state.editing_idx = None # 편집 종료
+                    _rerun_fragment()
+                if c2.button("취소", key=f"cancel_{i}"):
+                    st.session_state.editing_idx = None
+                    _rerun_fragment()
+            else:
+                # [보기 모드] Markdown 표시
+                # 사용자 추가/수정 블록은 배경색을 살짝 다르게 표시 (Highlight)
+                if block.get('type') == 'user_added':
+                    st.info(block['content'])
+                elif block.get('type') == 'user_edited':
+                    st.warning(block['content']) # 수정됨 표시
+                else:
+                    st.markdown(block['content'])
+
+        with col_btn:
+            # 도구 버튼 (편집, 삭제)
+            if not is_editing:
+                if st.button("✏️", key=f"edit_btn_{i}", help="수정"):
+                    st.session_state.editing_idx = i
+                    _rerun_fragment()
+                if st.button("🗑️", key=f"del_btn_{i}", help="삭제(숨김)"):
+                    blocks.pop(i)
+                    NoteManager.save_user_notes(USER_ID, cid, chid, blocks)
+                    _rerun_fragment()
+
+    # 3. 새 블록 추가 버튼 (하단)
+    st.divider()
+    if st.button("➕ 나만의 메모/오답노트 추가하기"):
+        # 새 블록 생성
+        new_block = {
+            "id": str(uuid.uuid4())[:8],
+            "content": "### 📌 나만의 메모\n여기에 내용을 입력하세요.",
+            "type": "user_added"
+        }
+        blocks.append(new_block)
+        NoteManager.save_user_notes(USER_ID, cid, chid, blocks)
+        # 바로 편집 모드로 진입 (새 블록이 있는 마지막 페이지로 이동)
+        st.session_state.editing_idx = len(blocks) - 1
+        st.session_state.note_page = (len(blocks) - 1) // NOTE_PAGE_SIZE
+        _rerun_fragment()
+
+    # 4. 초기화 버튼 (망쳤을 때)
+    if st.button("🔄 원본으로 초기화 (내 메모 삭제)", type="secondary"):
+        blocks = NoteManager.parse_markdown_to_blocks(sys_text)
+        st.session_state.note_blocks = blocks
+        st.session_state.note_page = 0
+        NoteManager.save_user_notes(USER_ID, cid, chid, blocks)
+        _rerun_fragment()
+
+
+BOND_MODES = {"price": "시장이자율 → 발행가", "yield": "발행가 → 유효이자율"}
+
+
+def sweep_range(param, base):
+    """민감도 분석 슬라이더 설정: (최소, 최대, 기본 구간, 간격 후보). 금액 파라미터는 기본값 크기에 맞춘다"""
+    if param in ("mrate", "crate"): return 0.0, 0.3, (0.01, 0.15), [0.001, 0.005, 0.01]
+    if param == "rate": return 0.01, 0.99, (0.05, 0.9), [0.01, 0.05]
+    if param == "share": return 0.0, 1.0, (0.0, 1.0), [0.01, 0.05, 0.1]
+    scale = float(abs(base.get('cost' if param == "residual" else 'net_income', 0)) or base.get('cost', 1000))
+    if param == "residual": return 0.0, scale, (0.0, scale), [scale / 100, scale / 20]
+    return -2 * scale, 2 * scale, (-scale, 2 * scale), [scale / 50, scale / 10]
+
+
+def render_sweep(kind, sim_type, defaults):
+    """민감도 분석: 파라미터 구간 전체를 한 번에 계산해서 곡선 + 연도별 히트맵 (값마다 rerun 하지 않음)"""
+    base = dict(defaults)
+    if kind == "depreciation":
+        base['method'] = "DB" if "db" in sim_type else ("SYD" if "syd" in sim_type else "SL")
+        if base['method'] != "DB": base.pop('rate', None)
+    params = SWEEP_PARAMS[kind]
+    c1, c2 = st.columns([1,2])
+    with c1:
+        param = st.segmented_control("바꿔 볼 값", list(params), default=next(iter(params)), format_func=params.get, key=f"sweep_param_{kind}") or next(iter(params))
+        lo_lim, hi_lim, span, steps = sweep_range(param, base)
+        lo, hi = st.slider("구간", lo_lim, hi_lim, span, step=steps[0], key=f"sweep_span_{kind}_{param}")
+        step = st.select_slider("간격", options=steps, value=steps[0], key=f"sweep_step_{kind}_{param}")
+        if kind == "bond": base['periods'] = st.slider("기간", 1, 10, int(base.get('periods', 3)), key="sweep_periods")
+    values = np.round(np.arange(lo, hi + step / 2, step), 6)
+    with c2:
+        try:
+            paths, headline, insight = Simulators.sweep(kind, base, param, values)
+        except ValueError as err:
+            st.error(f"입력 오류: {err}")
+            return
+        st.line_chart(headline)
+        st.info(insight)
+    st.dataframe(paths.style.background_gradient(cmap="Blues", axis=None).format("{:,.0f}"), use_container_width=True, height=320)
+
+
+def render_bond_yield(defaults):
+    """사채 역산 모드: 발행가를 넣으면 유효이자율과 상각표 (슬라이더로 찍어 맞추지 않아도 됨)"""
+    c1, c2 = st.columns([1,2])
+    with c1:
+        f = st.number_input("액면", value=defaults.get('face', 100000), key="bond_y_face")
+        c = st.number_input("표시율", value=defaults.get('crate',0.05), key="bond_y_crate")
+        p = st.slider("기간", 1, 10, 3, key="bond_y_periods")
+        price0 = defaults.get('price') or int(bond_prices(f, c, defaults.get('mrate', 0.08), p))
+        price = st.number_input("발행가", value=int(price0), step=100, key="bond_y_price")
+    with c2:
+        try:
+            mrate, df, insight = Simulators.bond_yield(price, f, c, p)
+        except ValueError as e:
+            st.error(str(e))
+            return
+        st.metric("유효이자율", f"{mrate * 100:.4f}%")
+        st.dataframe(df, use_container_width=True)
+        st.info(insight)
+
+
+def render_annuity_schedule(kind, defaults, key):
+    """리스(리스이용자) / 장기할부판매 상각표: 연금 현재가치 공통 엔진 위에서 지급 시점·잔존보증만 다름"""
+    c1, c2 = st.columns([1,2])
+    with c1:
+        if kind == "lease":
+            pmt = st.number_input("연 리스료", value=defaults.get('payment', 100000), step=1000, key=f"{key}_ls_pmt")
+        else:
+            pmt = st.number_input("연 할부금", value=defaults.get('installment', 1000000), step=1000, key=f"{key}_is_pmt")
+        rate = st.number_input("유효이자율", value=defaults.get('rate', 0.08), format="%.4f", key=f"{key}_{kind}_rate")
+        periods = st.slider("기간", 1, 30, int(defaults.get('periods', 3)), key=f"{key}_{kind}_periods")
+        timing = st.segmented_control("지급 시점", list(PAYMENT_TIMING), default="due" if defaults.get('due') else "end", format_func=PAYMENT_TIMING.get, key=f"{key}_{kind}_timing") or "end"
+        if kind == "lease":
+            extra = st.number_input("보증잔존가치 (지급예상액)", value=defaults.get('residual_guarantee', 0), step=1000, key=f"{key}_ls_res")
+        else:
+            extra = st.number_input("계약금", value=defaults.get('down_payment', 0), step=1000, key=f"{key}_is_down")
+            cost = defaults.get('cost')
+            cost = st.number_input("매출원가", value=cost, step=1000, key=f"{key}_is_cost") if cost is not None else None
+    with c2:
+        try:
+            if kind == "lease":
+                pv, df, insight = Simulators.lease(pmt, rate, periods, timing == "due", extra)
+                st.metric("리스부채 (= 사용권자산)", f"{pv:,}")
+                st.line_chart(df[["기말리스부채", "기말사용권자산"]])
+            else:
+                pv, df, insight = Simulators.installment_sale(pmt, rate, periods, timing == "due", extra, cost)
+                st.metric("매출액", f"{pv:,}")
+                st.line_chart(df["기말매출채권"])
+        except ValueError as err:
+            st.error(f"입력 오류: {err}")
+            return
+        st.dataframe(df.style.format("{:,.0f}"), use_container_width=True)
+        st.info(insight)
+
+
+@st.fragment
+@perf.timed("fragment.simulator_panel", tag=True)
+def render_simulator_panel(current_ch):
+    """챕터 시뮬레이터 패널 (슬라이더/입력값 변경 시 이 영역만 rerun)"""
+    sim_type = current_ch.get('simulator_type', 'default')
+    defaults = current_ch.get('simulator_defaults', {})
+
+    kind = sweep_kind(sim_type)
+    if kind and st.toggle("📈 민감도 분석 (구간 전체를 한 번에)", key="sim_sweep"):
+        render_sweep(kind, sim_type, defaults)
+        return
+
+    if "bond" in sim_type:
+        bond_mode = st.segmented_control("계산 방향", list(BOND_MODES), default="price", format_func=BOND_MODES.get, key="bond_mode") or "price"
+        if bond_mode == "yield":
+            render_bond_yield(defaults)
+            return
+
+        c1, c2 = st.columns([1,2])
+        with c1:
+            f = st.number_input("액면", value=defaults.get('face', 100000))
+            c = st.number_input("표시율", value=defaults.get('crate',0.05))
+            m = st.number_input("시장율", value=defaults.get('mrate',0.08))
+            p = st.slider("기간", 1, 10, 3)
+
+            # [NEW] 챕터 제목에 '조기상환'이 있으면 추가 옵션 표시 ✨
+            redeem_stats = None
+            if "조기상환" in current_ch['title']:
+                st.markdown("---")
+                st.caption("💰 조기상환 시뮬레이션")
+                r_period = st.slider("상환 시점(연말)", 1, p, min(2, p))
+                r_amt = st.number_input("상환 지급액", value=int(f * 0.98), step=1000)
+                redeem_stats = {'period': r_period, 'amount': r_amt}
+
+        with c2:
+            # 함수에 redeem_stats 전달
+            pv, df, insight = Simulators.bond_basic(f, c, m, p, redeem_stats)
+            st.metric("PV", f"{pv:,}")
+            st.dataframe(df, use_container_width=True)
+            # 상환 분석 결과가 포함된 텍스트 출력
+            if redeem_stats:
+                st.success(insight) # 강조 효과
+            else:
+                st.info(insight)
+
+    elif "entity_equity" in sim_type:
+        c1, c2 = st.columns([1,1.5])
+        with c1:
+            cost = st.number_input("원가", value=defaults.get('cost',1000))
+            shr = st.number_input("지분", value=defaults.get('share',0.2))
+            ni = st.number_input("순이익", value=defaults.get('net_income',0))
+            dv = st.number_input("배당", value=defaults.get('dividends',0))
+        with c2:
+            v, df, insight = Simulators.entity_equity(cost, shr, ni, dv)
+            st.metric("기말장부", f"{v:,}")
+            st.bar_chart(df.set_index("구분")["금액"])
+            st.info(insight)
+
+        # 여러 해에 걸친 문제: 연도별 순이익/배당/지분율을 입력해서 장부금액 시계열 확인
+        with st.expander("📆 다기간 지분법 / 지분율 시나리오"):
+            default_years = defaults.get('years') or [
+                {"net_income": ni, "dividends": dv, "share": shr},
+                {"net_income": ni, "dividends": dv, "share": shr},
+                {"net_income": ni, "dividends": dv, "share": shr},
+            ]
+            yr_df = st.data_editor(
+                pd.DataFrame(default_years, columns=["net_income", "dividends", "share"]),
+                num_rows="dynamic", use_container_width=True, key="equity_years_editor",
+                column_config={
+                    "net_income": st.column_config.NumberColumn("순이익"),
+                    "dividends": st.column_config.NumberColumn("배당"),
+                    "share": st.column_config.NumberColumn("지분율", min_value=0.0, max_value=1.0, format="%.2f"),
+                },
+            ).fillna({"net_income": 0, "dividends": 0, "share": shr})
+            if len(yr_df):
+                try:
+                    mv, mdf, m_insight = Simulators.entity_equity_multi(cost, yr_df["share"].to_numpy(), yr_df["net_income"].to_numpy(), yr_df["dividends"].to_numpy())
+                    st.metric(f"{len(mdf)}년 후 장부금액", f"{mv:,}")
+                    st.bar_chart(mdf["기말장부"])
+                    st.dataframe(mdf.round(0), use_container_width=True)
+                    st.info(m_insight)
+
+                    st.markdown("**지분율 시나리오 비교** (연도별 순이익/배당은 위 표 사용)")
+                    s_lo, s_hi = st.slider("지분율 범위", 0.0, 1.0, (0.2, 0.5), step=0.05)
+                    s_step = st.select_slider("간격", options=[0.01, 0.05, 0.1], value=0.05)
+                    grid = np.round(np.arange(s_lo, s_hi + s_step / 2, s_step), 4)
+                    st.line_chart(Simulators.entity_equity_scenarios(cost, grid, yr_df["net_income"].to_numpy(), yr_df["dividends"].to_numpy()))
+                except ValueError as err:
+                    st.error(f"입력 오류: {err}")
+
+    elif "depreciation" in sim_type:
+        c1, c2 = st.columns([1,2])
+        with c1:
+            cost = st.number_input("원가", value=defaults.get('cost', 1000))
+            res = st.number_input("잔존", value=defaults.get('residual', 100))
+            life = st.number_input("내용연수", value=defaults.get('life', 5))
+            rate = None
+            if "db" in sim_type: rate = st.number_input("상각률", value=defaults.get('rate', 0.451))
+            mtd = "DB" if "db" in sim_type else ("SYD" if "syd" in sim_type else "SL")
+            compare = st.toggle("📈 상각방법 비교", value=False)
+        with c2:
+            if compare:
+                # 정액/정률/연수합계(+생산량비례) 경로를 한 번에 계산해서 겹쳐 그리기
+                cdf, insight = Simulators.depreciation_compare(cost, res, life, rate, defaults.get('units'))
+                st.line_chart(cdf, x="연도", y="기말장부", color="방법")
+                st.dataframe(cdf.pivot(index="연도", columns="방법", values="상각비").round(0), use_container_width=True)
+                st.info(insight)
+            else:
+                df, insight = Simulators.depreciation(cost, res, life, mtd, rate)
+                st.line_chart(df['기말장부'].str.replace(",","").astype(int))
+                st.dataframe(df, use_container_width=True)
+                st.info(insight)
+
+    elif "inventory" in sim_type:
+        c1, c2 = st.columns(2)
+        with c1: bq = st.number_input("기초Q", 100); bp = st.number_input("기초P", 100)
+        with c2: buyq = st.number_input("매입Q", 100); buyp = st.number_input("매입P", 120)
+        sq = st.slider("판매Q", 0, bq+buyq, 150)
+        c, e, r1, r2, insight = Simulators.inventory_fifo(bq, bp, buyq, buyp, sq)
+        st.success(f"매출원가: {c:,}")
+        st.info(f"기말재고: {e:,}")
+        st.markdown(insight)
+
+        # 여러 번의 매입/판매가 섞인 문제: 거래 흐름을 직접 입력해서 원가흐름 가정별 비교
+        with st.expander("📋 거래 흐름 직접 입력 (FIFO / LIFO / 총평균 / 이동평균 비교)"):
+            default_tx = defaults.get('transactions') or [
+                {"type": "buy", "qty": bq, "price": bp},
+                {"type": "buy", "qty": buyq, "price": buyp},
+                {"type": "sell", "qty": min(sq, bq + buyq), "price": None},
+            ]
+            tx_df = st.data_editor(
+                pd.DataFrame(default_tx, columns=["type", "qty", "price"]),
+                num_rows="dynamic", use_container_width=True, key="inv_tx_editor",
+                column_config={
+                    "type": st.column_config.SelectboxColumn("구분", options=["buy", "sell"], required=True),
+                    "qty": st.column_config.NumberColumn("수량", min_value=0, step=1, required=True),
+                    "price": st.column_config.NumberColumn("단가(매입)", min_value=0),
+                },
+            )
+            tx_list = [
+                {"type": r["type"], "qty": r["qty"], "price": r["price"]}
+                for r in tx_df.dropna(subset=["type", "qty"]).to_dict("records")
+            ]
+            inv_method = st.radio("원가흐름 가정", list(INV_METHOD_NAMES.keys()), format_func=lambda m: INV_METHOD_NAMES[m], horizontal=True)
+            try:
+                summary = []
+                for m_key, m_name in INV_METHOD_NAMES.items():
+                    m_cogs, m_end, m_df, m_insight = Simulators.inventory(tx_list, m_key)
+                    summary.append({"방법": m_name, "매출원가": round(m_cogs), "기말재고": round(m_end)})
+                    if m_key == inv_method:
+                        sel_df, sel_insight = m_df, m_insight
+                st.dataframe(pd.DataFrame(summary).set_index("방법"), use_container_width=True)
+                st.dataframe(sel_df.round(1), use_container_width=True)
+                st.markdown(sel_insight)
+            except (ValueError, TypeError) as err:
+                st.error(f"거래 흐름 오류: {err}")
+
+    elif "lease" in sim_type or "installment" in sim_type:
+        render_annuity_schedule("lease" if "lease" in sim_type else "installment_sale", defaults, "ch")
+
+    else: 
+        st.info("이론 중심 챕터입니다.")
+
+
+@st.fragment
+@perf.timed("fragment.question_simulator", tag=True)
+def render_question_simulator(qid, sim_config):
+    """기출문제에 붙은 sim_config 시뮬레이터"""
+    s_type = sim_config.get('type')
+    p = sim_config.get('params', {})
+
+    # 1. Bond
+    if s_type == "bond_basic":
+        f_val = st.number_input("액면", value=p.get('face', 100000), key=f"s_{qid}_f")
+        c_val = st.number_input("표시이자", value=p.get('crate', 0.05), format="%.2f", key=f"s_{qid}_c")
+        m_val = st.number_input("유효이자", value=p.get('mrate', 0.08), format="%.2f", key=f"s_{qid}_m")
+
+        # [수정] insight unpack & display
+        res_p, res_df, insight = Simulators.bond_basic(f_val, c_val, m_val, p.get('periods', 3))
+        st.dataframe(res_df, use_container_width=True)
+        st.info(insight)
+
+    # 2. Depreciation
+    elif s_type == "depreciation":
+        c_val = st.number_input("취득원가", value=p.get('cost', 1000), key=f"s_{qid}_cost")
+        r_val = st.number_input("잔존가치", value=p.get('residual', 0), key=f"s_{qid}_res")
+        l_val = st.number_input("내용연수", value=p.get('life', 5), key=f"s_{qid}_life")
+        rate_val = p.get('rate')
+        method_val = p.get('method', 'SL')
+
+        df, insight = Simulators.depreciation(c_val, r_val, l_val, method_val, rate_val)
+        st.line_chart(df['기말장부'].str.replace(",","").astype(int))
+        st.dataframe(df, use_container_width=True)
+        st.info(insight)
+
+    # 3. Inventory
+    elif s_type == "inventory_fifo":
+        bq = p.get('base_qty', 100); bp = p.get('base_price', 100)
+        buyq = p.get('buy_qty', 100); buyp = p.get('buy_price', 120)
+        sell_q = st.slider("판매수량 시뮬레이션", 0, bq+buyq, p.get('sell_qty', 150), key=f"s_{qid}_sell")
+
+        cogs, end, r1, r2, insight = Simulators.inventory_fifo(bq, bp, buyq, buyp, sell_q)
+        st.success(f"매출원가: {cogs:,}")
+        st.info(f"기말재고: {end:,}")
+        st.caption(insight)
+
+    # 4. Entity
+    elif s_type == "entity_equity":
+        c_cost = st.number_input("취득원가", value=p.get('cost', 1000000), key=f"s_{qid}_ec")
+        c_share = st.number_input("지분율", value=p.get('share', 0.2), key=f"s_{qid}_es")
+        c_ni = st.number_input("순이익", value=p.get('net_income', 0), key=f"s_{qid}_eni")
+        c_div = st.number_input("배당금", value=p.get('dividends', 0), key=f"s_{qid}_ediv")
+
+        ebv, edf, insight = Simulators.entity_equity(c_cost, c_share, c_ni, c_div)
+        st.metric("기말 장부금액", f"{ebv:,}")
+        st.bar_chart(edf.set_index("구분")["금액"])
+        st.info(insight)
+
+    # 5. Lease / 장기할부판매
+    elif s_type in ("lease", "installment_sale"):
+        render_annuity_schedule(s_type, p, f"s_{qid}")
+
+
+@st.fragment
+@perf.timed("fragment.exam_navigator", tag=True)
+def render_exam_navigator(exam_questions, exam_type, exam_year):
+    """모의고사 문제 이동/풀이 영역 (이전/다음 버튼은 이 영역만 rerun)"""
+    # 3. 답안지 (Session State 에는 ExamAttempt 하나만 보관)
+    # 시험지가 바뀌면 새 답안지로 교체 -> 문항 위치도 처음으로
+    attempt = st.session_state.get('exam_attempt')
+    if attempt is None or not attempt.matches(exam_type, exam_year, exam_questions):
+        attempt = st.session_state.exam_attempt = ExamAttempt(exam_questions, exam_type, exam_year)
+
+    total_q = len(exam_questions)
+    curr_idx = attempt.current
+
+    q_data = exam_questions[curr_idx]
+    qid = q_data['question_id']
+
+    # --- 상단 네비게이션 바 ---
+    c_prev, c_info, c_next = st.columns([1, 2, 1])
+    with c_prev:
+        if st.button("⬅️ 이전 문제", disabled=(curr_idx == 0), key="btn_prev"):
+            attempt.visit(curr_idx - 1)
+            _rerun_fragment()
+    with c_info:
+        st.markdown(f"<h4 style='text-align: center;'>제 {curr_idx + 1} 번 / 총 {total_q} 문항</h4>", unsafe_allow_html=True)
+    with c_next:
+        if st.button("다음 문제 ➡️", disabled=(curr_idx == total_q - 1), key="btn_next"):
+            attempt.visit(curr_idx + 1)
+            _rerun_fragment()
+
+    st.progress((curr_idx + 1) / total_q)
+    st.caption(f"응답 {int((attempt.answers > 0).sum())} / {total_q} 문항")
+    st.divider()
+
+    # 4. 문제 풀이 영역
+    col_q, col_solve = st.columns([1.2, 1])
+
+    # [왼쪽] 지문 및 보기
+    with col_q:
+        st.badge(q_data['topic'])
+        st.markdown(q_data['content_markdown'])
+
+        # 보기 출력
+        opts = sorted(q_data.get('choices', {}).items())
+        labels = [f"{k}. {v}" for k, v in opts]
+        picked = [i for i, (k, _) in enumerate(opts) if str(k) == str(attempt.answers[curr_idx])]
+        user_ans = st.radio("정답 선택", labels, index=picked[0] if picked else None,
+                            key=f"exam_radio_{attempt.attempt_id}_{qid}", disabled=attempt.submitted)
+        if user_ans is not None: attempt.answer(curr_idx, user_ans)
+
+    # [오른쪽] 정답 확인 및 해설
+    with col_solve:
+        st.info("💡 문제를 푼 뒤 아래 버튼을 눌러 확인하세요.")
+
+        # 정답 확인 토글
+        with st.expander("✅ 정답 및 해설 확인", expanded=False):
+            ans = q_data.get('answer', 0)
+            st.markdown(f"### 정답: **{ans}번**")
+
+            if user_ans is None:
+                st.info("아직 답을 고르지 않았습니다.")
+            elif str(ans) in user_ans:
+                st.success("🎉 정답입니다!")
+            else:
+                st.error("앗, 틀렸습니다. 다시 풀어보세요.")
+
+            st.markdown("---")
+
+            # (A) 저장된 해설 표시
+            solutions = q_data.get('solution_steps', [])
+            if solutions:
+                for s in solutions:
+                    # -------------------------------------------------
+                    # 1. 제목(Title) 꾸미기
+                    # -------------------------------------------------
+                    raw_title = s.get('title', 'Step')
+                    # [주제] -> 파란색 볼드체
+                    styled_title = re.sub(r"\[(.*?)\]", r"**:blue[[\1]]**", raw_title)
+                    st.markdown(f"#### {styled_title}")
+
+                    # -------------------------------------------------
+                    # 2. 본문(Content) 꾸미기 (줄바꿈 + 스타일링)
+                    # -------------------------------------------------
+                    raw_content = s.get('content', '')
+
+                    # (1) 줄바꿈 문자 치환 (핵심!)
+                    # DB에 저장된 "\\n" 문자열을 실제 줄바꿈 엔터키로 변경
+                    content = raw_content.replace('\\n', '\n')
+
+                    # (2) 본문 속 [주제] -> 파란색 볼드체
+                    content = re.sub(r"\[(.*?)\]", r"**:blue[[\1]]**", content)
+
+                    # (3) 본문 속 (ID: ...) -> 회색 작게 처리
+                    content = re.sub(r"\(ID: (.*?)\)", r"**:gray[(ID: \1)]**", content)
+
+                    st.markdown(content)
+                    st.divider()
+            else:
+                st.warning("등록된 해설이 없습니다.")
+                # (B) AI 해설 요청 버튼 (기존 로직 재사용)
+                if GEMINI_AVAILABLE:
+                    if st.button("🤖 AI 해설 요청 (DB저장)", key=f"exam_ai_{qid}"):
+                        # ... (AI 해설 요청 코드: 위에서 만든 코드 그대로 사용) ...
+                        pass 
+
+        # 시뮬레이터 (필요시 열어보기)
+        sim_conf = q_data.get('sim_config')
+        if sim_conf:
+            with st.expander(f"🧪 시뮬레이터로 검증 ({sim_conf.get('type')})"):
+                # 기존 시뮬레이터 렌더링 로직 재사용
+                # Tab 3의 시뮬레이터 렌더링 코드를 함수화해서 호출하거나, 
+                # 여기서 간단히 params만 받아서 Simulators 클래스 호출
+                pass
+
+    # 5. 제출 및 채점 (답안지 전체를 문서 하나로 저장)
+    st.divider()
+    if not attempt.submitted:
+        if st.button("📤 답안 제출 및 채점", type="primary", key="exam_submit"):
+            attempt.finish()  # to_doc 에 제출 시각이 들어가야 하므로 먼저 마감하고, 저장 실패 시 되돌린다
+            if save_exam_attempt(attempt, USER_ID):
+                record_answer_events(USER_ID, analytics.attempt_events(attempt, exam_questions))
+                st.toast("답안지를 저장했습니다.")
+                _rerun_fragment()
+            else:
+                attempt.reopen()  # 답안 수정/재제출 가능 상태로 (오류 메시지가 보이도록 rerun 하지 않음)
+    else:
+        res = attempt.result()
+        c1, c2, c3 = st.columns(3)
+        c1.metric("점수", f"{res['score']}점")
+        c2.metric("정답", f"{res['correct']} / {res['total']}")
+        c3.metric("풀이 시간", f"{res['time_total_sec'] / 60:.1f}분")
+        st.markdown("##### 주제별 정답률")
+        df_topic = pd.DataFrame(res['topics']).rename(columns={"topic": "주제", "total": "문항", "correct": "정답", "accuracy": "정답률", "time_sec": "시간(초)"})
+        st.dataframe(df_topic, hide_index=True, use_container_width=True)
+        st.bar_chart(df_topic.set_index("주제")["정답률"])
+        with st.expander("문항별 결과"):
+            st.dataframe(pd.DataFrame({
+                "문항": attempt.question_ids, "선택": attempt.answers, "정답": attempt.key,
+                "정오": ["O" if ok else "X" for ok in res['correct_flags']], "시간(초)": attempt.elapsed.round(1),
+            }), hide_index=True, use_container_width=True)
+        if st.button("🔁 다시 풀기", key="exam_retry"):
+            st.session_state.exam_attempt = ExamAttempt(exam_questions, exam_type, exam_year)
+            _rerun_fragment()
+
+
+# =========================================================
+# 5. UI Layout
 # =========================================================
 st.title("☁️ Accoun-T Cloud")
 
 # 가상의 사용자 ID (실제 로그인 기능 전까지 고정)
 USER_ID = "student_demo"
 
-all_questions_raw = load_questions()
-all_courses = load_courses()
+with perf.span("data.load_questions"):
+    all_questions_raw, data_version = load_question_bank()
+with perf.span("data.load_catalog"):
+    course_catalog = load_course_catalog()
 
-with st.sidebar:
+with st.sidebar, perf.span("sidebar"):
     st.header("Controller")
     mode = st.radio("모드 선택", ["👨‍🎓 학습 모드 (Student)", "🛠️ 관리자 모드 (Admin)"])
     st.divider()
@@ -343,13 +910,13 @@ with st.sidebar:
     selected_course = None
     
     if mode == "👨‍🎓 학습 모드 (Student)":
-        if all_courses:
-            engines = sorted(list(set([c['engine_type'] for c in all_courses])))
+        if course_catalog:
+            engines = sorted(list(set([c['engine_type'] for c in course_catalog])))
             sel_engine = st.selectbox("엔진 (Engine)", engines)
-            engine_courses = [c for c in all_courses if c['engine_type'] == sel_engine]
+            engine_courses = [c for c in course_catalog if c['engine_type'] == sel_engine]
             course_map = {c['course_id']: c['title'] for c in engine_courses}
             sel_course_id = st.selectbox("학습 주제 (Topic)", list(course_map.keys()), format_func=lambda x: course_map[x])
-            selected_course = next((c for c in all_courses if c['course_id'] == sel_course_id), None)
+            selected_course = next((c for c in course_catalog if c['course_id'] == sel_course_id), None)
         
         st.divider()
         st.markdown("### 🔍 맞춤 문제 필터")
@@ -379,481 +946,247 @@ with st.sidebar:
 if mode == "👨‍🎓 학습 모드 (Student)":
     if selected_course:
         st.subheader(f"📘 {selected_course['title']}")
-        chapters = selected_course.get('chapters', [])
+        chapters = selected_course.get('chapter_titles', [])
         chapter_titles = [f"Chapter {ch['chapter_id']}. {ch['title']}" for ch in chapters]
         sel_ch_idx = st.selectbox("챕터 선택", range(len(chapters)), format_func=lambda i: chapter_titles[i])
-        current_ch = chapters[sel_ch_idx]
+        # 챕터 본문은 선택한 것만 읽는다 (LRU 캐시)
+        with perf.span("data.load_chapter"):
+            current_ch = load_chapter(selected_course['course_id'], chapters[sel_ch_idx]['chapter_id']) if chapters else None
+        if current_ch is None:
+            if chapters: st.warning("챕터 본문을 찾을 수 없습니다.")
+            current_ch = dict(chapters[sel_ch_idx]) if chapters else {"chapter_id": 0, "title": "-"}
         
-        tab1, tab2, tab3, tab4 = st.tabs(["📊 대시보드", "🧮 시뮬레이터 학습", "📝 유형별 기출", "🔥 실전 모의고사"])
+        # 선택한 화면 하나만 실행 (st.tabs 는 4개 탭 본문을 매번 모두 실행함)
+        STUDENT_VIEWS = {"📊 대시보드": "tab1_notes", "🧮 시뮬레이터 학습": "tab2_simulator", "📝 유형별 기출": "tab3_questions", "🔥 실전 모의고사": "tab4_exam"}
+        student_view = st.segmented_control("학습 화면", list(STUDENT_VIEWS.keys()), default="📊 대시보드", key="student_view", label_visibility="collapsed")
+        if student_view not in STUDENT_VIEWS: student_view = "📊 대시보드"  # 선택 해제 시 기본 화면
+
+        with perf.span(f"student.{STUDENT_VIEWS[student_view]}"):
         
-        # --- [Tab 1] 이론 (단권화 에디터 적용) ---
-        with tab1:
-            st.caption("📝 텍스트를 더블클릭하거나 버튼을 눌러 나만의 단권화 노트를 만드세요.")
+            # --- [Tab 1] 이론 (단권화 에디터 적용) ---
+            if student_view == "📊 대시보드":
+                st.caption("📝 텍스트를 더블클릭하거나 버튼을 눌러 나만의 단권화 노트를 만드세요.")
             
-            # 1. 데이터 로드 (DB or Default)
-            cid = selected_course['course_id']
-            chid = current_ch['chapter_id']
-            sys_text = current_ch.get('theory_markdown', '')
+                # 1. 데이터 로드 (DB or Default)
+                cid = selected_course['course_id']
+                chid = current_ch['chapter_id']
+                sys_text = current_ch.get('theory_markdown', '')
             
-            # Session State 관리 (편집 상태 유지용)
-            if "note_blocks" not in st.session_state:
-                st.session_state.note_blocks = []
-            if "last_loaded" not in st.session_state or st.session_state.last_loaded != f"{cid}_{chid}":
-                st.session_state.note_blocks = NoteManager.load_user_notes(USER_ID, cid, chid, sys_text)
-                st.session_state.last_loaded = f"{cid}_{chid}"
-                # 편집 모드 초기화
-                st.session_state.editing_idx = None 
-
-            blocks = st.session_state.note_blocks
-
-            # 2. 블록 렌더링 Loop
-            for i, block in enumerate(blocks):
-                # 편집 모드인지 확인
-                is_editing = (st.session_state.get('editing_idx') == i)
-                
-                col_content, col_btn = st.columns([0.9, 0.1])
-                
-                with col_content:
-                    if is_editing:
-                        # [편집 모드] 텍스트 에디터 표시
-                        new_content = st.text_area(f"Block {i}", value=block['content'], height=200, key=f"txt_{i}")
-                        c1, c2 = st.columns(2)
-                        if c1.button("💾 저장", key=f"save_{i}"):
-                            blocks[i]['content'] = new_content
-                            blocks[i]['type'] = 'user_edited'
-                            NoteManager.save_user_notes(USER_ID, cid, chid, blocks)
-                            st.session_state.editing_idx = None # 편집 종료
-                            st.rerun()
-                        if c2.button("취소", key=f"cancel_{i}"):
-                            st.session_state.editing_idx = None
-                            st.rerun()
+                # Session State 관리 (편집 상태 유지용)
+                if "note_blocks" not in st.session_state:
+                    st.session_state.note_blocks = []
+                if "last_loaded" not in st.session_state or st.session_state.last_loaded != f"{cid}_{chid}":
+                    st.session_state.note_blocks = NoteManager.load_user_notes(USER_ID, cid, chid, sys_text)
+                    st.session_state.last_loaded = f"{cid}_{chid}"
+                    # 편집 모드 초기화
+                    st.session_state.editing_idx = None 
+                    st.session_state.note_page = 0
+
+                render_note_editor(cid, chid, sys_text)
+
+            # --- [Tab 2] 시뮬레이터 (Insight 추가 적용) ---
+            elif student_view == "🧮 시뮬레이터 학습":
+                render_simulator_panel(current_ch)
+
+            # --- [Tab 3] 기출문제 (AI 해설 저장 기능 추가 ✨) ---
+            elif student_view == "📝 유형별 기출":
+                # 약점 분석: user_stats 문서 하나만 읽는다
+                user_stats = load_user_stats(USER_ID)
+                with st.expander("📉 나의 약점 주제"):
+                    weak_dim = st.segmented_control("기준", list(analytics.DIMENSIONS.keys()), format_func=analytics.DIMENSIONS.get, default="topic", key="weak_dim")
+                    weak_rows = analytics.weak_topics(user_stats, weak_dim or "topic")
+                    if weak_rows:
+                        df_weak = pd.DataFrame(weak_rows)
+                        df_weak["last_at"] = pd.to_datetime(df_weak["last_at"], unit="s").dt.strftime("%Y-%m-%d %H:%M")
+                        st.dataframe(df_weak.rename(columns={"name": analytics.DIMENSIONS[weak_dim or "topic"], "attempts": "시도", "correct": "정답", "accuracy": "정답률", "last_at": "최근 풀이", "last_correct": "최근 정오"}),
+                                     hide_index=True, use_container_width=True)
                     else:
-                        # [보기 모드] Markdown 표시
-                        # 사용자 추가/수정 블록은 배경색을 살짝 다르게 표시 (Highlight)
-                        if block.get('type') == 'user_added':
-                            st.info(block['content'])
-                        elif block.get('type') == 'user_edited':
-                            st.warning(block['content']) # 수정됨 표시
+                        total = user_stats.get("total", {})
+                        st.caption(f"정답률 {analytics.WEAK_ACCURACY:.0%} 미만인 항목이 없습니다. (누적 풀이 {total.get('attempts', 0)}문항)")
+                weak_only = st.toggle("🎯 약점 주제 문제만 보기", key="weak_only")
+                weak_filters = analytics.weak_filter_preset(user_stats, student_filters) if weak_only else None
+                if weak_only and weak_filters is None:
+                    st.info("아직 약점을 판단할 풀이 기록이 부족합니다. 챕터 문제를 보여드립니다.")
+
+                search_query = st.text_input("🔎 문제 검색", key="t3_query", placeholder="예: 사채 상환, 유효이자율 (비우면 챕터 문제)").strip()
+                search_index = get_search_index(data_version, all_questions_raw)
+
+                kws = weak_filters['keywords'] if weak_filters else current_ch.get('related_keywords', [])
+                q_by_id = {q.get('question_id'): q for q in all_questions_raw}
+                focus_id = st.session_state.get('t3_focus') if st.session_state.get('t3_focus') in q_by_id else None
+                if search_query or kws or focus_id:
+                    if focus_id and not (search_query or kws):
+                        matched = []
+                    elif search_query:
+                        # 문제은행 전체에서 관련도 상위 SEARCH_TOP_K 개 -> 사이드바 조건
+                        matched = [q_by_id[i] for i, _ in search_index.search(search_query, k=SEARCH_TOP_K) if i in q_by_id and passes_filters(q_by_id[i], student_filters)]
+                    else:
+                        if weak_filters:
+                            matched = advanced_filter_questions(all_questions_raw, weak_filters)
                         else:
-                            st.markdown(block['content'])
-                
-                with col_btn:
-                    # 도구 버튼 (편집, 삭제)
-                    if not is_editing:
-                        if st.button("✏️", key=f"edit_btn_{i}", help="수정"):
-                            st.session_state.editing_idx = i
-                            st.rerun()
-                        if st.button("🗑️", key=f"del_btn_{i}", help="삭제(숨김)"):
-                            blocks.pop(i)
-                            NoteManager.save_user_notes(USER_ID, cid, chid, blocks)
+                            # 챕터 키워드 매칭은 캐시, 사이드바 조건(연도/시험/난이도)만 지금 적용
+                            matched = get_chapter_index().chapter_questions(
+                                data_version, all_questions_raw,
+                                selected_course['course_id'], current_ch['chapter_id'], kws, student_filters)
+                        # 키워드와 관련도 높은 문제부터
+                        m_by_id = {q['question_id']: q for q in matched}
+                        matched = [m_by_id[i] for i in search_index.rank(" ".join(kws), list(m_by_id))]
+
+                    # '비슷한 기출'에서 고른 문제는 목록 맨 앞에 (조건과 상관없이)
+                    if focus_id:
+                        matched = [q_by_id[focus_id]] + [q for q in matched if q['question_id'] != focus_id]
+                        c_focus, c_clear = st.columns([4, 1])
+                        c_focus.caption(f"🔗 비슷한 기출에서 이동: {focus_id}")
+                        if c_clear.button("✖ 해제", key="t3_focus_clear"):
+                            st.session_state.pop('t3_focus', None)
                             st.rerun()
-            
-            # 3. 새 블록 추가 버튼 (하단)
-            st.divider()
-            if st.button("➕ 나만의 메모/오답노트 추가하기"):
-                # 새 블록 생성
-                new_block = {
-                    "id": str(uuid.uuid4())[:8],
-                    "content": "### 📌 나만의 메모\n여기에 내용을 입력하세요.",
-                    "type": "user_added"
-                }
-                blocks.append(new_block)
-                NoteManager.save_user_notes(USER_ID, cid, chid, blocks)
-                # 바로 편집 모드로 진입
-                st.session_state.editing_idx = len(blocks) - 1
-                st.rerun()
-            
-            # 4. 초기화 버튼 (망쳤을 때)
-            if st.button("🔄 원본으로 초기화 (내 메모 삭제)", type="secondary"):
-                blocks = NoteManager.parse_markdown_to_blocks(sys_text)
-                st.session_state.note_blocks = blocks
-                NoteManager.save_user_notes(USER_ID, cid, chid, blocks)
-                st.rerun()
 
-        # --- [Tab 2] 시뮬레이터 (Insight 추가 적용) ---
-        with tab2:
-            sim_type = current_ch.get('simulator_type', 'default')
-            defaults = current_ch.get('simulator_defaults', {})
-            
-            if "bond" in sim_type:
-                c1, c2 = st.columns([1,2])
-                with c1:
-                    f = st.number_input("액면", value=defaults.get('face', 100000))
-                    c = st.number_input("표시율", value=defaults.get('crate',0.05))
-                    m = st.number_input("시장율", value=defaults.get('mrate',0.08))
-                    p = st.slider("기간", 1, 10, 3)
+                    if matched:
+                        st.success(f"🔍 조건에 맞는 문제 {len(matched)}개를 찾았습니다.")
                     
-                    # [NEW] 챕터 제목에 '조기상환'이 있으면 추가 옵션 표시 ✨
-                    redeem_stats = None
-                    if "조기상환" in current_ch['title']:
-                        st.markdown("---")
-                        st.caption("💰 조기상환 시뮬레이션")
-                        r_period = st.slider("상환 시점(연말)", 1, p, min(2, p))
-                        r_amt = st.number_input("상환 지급액", value=int(f * 0.98), step=1000)
-                        redeem_stats = {'period': r_period, 'amount': r_amt}
+                        q_opts = {}
+                        for q in matched:
+                            year = q.get('exam_info', {}).get('year', '-')
+                            etype = q.get('exam_info', {}).get('type', '')
+                            q_opts[q['question_id']] = f"[{year} {etype}] {q['topic']}"
                         
-                with c2:
-                    # 함수에 redeem_stats 전달
-                    pv, df, insight = Simulators.bond_basic(f, c, m, p, redeem_stats)
-                    st.metric("PV", f"{pv:,}")
-                    st.dataframe(df, use_container_width=True)
-                    # 상환 분석 결과가 포함된 텍스트 출력
-                    if redeem_stats:
-                        st.success(insight) # 강조 효과
-                    else:
-                        st.info(insight)
-
-            elif "entity_equity" in sim_type:
-                c1, c2 = st.columns([1,1.5])
-                with c1:
-                    cost = st.number_input("원가", value=defaults.get('cost',1000))
-                    shr = st.number_input("지분", value=defaults.get('share',0.2))
-                    ni = st.number_input("순이익", value=defaults.get('net_income',0))
-                    dv = st.number_input("배당", value=defaults.get('dividends',0))
-                with c2:
-                    v, df, insight = Simulators.entity_equity(cost, shr, ni, dv)
-                    st.metric("기말장부", f"{v:,}")
-                    st.bar_chart(df.set_index("구분")["금액"])
-                    st.info(insight)
-
-            elif "depreciation" in sim_type:
-                c1, c2 = st.columns([1,2])
-                with c1:
-                    cost = st.number_input("원가", value=defaults.get('cost', 1000))
-                    res = st.number_input("잔존", value=defaults.get('residual', 100))
-                    life = st.number_input("내용연수", value=defaults.get('life', 5))
-                    rate = None
-                    if "db" in sim_type: rate = st.number_input("상각률", value=defaults.get('rate', 0.451))
-                    mtd = "DB" if "db" in sim_type else ("SYD" if "syd" in sim_type else "SL")
-                with c2:
-                    df, insight = Simulators.depreciation(cost, res, life, mtd, rate)
-                    st.line_chart(df['기말장부'].str.replace(",","").astype(int))
-                    st.dataframe(df, use_container_width=True)
-                    st.info(insight)
-
-            elif "inventory" in sim_type:
-                c1, c2 = st.columns(2)
-                with c1: bq = st.number_input("기초Q", 100); bp = st.number_input("기초P", 100)
-                with c2: buyq = st.number_input("매입Q", 100); buyp = st.number_input("매입P", 120)
-                sq = st.slider("판매Q", 0, bq+buyq, 150)
-                c, e, r1, r2, insight = Simulators.inventory_fifo(bq, bp, buyq, buyp, sq)
-                st.success(f"매출원가: {c:,}")
-                st.info(f"기말재고: {e:,}")
-                st.markdown(insight)
-
-            else: 
-                st.info("이론 중심 챕터입니다.")
-
-        # --- [Tab 3] 기출문제 (AI 해설 저장 기능 추가 ✨) ---
-        with tab3:
-            kws = current_ch.get('related_keywords', [])
-            if kws:
-                student_filters['keywords'] = kws
-                matched = advanced_filter_questions(all_questions_raw, student_filters)
-                
-                if matched:
-                    st.success(f"🔍 조건에 맞는 문제 {len(matched)}개를 찾았습니다.")
+                        qid = st.selectbox("문제 선택", list(q_opts.keys()), format_func=lambda x: q_opts[x])
+                        q_data = next(q for q in matched if q['question_id'] == qid)
                     
-                    q_opts = {}
-                    for q in matched:
-                        year = q.get('exam_info', {}).get('year', '-')
-                        etype = q.get('exam_info', {}).get('type', '')
-                        q_opts[q['question_id']] = f"[{year} {etype}] {q['topic']}"
-                        
-                    qid = st.selectbox("문제 선택", list(q_opts.keys()), format_func=lambda x: q_opts[x])
-                    q_data = next(q for q in matched if q['question_id'] == qid)
-                    
-                    st.divider()
+                        st.divider()
                     
-                    tags = q_data.get('tags', [])
-                    if tags: st.caption("Tags: " + " ".join([f"`#{t}`" for t in tags]))
+                        tags = q_data.get('tags', [])
+                        if tags: st.caption("Tags: " + " ".join([f"`#{t}`" for t in tags]))
                     
-                    c_q, c_a = st.columns([1.5, 1])
+                        c_q, c_a = st.columns([1.5, 1])
                     
-                    # [왼쪽] 문제 및 시뮬레이터
-                    with c_q:
-                        st.markdown(f"**Q. {q_data['topic']}**")
-                        st.markdown(q_data['content_markdown'])
+                        # [왼쪽] 문제 및 시뮬레이터
+                        with c_q:
+                            st.markdown(f"**Q. {q_data['topic']}**")
+                            st.markdown(q_data['content_markdown'])
                         
-                        opts = q_data.get('choices')
-                        if opts:
-                            if isinstance(opts, dict): opts = [f"{k}. {v}" for k,v in sorted(opts.items())]
-                            st.radio("정답", opts, label_visibility="collapsed")
+                            opts = q_data.get('choices')
+                            if opts:
+                                numbered = isinstance(opts, dict)
+                                if numbered: opts = [f"{k}. {v}" for k,v in sorted(opts.items())]
+                                picked = st.radio("정답", opts, index=None, label_visibility="collapsed", key=f"t3_radio_{qid}")
+                                if st.button("✅ 채점하기", key=f"t3_grade_{qid}", disabled=picked is None):
+                                    choice_no = picked.split('.')[0].strip() if numbered else str(opts.index(picked) + 1)
+                                    is_correct = choice_no == str(q_data.get('answer', '')).strip()
+                                    # 약점 분석 집계에는 세션당 문제별 첫 채점만 기록 (같은 문제를 다시 눌러도 중복 집계 안 함)
+                                    graded = st.session_state.setdefault('t3_graded', set())
+                                    if qid not in graded:
+                                        graded.add(qid)
+                                        record_answer_events(USER_ID, [analytics.answer_event(q_data, is_correct, "tab3")])
+                                    if is_correct: st.success("🎉 정답입니다!")
+                                    else: st.error("앗, 틀렸습니다. 해설을 확인해 보세요.")
                             
-                        # 시뮬레이터
-                        sim_config = q_data.get('sim_config')
-                        if sim_config:
-                            st.write("---")
-                            with st.expander(f"🧪 {sim_config.get('label', '시뮬레이터로 검증하기')}"):
-                                s_type = sim_config.get('type')
-                                p = sim_config.get('params', {})
-                                
-                                # 1. Bond
-                                if s_type == "bond_basic":
-                                    f_val = st.number_input("액면", value=p.get('face', 100000), key=f"s_{qid}_f")
-                                    c_val = st.number_input("표시이자", value=p.get('crate', 0.05), format="%.2f", key=f"s_{qid}_c")
-                                    m_val = st.number_input("유효이자", value=p.get('mrate', 0.08), format="%.2f", key=f"s_{qid}_m")
-                                    
-                                    # [수정] insight unpack & display
-                                    res_p, res_df, insight = Simulators.bond_basic(f_val, c_val, m_val, p.get('periods', 3))
-                                    st.dataframe(res_df, use_container_width=True)
-                                    st.info(insight)
-                                    
-                                # 2. Depreciation
-                                elif s_type == "depreciation":
-                                    c_val = st.number_input("취득원가", value=p.get('cost', 1000), key=f"s_{qid}_cost")
-                                    r_val = st.number_input("잔존가치", value=p.get('residual', 0), key=f"s_{qid}_res")
-                                    l_val = st.number_input("내용연수", value=p.get('life', 5), key=f"s_{qid}_life")
-                                    rate_val = p.get('rate')
-                                    method_val = p.get('method', 'SL')
-                                    
-                                    df, insight = Simulators.depreciation(c_val, r_val, l_val, method_val, rate_val)
-                                    st.line_chart(df['기말장부'].str.replace(",","").astype(int))
-                                    st.dataframe(df, use_container_width=True)
-                                    st.info(insight)
-                                    
-                                # 3. Inventory
-                                elif s_type == "inventory_fifo":
-                                    bq = p.get('base_qty', 100); bp = p.get('base_price', 100)
-                                    buyq = p.get('buy_qty', 100); buyp = p.get('buy_price', 120)
-                                    sell_q = st.slider("판매수량 시뮬레이션", 0, bq+buyq, p.get('sell_qty', 150), key=f"s_{qid}_sell")
-                                    
-                                    cogs, end, r1, r2, insight = Simulators.inventory_fifo(bq, bp, buyq, buyp, sell_q)
-                                    st.success(f"매출원가: {cogs:,}")
-                                    st.info(f"기말재고: {end:,}")
-                                    st.caption(insight)
-
-                                # 4. Entity
-                                elif s_type == "entity_equity":
-                                    c_cost = st.number_input("취득원가", value=p.get('cost', 1000000), key=f"s_{qid}_ec")
-                                    c_share = st.number_input("지분율", value=p.get('share', 0.2), key=f"s_{qid}_es")
-                                    c_ni = st.number_input("순이익", value=p.get('net_income', 0), key=f"s_{qid}_eni")
-                                    c_div = st.number_input("배당금", value=p.get('dividends', 0), key=f"s_{qid}_ediv")
-                                    
-                                    ebv, edf, insight = Simulators.entity_equity(c_cost, c_share, c_ni, c_div)
-                                    st.metric("기말 장부금액", f"{ebv:,}")
-                                    st.bar_chart(edf.set_index("구분")["금액"])
-                                    st.info(insight)
-
-                    # [오른쪽] 해설 (AI 저장 기능 적용)
-                    with c_a:
-                        # 해설 펼침 상태: 이미 해설이 있으면 펼쳐둠
-                        has_solution = bool(q_data.get('solution_steps') or q_data.get('steps'))
-                        with st.expander("💡 해설 보기", expanded=has_solution):
-                            st.info(f"정답: {q_data.get('answer', '?')}")
+                            # 시뮬레이터
+                            sim_config = q_data.get('sim_config')
+                            if sim_config:
+                                st.write("---")
+                                with st.expander(f"🧪 {sim_config.get('label', '시뮬레이터로 검증하기')}"):
+                                    render_question_simulator(qid, sim_config)
+
+                            # 비슷한 기출: 미리 계산된 이웃 목록에서 딕셔너리 조회 한 번
+                            rel = [(rid, sc) for rid, sc in load_related().get(qid, []) if rid in q_by_id][:RELATED_SHOW]
+                            if rel:
+                                st.write("---")
+                                st.markdown("**🔗 비슷한 기출**")
+                                for rid, sc in rel:
+                                    r_q = q_by_id[rid]
+                                    r_info = r_q.get('exam_info') or {}
+                                    if st.button(f"[{r_info.get('year', '-')} {r_info.get('type', '')}] {r_q.get('topic', '')} · 유사도 {sc:.2f}", key=f"t3_rel_{qid}_{rid}"):
+                                        st.session_state['t3_focus'] = rid
+                                        st.rerun()
+
+                        # [오른쪽] 해설 (AI 저장 기능 적용)
+                        with c_a:
+                            # 해설 펼침 상태: 이미 해설이 있으면 펼쳐둠
+                            has_solution = bool(q_data.get('solution_steps') or q_data.get('steps'))
+                            with st.expander("💡 해설 보기", expanded=has_solution):
+                                st.info(f"정답: {q_data.get('answer', '?')}")
                             
-                            sols = q_data.get('solution_steps') or q_data.get('steps')
+                                sols = q_data.get('solution_steps') or q_data.get('steps')
                             
-                            if sols:
-                                # 저장된 해설이 있는 경우 바로 표시
-                                for s in sols:
-                                    # -------------------------------------------------
-                                    # 1. 제목(Title) 꾸미기
-                                    # -------------------------------------------------
-                                    raw_title = s.get('title', 'Step')
-                                    # 제목의 [주제] -> 파란색 볼드체
-                                    styled_title = re.sub(r"\[(.*?)\]", r"**:blue[[\1]]**", raw_title)
-                                    st.markdown(f"#### {styled_title}")
+                                if sols:
+                                    # 저장된 해설이 있는 경우 바로 표시
+                                    for s in sols:
+                                        # -------------------------------------------------
+                                        # 1. 제목(Title) 꾸미기
+                                        # -------------------------------------------------
+                                        raw_title = s.get('title', 'Step')
+                                        # 제목의 [주제] -> 파란색 볼드체
+                                        styled_title = re.sub(r"\[(.*?)\]", r"**:blue[[\1]]**", raw_title)
+                                        st.markdown(f"#### {styled_title}")
                                     
-                                    # -------------------------------------------------
-                                    # 2. 본문(Content) 꾸미기
-                                    # -------------------------------------------------
-                                    raw_content = s.get('content', '')
+                                        # -------------------------------------------------
+                                        # 2. 본문(Content) 꾸미기
+                                        # -------------------------------------------------
+                                        raw_content = s.get('content', '')
                                     
-                                    # (1) 줄바꿈 문자 치환 (\n -> 실제 엔터)
-                                    content = raw_content.replace('\\n', '\n')
+                                        # (1) 줄바꿈 문자 치환 (\n -> 실제 엔터)
+                                        content = raw_content.replace('\\n', '\n')
                                     
-                                    # (2) 본문 속 [주제] -> 파란색 볼드체 (예: [무형자산])
-                                    content = re.sub(r"\[(.*?)\]", r"**:blue[[\1]]**", content)
+                                        # (2) 본문 속 [주제] -> 파란색 볼드체 (예: [무형자산])
+                                        content = re.sub(r"\[(.*?)\]", r"**:blue[[\1]]**", content)
                                     
-                                    # (3) 본문 속 (ID: ...) -> 회색 작게 처리 (예: (ID: 2017...))
-                                    # Streamlit의 :gray[...] 태그 사용
-                                    content = re.sub(r"\(ID: (.*?)\)", r"**:gray[(ID: \1)]**", content)
+                                        # (3) 본문 속 (ID: ...) -> 회색 작게 처리 (예: (ID: 2017...))
+                                        # Streamlit의 :gray[...] 태그 사용
+                                        content = re.sub(r"\(ID: (.*?)\)", r"**:gray[(ID: \1)]**", content)
 
-                                    # (4) 핵심 키워드 강조 (선택사항)
-                                    # 혹시 '**...**' 패턴이 깨질까봐 걱정되면 건너뛰어도 됨 (AI가 이미 잘 줌)
+                                        # (4) 핵심 키워드 강조 (선택사항)
+                                        # 혹시 '**...**' 패턴이 깨질까봐 걱정되면 건너뛰어도 됨 (AI가 이미 잘 줌)
 
-                                    st.markdown(content)
-                                    st.divider()
-                            else:
-                                st.warning("등록된 해설이 없습니다.")
-                                
-                                # AI 해설 요청 버튼
-                                if GEMINI_AVAILABLE:
-                                    if st.button("🤖 AI 해설 요청 및 저장", key=f"ai_btn_{qid}"):
-                                        with st.spinner("AI가 해설을 작성하고 DB에 저장 중입니다..."):
-                                            try:
-                                                model = genai.GenerativeModel("gemini-2.5-flash")
-                                                # 구조화된 답변을 유도하는 프롬프트
-                                                prompt = f"""
-                                                문제: {q_data['content_markdown']}
-                                                위 문제에 대해 초심자도 이해하기 쉬운 단계별 해설을 작성해줘.
-                                                형식은 자유롭게 하되, 마크다운을 적절히 사용해.
-                                                """
-                                                response = model.generate_content(prompt)
-                                                ai_text = response.text
-                                                
-                                                # DB에 저장할 포맷으로 변환
-                                                new_solution = [
-                                                    {
-                                                        "title": "🤖 AI 선생님의 해설", 
-                                                        "content": ai_text
-                                                    }
-                                                ]
-                                                
-                                                # Firestore 저장
-                                                if update_question_solution(qid, new_solution):
-                                                    st.success("해설이 저장되었습니다! 새로고침합니다.")
-                                                    load_questions.clear() # 캐시 초기화 (중요)
-                                                    st.rerun() # 화면 새로고침하여 해설 표시
-                                                
-                                            except Exception as e:
-                                                st.error(f"오류 발생: {e}")
+                                        st.markdown(content)
+                                        st.divider()
                                 else:
-                                    st.caption("AI 기능을 사용하려면 API 키가 필요합니다.")
+                                    st.warning("등록된 해설이 없습니다.")
+                                
+                                    # AI 해설 요청 버튼
+                                    if GEMINI_AVAILABLE:
+                                        render_ai_solution(qid, q_data)
+                                    else:
+                                        st.caption("AI 기능을 사용하려면 API 키가 필요합니다.")
+                    else:
+                        st.warning("조건에 맞는 문제가 없습니다.")
                 else:
-                    st.warning("조건에 맞는 문제가 없습니다.")
-            else:
-                st.info("이 챕터에는 연결된 태그가 없습니다.")
-
-        # --- [Tab 4] 실전 모의고사 (새로 추가된 부분 ✨) ---
-        with tab4:
-            st.header("🔥 실전 모의고사 (Exam Mode)")
-            st.caption("실제 시험처럼 연도별로 문제를 순서대로 풀어봅니다.")
-
-            # 1. 시험지 선택 (Filter)
-            # 데이터에서 존재하는 연도와 유형 추출
-            available_years = sorted(list(set([q.get('exam_info', {}).get('year') for q in all_questions_raw if q.get('exam_info', {}).get('year')])), reverse=True)
-            available_types = sorted(list(set([q.get('exam_info', {}).get('type') for q in all_questions_raw if q.get('exam_info', {}).get('type')])))
-
-            c_filter1, c_filter2, c_btn = st.columns([1, 1, 1])
-            with c_filter1:
-                sel_year = st.selectbox("연도 선택", available_years)
-            with c_filter2:
-                sel_type = st.selectbox("시험 유형", available_types)
+                    st.info("이 챕터에는 연결된 태그가 없습니다.")
+
+            # --- [Tab 4] 실전 모의고사 (새로 추가된 부분 ✨) ---
+            elif student_view == "🔥 실전 모의고사":
+                st.header("🔥 실전 모의고사 (Exam Mode)")
+                st.caption("실제 시험처럼 연도별로 문제를 순서대로 풀어봅니다.")
+
+                # 1. 시험지 선택 (Filter)
+                # 데이터에서 존재하는 연도와 유형 추출
+                available_years = sorted(list(set([q.get('exam_info', {}).get('year') for q in all_questions_raw if q.get('exam_info', {}).get('year')])), reverse=True)
+                available_types = sorted(list(set([q.get('exam_info', {}).get('type') for q in all_questions_raw if q.get('exam_info', {}).get('type')])))
+
+                c_filter1, c_filter2, c_btn = st.columns([1, 1, 1])
+                with c_filter1:
+                    sel_year = st.selectbox("연도 선택", available_years)
+                with c_filter2:
+                    sel_type = st.selectbox("시험 유형", available_types)
             
-            # 2. 문제 데이터 로드
-            exam_questions = get_exam_questions(all_questions_raw, sel_type, sel_year)
+                # 2. 문제 데이터 로드
+                exam_questions = get_exam_questions(all_questions_raw, sel_type, sel_year)
             
-            if not exam_questions:
-                st.warning("조건에 맞는 문제가 없습니다.")
-            else:
-                # 3. 네비게이션 (Session State 사용)
-                if 'exam_idx' not in st.session_state:
-                    st.session_state.exam_idx = 0
-                
-                # 시험지가 바뀌면 인덱스 초기화 (안전장치)
-                # (구현 팁: 단순화를 위해 여기서는 생략하나, 필요 시 로직 추가 가능)
-
-                total_q = len(exam_questions)
-                curr_idx = st.session_state.exam_idx
-                
-                # 인덱스 범위 보정
-                if curr_idx >= total_q: curr_idx = total_q - 1
-                if curr_idx < 0: curr_idx = 0
-                
-                q_data = exam_questions[curr_idx]
-                qid = q_data['question_id']
-
-                # --- 상단 네비게이션 바 ---
-                c_prev, c_info, c_next = st.columns([1, 2, 1])
-                with c_prev:
-                    if st.button("⬅️ 이전 문제", disabled=(curr_idx == 0), key="btn_prev"):
-                        st.session_state.exam_idx -= 1
-                        st.rerun()
-                with c_info:
-                    st.markdown(f"<h4 style='text-align: center;'>제 {curr_idx + 1} 번 / 총 {total_q} 문항</h4>", unsafe_allow_html=True)
-                with c_next:
-                    if st.button("다음 문제 ➡️", disabled=(curr_idx == total_q - 1), key="btn_next"):
-                        st.session_state.exam_idx += 1
-                        st.rerun()
-                
-                st.progress((curr_idx + 1) / total_q)
-                st.divider()
-
-                # 4. 문제 풀이 영역
-                col_q, col_solve = st.columns([1.2, 1])
-                
-                # [왼쪽] 지문 및 보기
-                with col_q:
-                    st.badge(q_data['topic'])
-                    st.markdown(q_data['content_markdown'])
-                    
-                    # 보기 출력
-                    opts = q_data.get('choices', {})
-                    user_ans = st.radio("정답 선택", [f"{k}. {v}" for k,v in sorted(opts.items())], key=f"exam_radio_{qid}")
-
-                # [오른쪽] 정답 확인 및 해설
-                with col_solve:
-                    st.info("💡 문제를 푼 뒤 아래 버튼을 눌러 확인하세요.")
-                    
-                    # 정답 확인 토글
-                    with st.expander("✅ 정답 및 해설 확인", expanded=False):
-                        ans = q_data.get('answer', 0)
-                        st.markdown(f"### 정답: **{ans}번**")
-                        
-                        if str(ans) in user_ans:
-                            st.success("🎉 정답입니다!")
-                        else:
-                            st.error("앗, 틀렸습니다. 다시 풀어보세요.")
-
-                        st.markdown("---")
-                        
-                        # (A) 저장된 해설 표시
-                        solutions = q_data.get('solution_steps', [])
-                        if solutions:
-                            for s in solutions:
-                                # -------------------------------------------------
-                                # 1. 제목(Title) 꾸미기
-                                # -------------------------------------------------
-                                raw_title = s.get('title', 'Step')
-                                # [주제] -> 파란색 볼드체
-                                styled_title = re.sub(r"\[(.*?)\]", r"**:blue[[\1]]**", raw_title)
-                                st.markdown(f"#### {styled_title}")
-                                
-                                # -------------------------------------------------
-                                # 2. 본문(Content) 꾸미기 (줄바꿈 + 스타일링)
-                                # -------------------------------------------------
-                                raw_content = s.get('content', '')
-                                
-                                # (1) 줄바꿈 문자 치환 (핵심!)
-                                # DB에 저장된 "\\n" 문자열을 실제 줄바꿈 엔터키로 변경
-                                content = raw_content.replace('\\n', '\n')
-                                
-                                # (2) 본문 속 [주제] -> 파란색 볼드체
-                                content = re.sub(r"\[(.*?)\]", r"**:blue[[\1]]**", content)
-                                
-                                # (3) 본문 속 (ID: ...) -> 회색 작게 처리
-                                content = re.sub(r"\(ID: (.*?)\)", r"**:gray[(ID: \1)]**", content)
-
-                                st.markdown(content)
-                                st.divider()
-                        else:
-                            st.warning("등록된 해설이 없습니다.")
-                            # (B) AI 해설 요청 버튼 (기존 로직 재사용)
-                            if GEMINI_AVAILABLE:
-                                if st.button("🤖 AI 해설 요청 (DB저장)", key=f"exam_ai_{qid}"):
-                                    # ... (AI 해설 요청 코드: 위에서 만든 코드 그대로 사용) ...
-                                    pass 
-
-                    # 시뮬레이터 (필요시 열어보기)
-                    sim_conf = q_data.get('sim_config')
-                    if sim_conf:
-                        with st.expander(f"🧪 시뮬레이터로 검증 ({sim_conf.get('type')})"):
-                            # 기존 시뮬레이터 렌더링 로직 재사용
-                            # Tab 3의 시뮬레이터 렌더링 코드를 함수화해서 호출하거나, 
-                            # 여기서 간단히 params만 받아서 Simulators 클래스 호출
-                            pass
+                if not exam_questions:
+                    st.warning("조건에 맞는 문제가 없습니다.")
+                else:
+                    render_exam_navigator(exam_questions, sel_type, sel_year)
 
 # ---------------------------------------------------------
 # [B] 관리자 모드 (Admin)
 # ---------------------------------------------------------
 elif mode == "🛠️ 관리자 모드 (Admin)":
     st.header("🛠️ 통합 관리 센터")
-    tab_course, tab_quest = st.tabs(["📚 커리큘럼 관리", "📥 문제/해설 통합 관리"])
+    tab_course, tab_quest, tab_snap, tab_perf = st.tabs(["📚 커리큘럼 관리", "📥 문제/해설 통합 관리", "💾 스냅샷", "⏱️ Performance"])
     
     # 1. 커리큘럼
-    with tab_course:
+    with tab_course, perf.span("admin.courses"):
+        all_courses = load_courses()
         st.markdown("#### 1️⃣ 등록된 코스 목록")
         if all_courses:
             df_c = pd.DataFrame(all_courses)
@@ -883,22 +1216,34 @@ elif mode == "🛠️ 관리자 모드 (Admin)":
                 try:
                     data = json.loads(c_json)
                     if not isinstance(data, list): data = [data]
-                    save_json_batch("courses", data, "course_id")
+                    save_courses(data)
                     st.success("저장 완료"); load_courses.clear(); st.rerun()
                 except Exception as e: st.error(e)
         with c2:
             if selected and st.button("🗑️ 삭제"):
-                delete_document("courses", selected[0]['course_id'])
+                delete_course(selected[0]['course_id'])
                 st.success("삭제 완료"); load_courses.clear(); st.rerun()
 
+        # 기존 embedded 과목(챕터 본문이 과목 문서 안에 있음) -> chapters 서브컬렉션
+        embedded_ids = [c['course_id'] for c in course_catalog if c.get('layout') != catalog.LAYOUT_SPLIT]
+        if embedded_ids:
+            st.divider()
+            st.caption(f"📦 챕터 본문이 과목 문서에 포함된 과목 {len(embedded_ids)}개: {', '.join(embedded_ids)}")
+            if st.button("🔀 챕터를 서브컬렉션으로 분리 저장"):
+                moved = catalog.migrate_embedded_courses(store)
+                _refresh_chapter_index("courses", items=[{"course_id": cid} for cid, _ in moved])
+                st.success(f"{len(moved)}개 과목 이전 완료"); load_courses.clear(); st.rerun()
+
     # 2. 문제/해설 통합
-    with tab_quest:
+    with tab_quest, perf.span("admin.questions"):
         st.header("🗂️ 문제 및 해설 데이터베이스 관리")
 
         # 1. DB에서 데이터 로드
         db_questions = load_questions()
+        get_dedupe_index()  # 가져오기 중복 검사 / 중복 리포트용 색인 (프로세스당 한 번, 이후 저장은 증분 반영)
 
         # [NEW] 데이터 프레임 가공 (보기 좋게 변환) ✨
+        _grid_t0 = time.perf_counter()
         if db_questions:
             df = pd.DataFrame(db_questions)
             
@@ -937,6 +1282,7 @@ elif mode == "🛠️ 관리자 모드 (Admin)":
                 )
         else:
             df = pd.DataFrame()
+        perf.record("admin.grid_build", (time.perf_counter() - _grid_t0) * 1000)
         
         # 2. Grid 구성
         gb = GridOptionsBuilder.from_dataframe(df)
@@ -1037,9 +1383,10 @@ elif mode == "🛠️ 관리자 모드 (Admin)":
                             "solution_steps": [] # 해설도 같이 날아갔을 수 있으므로 빈 리스트
                         }
                         
-                        db.collection("questions").document(str(q_id)).set(repair_template) # update 대신 set으로 완전히 덮어쓰기
+                        store.set_document("questions", q_id, repair_template) # update 대신 set으로 완전히 덮어쓰기
+                        _refresh_chapter_index("questions", items=[repair_template])
                         st.success(f"[{q_id}] 문제 데이터를 정상 템플릿으로 초기화했습니다.")
-                        load_questions.clear()
+                        load_question_bank.clear()
                         time.sleep(1.0)
                         st.rerun()
                         
@@ -1055,9 +1402,9 @@ elif mode == "🛠️ 관리자 모드 (Admin)":
                     st.warning("정말 삭제하시겠습니까? 복구할 수 없습니다.")
                     if st.button("❌ 현재 문제 삭제하기", key="btn_delete"):
                         q_id_to_delete = target_q_data.get('question_id')
-                        db.collection("questions").document(str(q_id_to_delete)).delete()
+                        delete_document("questions", q_id_to_delete)
                         st.success("삭제되었습니다.")
-                        load_questions.clear()
+                        load_question_bank.clear()
                         time.sleep(1.0)
                         st.rerun()
 
@@ -1080,17 +1427,28 @@ elif mode == "🛠️ 관리자 모드 (Admin)":
             # JSON 입력창 (오염 시 비활성 느낌을 주기 위해 placeholder 활용 가능하나 여기선 값 비움)
             q_json_input = st.text_area("Master JSON Input", value=default_val_q, height=400, key="master_json_area")
 
+            # 직전 저장에서 건너뛴 중복 의심 문항 (저장 후 rerun 되어도 보이도록 session_state 에 보관)
+            if st.session_state.get('import_dups'):
+                st.warning(f"중복 의심 문항 {len(st.session_state['import_dups'])}건은 저장하지 않았습니다. 필요하면 '그래도 저장'으로 다시 저장하세요.")
+                st.dataframe(pd.DataFrame(st.session_state['import_dups']), use_container_width=True, hide_index=True)
+            dup_policy = st.radio("신규 문제가 기존 문제와 거의 같으면", ["건너뛰기", "그래도 저장"], horizontal=True, key="dup_policy")
+
             # 저장 버튼 (오염된 상태에서는 저장 버튼을 숨기거나 막는 것이 안전하지만, 사용자가 직접 고쳐서 넣을 수도 있으니 유지)
             if st.button(btn_save_label, key="btn_master_save"):
                 try:
                     save_data = json.loads(q_json_input)
                     if isinstance(save_data, list): data_list = save_data
                     else: data_list = [save_data]
+
+                    dups = find_import_duplicates(data_list) if dup_policy == "건너뛰기" else []
+                    st.session_state['import_dups'] = dups
+                    skip_ids = {d['question_id'] for d in dups}
+                    data_list = [q for q in data_list if q.get('question_id') not in skip_ids]
+                    if data_list:
+                        save_json_batch("questions", data_list, "question_id")
                     
-                    save_json_batch("questions", data_list, "question_id")
-                    
-                    st.success(f"저장 완료! ({len(data_list)}건)")
-                    load_questions.clear()
+                    st.success(f"저장 완료! ({len(data_list)}건, 중복 의심 {len(dups)}건 제외)")
+                    load_question_bank.clear()
                     time.sleep(1.0)
                     st.rerun()
                 except Exception as e:
@@ -1103,7 +1461,7 @@ elif mode == "🛠️ 관리자 모드 (Admin)":
             st.subheader("💡 해설(Solution) 전용 관리")
             
             # 1. 기존 데이터 가져오기
-            current_sol = target_q_data.get('solution_steps', [])
+            current_sol = (target_q_data or {}).get('solution_steps', [])
             
             # [긴급] 데이터 오염 감지 로직 (Apache Arrow 포맷 감지) ✨
             is_corrupted = False
@@ -1130,9 +1488,9 @@ elif mode == "🛠️ 관리자 모드 (Admin)":
                 # [복구 버튼]
                 if st.button("🛠️ 오염된 데이터 초기화 (Fix)", key="btn_fix_corruption"):
                     t_id = target_q_data.get('question_id')
-                    db.collection("questions").document(str(t_id)).update({"solution_steps": []})
+                    store.update_document("questions", t_id, {"solution_steps": []})
                     st.success(f"[{t_id}] 문제의 해설 데이터를 정상화(초기화)했습니다.")
-                    load_questions.clear()
+                    load_question_bank.clear()
                     time.sleep(1.0)
                     st.rerun()
             
@@ -1172,7 +1530,7 @@ elif mode == "🛠️ 관리자 모드 (Admin)":
                                 t_id = item.get("question_id")
                                 t_steps = item.get("solution_steps")
                                 if t_id:
-                                    db.collection("questions").document(str(t_id)).update({"solution_steps": t_steps})
+                                    store.update_document("questions", t_id, {"solution_steps": t_steps})
                                     success_count += 1
                                 progress_bar.progress((i + 1) / len(input_data))
                             st.success(f"총 {success_count}건 업데이트!")
@@ -1181,14 +1539,14 @@ elif mode == "🛠️ 관리자 모드 (Admin)":
                             # 단일 저장
                             if target_q_data:
                                 t_id = target_q_data['question_id']
-                                db.collection("questions").document(str(t_id)).update({"solution_steps": input_data})
+                                store.update_document("questions", t_id, {"solution_steps": input_data})
                                 st.success(f"[{t_id}] 저장 완료")
                             else:
                                 st.error("문제 선택 필요")
                         else:
                             st.error("형식 불일치")
                             
-                        load_questions.clear()
+                        load_question_bank.clear()
                         time.sleep(1.0)
                         st.rerun()
                     except Exception as e:
@@ -1198,8 +1556,142 @@ elif mode == "🛠️ 관리자 모드 (Admin)":
                 if target_q_data:
                     if st.button("🗑️ 해설 비우기", key="btn_sol_clear"):
                         t_id = target_q_data['question_id']
-                        db.collection("questions").document(str(t_id)).update({"solution_steps": []})
+                        store.update_document("questions", t_id, {"solution_steps": []})
                         st.success("초기화 완료")
-                        load_questions.clear()
+                        load_question_bank.clear()
                         time.sleep(1.0)
-                        st.rerun()
\ No newline at end of file
+                        st.rerun()
+
+        # 4. 사채 sim_config 일괄 검산 (발행가 -> 유효이자율 역산)
+        st.divider()
+        with st.expander("🧮 사채 시뮬레이터 설정 일괄 검산 (bond_basic)", expanded=False):
+            st.caption("발행가(params.price / issue_price)가 적힌 문제만 그 값에서 유효이자율을 역산해 mrate 와 비교합니다.")
+            if st.button("검산 실행", key="btn_bond_verify"):
+                with perf.span("admin.bond_verify"):
+                    verify_df = Simulators.bond_verify_configs(db_questions or [])
+                if verify_df.empty:
+                    st.info("bond_basic 시뮬레이터가 붙은 문제가 없습니다.")
+                else:
+                    counts = verify_df["상태"].value_counts()
+                    m1, m2, m3, m4 = st.columns(4)
+                    m1.metric("정상", int(counts.get("정상", 0)))
+                    m2.metric("불일치", int(counts.get("불일치", 0)))
+                    m3.metric("오류", int(counts.get("오류", 0)))
+                    m4.metric("발행가 없음 (검산 안 함)", int(counts.get("발행가 없음", 0)))
+                    order = verify_df["상태"].map({"오류": 0, "불일치": 1, "정상": 2, "발행가 없음": 3})  # 문제 있는 설정부터
+                    verify_df = verify_df.assign(_order=order).sort_values(["_order", "오차"], ascending=[True, False]).drop(columns="_order")
+                    st.dataframe(verify_df, use_container_width=True, hide_index=True,
+                                 column_config={"역산이자율": st.column_config.NumberColumn(format="%.6f"), "오차": st.column_config.NumberColumn(format="%.6f")})
+
+        # 5. 유사(중복) 문제 보고서
+        with st.expander("🧬 유사 문제(중복) 보고서", expanded=False):
+            st.caption("지문과 보기를 문자 단위로 비교해 거의 같은 문제를 묶습니다. 묶음마다 question_id 가 가장 앞선 문제를 원본으로 봅니다.")
+            dup_threshold = st.slider("유사도 기준", 0.7, 1.0, dedupe.DUP_THRESHOLD, step=0.05, key="dup_threshold")
+            if st.button("보고서 만들기", key="btn_dup_report"):
+                with perf.span("admin.dedupe_report"):
+                    groups = dedupe.duplicate_groups(db_questions or [], dup_threshold, index=get_dedupe_index())
+                if not groups:
+                    st.success("유사 문제가 없습니다.")
+                else:
+                    q_by_id = {q.get('question_id'): q for q in db_questions}
+                    m1, m2 = st.columns(2)
+                    m1.metric("중복 묶음", len(groups))
+                    m2.metric("중복 후보 문항", sum(len(g['duplicates']) for g in groups))
+                    st.dataframe(pd.DataFrame([
+                        {"원본": g['keep'], "중복 후보": qid, "유사도": sim, "주제": (q_by_id.get(qid) or {}).get('topic')}
+                        for g in groups for qid, sim in g['duplicates']
+                    ]), use_container_width=True, hide_index=True)
+
+        # 6. 관련 문제(비슷한 기출) 색인 전체 생성
+        with st.expander("🔗 관련 문제 색인 다시 만들기", expanded=False):
+            st.caption("Tab 3 '비슷한 기출' 이웃 목록과 벡터를 문제은행 전체로 다시 계산해 저장합니다 (python related.py build 와 같음). "
+                       "문제를 저장/삭제할 때는 저장된 색인에서 바뀐 문제만 갱신하므로, 처음 한 번이나 IDF 를 새로 맞출 때만 쓰세요.")
+            if st.button("색인 다시 만들기", key="btn_related_rebuild"):
+                with perf.span("admin.related_rebuild"):
+                    index = related.rebuild(store, db_questions or [])
+                get_related_index.clear()
+                load_related.clear()
+                st.success(f"{len(index)}개 문제의 관련 문제 색인을 저장했습니다.")
+
+    # 3. 스냅샷 (전체 백업)
+    with tab_snap:
+        st.header("💾 데이터베이스 스냅샷")
+        st.caption("questions / courses / user_notes 컬렉션을 페이지 단위로 읽어 gzip JSONL + manifest로 저장합니다.")
+
+        st.caption(f"현재 저장소: `{store.backend}`" + (f" (스냅샷 `{SNAPSHOT_PATH}` 에서 부팅)" if SNAPSHOT_PATH else ""))
+        c_dir, c_page = st.columns([3, 1])
+        with c_dir:
+            default_dir = st.session_state.setdefault("snapshot_default_dir", os.path.join("snapshots", time.strftime("%Y%m%d_%H%M%S")))
+            snap_dir = st.text_input("저장 폴더", value=default_dir)
+        with c_page:
+            page_size = st.number_input("페이지 크기", min_value=50, max_value=5000, value=snapshot.DEFAULT_PAGE_SIZE, step=50)
+
+        if st.button("📦 스냅샷 내보내기", key="btn_snapshot_export"):
+            progress_text = st.empty()
+            try:
+                manifest = snapshot.export_snapshot(
+                    store, snap_dir, page_size=int(page_size),
+                    on_page=lambda name, n: progress_text.caption(f"⏳ {name}: {n:,}건 읽는 중..."),
+                )
+                progress_text.empty()
+                st.success(f"스냅샷 저장 완료: `{snap_dir}`")
+                st.json(manifest)
+                st.download_button(
+                    "⬇️ 스냅샷 다운로드 (zip)",
+                    data=snapshot.snapshot_to_zip_bytes(snap_dir),
+                    file_name=f"{os.path.basename(os.path.normpath(snap_dir))}.zip",
+                    mime="application/zip",
+                )
+            except Exception as e:
+                st.error(f"스냅샷 실패: {e}")
+
+    # 4. 성능 계측 (이 프로세스의 rerun 단계별 소요시간)
+    with tab_perf:
+        st.header("⏱️ Performance")
+        st.caption("이 서버 프로세스에서 측정한 단계별 소요시간입니다 (이름별 최근 2,000회 기준 백분위수). "
+                   "st.rerun() / st.stop() 으로 중간에 끝난 rerun 은 rerun.total 에 포함되지 않습니다.")
+        perf_rows = perf.summary()
+        if perf_rows:
+            perf_df = pd.DataFrame(perf_rows).set_index("name")
+            st.dataframe(perf_df.round(2), use_container_width=True)
+            st.bar_chart(perf_df[["p50_ms", "p95_ms"]])
+        else:
+            st.info("아직 측정된 데이터가 없습니다.")
+
+        c_p1, c_p2, c_p3 = st.columns(3)
+        with c_p1:
+            st.download_button("⬇️ JSON", data=perf.export_json(), file_name="perf_summary.json", mime="application/json")
+        with c_p2:
+            st.download_button("⬇️ Prometheus", data=perf.prometheus_text() + store.prometheus_text(), file_name="perf_metrics.prom", mime="text/plain")
+        with c_p3:
+            if st.button("🔄 측정값 초기화", key="btn_perf_reset"):
+                perf.reset()
+                st.rerun()
+
+        st.divider()
+        st.markdown("#### 📦 저장소 사용량 (문서 읽기 / 쓰기 / 삭제)")
+        st.caption(f"백엔드: `{store.backend}` · 기능 = 호출 당시의 span 이름 · 바이트는 JSON 크기 기준 추정치. "
+                   "캐시(load_questions 등)에 걸린 rerun 은 읽기가 발생하지 않습니다.")
+        usage_by = st.radio("묶음 기준", ["기능별", "세션×기능"], horizontal=True, key="usage_group")
+        usage_rows = store.usage(by=("feature",) if usage_by == "기능별" else ("session", "feature"))
+        if usage_rows:
+            usage_df = pd.DataFrame(usage_rows)
+            st.dataframe(usage_df, use_container_width=True, hide_index=True)
+            st.caption(f"합계: 읽기 {usage_df['reads'].sum():,} · 쓰기 {usage_df['writes'].sum():,} · 삭제 {usage_df['deletes'].sum():,} 문서")
+        else:
+            st.info("아직 저장소 호출이 없습니다.")
+        if st.button("🔄 사용량 초기화", key="btn_usage_reset"):
+            store.reset_usage()
+            st.rerun()
+
+        perf_path = st.text_input("로컬 파일로 내보내기 (.json 또는 .prom)", value="perf_metrics.prom", key="perf_export_path")
+        if st.button("💾 파일 저장", key="btn_perf_save"):
+            try:
+                if perf_path.endswith(".json"): perf.export_json(perf_path)
+                else:
+                    with open(perf_path, "w", encoding="utf-8") as f: f.write(perf.prometheus_text() + store.prometheus_text())
+                st.success(f"저장 완료: `{perf_path}`")
+            except OSError as e:
+                st.error(f"저장 실패: {e}")
+
+perf.record("rerun.total", (time.perf_counter() - _rerun_t0) * 1000)
\ No newline at end of file
@@ -0,0 +1,9 @@
+"""
+Accoun-T 벤치마크 모음 (Streamlit / Firestore 없이 실행)
+
+    python -m benchmarks                 # 전체 실행 + 기준선(baseline) 비교
+    python -m benchmarks --save-baseline # 현재 결과를 기준선으로 저장
+    python -m benchmarks -k filter       # 이름에 'filter' 가 들어간 것만
+    python -m benchmarks.checks          # 계산 엔진 정답 확인만
+"""
+from benchmarks.harness import benchmark, REGISTRY
\ No newline at end of file
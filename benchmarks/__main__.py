@@ -0,0 +1,86 @@
+"""
+벤치마크 실행기
+
+    python -m benchmarks [-k 이름일부] [--repeat N] [--no-memory] [--skip-checks]
+                         [--baseline PATH] [--save-baseline] [--output PATH]
+
+측정 전에 benchmarks.checks 의 정답 확인을 먼저 돌리고, 실패하면 측정하지 않는다.
+
+기준선(baseline) 파일이 있으면 config.json 의 임계값으로 비교해서 회귀가 있으면 exit code 1.
+기준선은 측정한 머신에 종속적이므로 저장소에 커밋하지 않는다 (.benchmarks/ 는 gitignore).
+"""
+import argparse
+import os
+import platform
+import sys
+
+# 저장소 루트의 모듈(simulators, data_logic ...)을 import 할 수 있도록
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks import REGISTRY, checks, harness
+from benchmarks import bench_data, bench_dedupe, bench_notes, bench_related, bench_search, bench_simulators  # noqa: F401  (등록용 import)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(ROOT, ".benchmarks", "baseline.json")
+
+
+def main(argv=None):
+    config = harness.load_json(os.path.join(HERE, "config.json"), {})
+    parser = argparse.ArgumentParser(description="Accoun-T 벤치마크")
+    parser.add_argument("-k", dest="keyword", default=None, help="이름에 이 문자열이 포함된 케이스만 실행")
+    parser.add_argument("--repeat", type=int, default=config.get("repeat", 5))
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 측정 생략")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--output", default=None, help="이번 결과를 JSON으로 저장")
+    parser.add_argument("--list", action="store_true", help="등록된 케이스 목록만 출력")
+    parser.add_argument("--skip-checks", action="store_true", help="측정 전 정답 확인(benchmarks.checks) 생략")
+    args = parser.parse_args(argv)
+
+    cases = [c for c in REGISTRY if not args.keyword or args.keyword in c["name"]]
+    if args.list:
+        for c in cases: print(c["name"])
+        return 0
+
+    # 틀린 결과를 빠르게 내는 코드를 재지 않도록 계산 엔진 정답부터 확인
+    failures = [] if args.skip_checks else checks.run()
+    if failures:
+        print("❌ 정답 확인 실패 (측정 생략):")
+        for name, msg in failures:
+            print(f"  {name}: {msg}")
+        return 1
+
+    print(f"{'case':<44}{'median ms':>12}{'min ms':>12}{'peak KB':>12}")
+    def show(name, r):
+        peak = f"{r['peak_kb']:,.0f}" if r["peak_kb"] is not None else "-"
+        print(f"{name:<44}{r['median_ms']:>12.3f}{r['min_ms']:>12.3f}{peak:>12}", flush=True)
+    results = harness.run_cases(cases, args.repeat, not args.no_memory, on_result=show)
+
+    meta = {"python": platform.python_version(), "machine": platform.machine(), "node": platform.node()}
+    if args.output:
+        harness.save_json(args.output, {"meta": meta, "results": results})
+    if args.save_baseline:
+        baseline = harness.load_json(args.baseline, {}) or {}
+        baseline.update(results)
+        harness.save_json(args.baseline, baseline)
+        print(f"\n기준선 저장: {args.baseline}")
+        return 0
+
+    baseline = harness.load_json(args.baseline)
+    if baseline is None:
+        print(f"\n기준선 없음 ({args.baseline}) - 비교 생략. --save-baseline 으로 먼저 저장하세요.")
+        return 0
+    regressions = harness.compare(results, baseline, config)
+    if regressions:
+        print("\n❌ 성능 회귀:")
+        for name, metric, base, cur, ratio in regressions:
+            print(f"  {name} {metric}: {base:,.3f} -> {cur:,.3f} (x{ratio:.2f})")
+        return 1
+    print("\n✅ 기준선 대비 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,41 @@
+"""데이터 경로 벤치마크: 문제 필터링, 시험지 구성, 단권화 노트 파싱"""
+from benchmarks import benchmark, synthetic
+from data_logic import ChapterQuestionIndex, advanced_filter_questions, get_exam_questions, parse_markdown_to_blocks
+
+BANK_SIZES = [1_000, 10_000, 100_000]
+
+
+@benchmark("filter_keywords", params=BANK_SIZES)
+def bench_filter_keywords(n):
+    qs = synthetic.question_bank(n)
+    filters = {"keywords": ["사채", "상환"], "years": (2012, 2024), "exams": [], "difficulty": (1, 5)}
+    return lambda: advanced_filter_questions(qs, filters)
+
+
+@benchmark("filter_sidebar_only", params=BANK_SIZES)
+def bench_filter_sidebar(n):
+    qs = synthetic.question_bank(n)
+    filters = {"keywords": [], "years": (2015, 2020), "exams": ["CPA"], "difficulty": (2, 4)}
+    return lambda: advanced_filter_questions(qs, filters)
+
+
+@benchmark("filter_chapter_cached", params=BANK_SIZES)
+def bench_filter_chapter_cached(n):
+    # filter_keywords 와 같은 결과를 챕터 캐시로: 키워드 매칭은 데이터 버전당 한 번 (측정 제외)
+    qs = synthetic.question_bank(n)
+    index = ChapterQuestionIndex()
+    index.question_ids(1, qs, "BENCH", 1, ["사채", "상환"])
+    filters = {"years": (2012, 2024), "exams": [], "difficulty": (1, 5)}
+    return lambda: index.chapter_questions(1, qs, "BENCH", 1, ["사채", "상환"], filters)
+
+
+@benchmark("exam_questions", params=BANK_SIZES)
+def bench_exam_questions(n):
+    qs = synthetic.question_bank(n)
+    return lambda: get_exam_questions(qs, "CPA", 2024)
+
+
+@benchmark("parse_markdown_to_blocks", params=[50, 500, 5_000])
+def bench_parse_markdown(sections):
+    text = synthetic.theory_markdown(sections)
+    return lambda: parse_markdown_to_blocks(text)
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""유사 문제 탐지 벤치마크: MinHash/LSH 색인 생성, 가져오기 묶음 검사, 전체 중복 보고서"""
+import copy
+
+import dedupe
+from benchmarks import benchmark, synthetic
+
+
+def near_duplicates(questions, n, seed=1):
+    """기존 문제의 지문 끝에 한 단어를 붙이고 question_id 만 바꾼 사본 n개 (가져오기 중복 흉내)"""
+    out = []
+    for i in range(n):
+        q = copy.deepcopy(questions[(i * 7919 + seed) % len(questions)])
+        q['question_id'] = f"{q['question_id']}_dup{i}"
+        q['content_markdown'] += " 단"
+        out.append(q)
+    return out
+
+
+@benchmark("dedupe_build", params=[10_000], repeat=3)
+def bench_dedupe_build(n):
+    qs = synthetic.question_bank(n)
+    return lambda: dedupe.DuplicateIndex.build(qs)
+
+
+@benchmark("dedupe_check_batch", params=[10_000, 100_000])
+def bench_dedupe_check(n):
+    # 100문항 가져오기 (절반은 기존 문제의 사본) -> 문항당 비용이 문제은행 크기와 무관해야 함
+    qs = synthetic.question_bank(n)
+    index = dedupe.DuplicateIndex.build(qs)
+    items = near_duplicates(qs, 50) + synthetic.question_bank(50, seed=99)
+    return lambda: dedupe.check_batch(index, items)
+
+
+@benchmark("dedupe_report", params=[10_000], repeat=3)
+def bench_dedupe_report(n):
+    qs = synthetic.question_bank(n) + near_duplicates(synthetic.question_bank(n), 100)
+    index = dedupe.DuplicateIndex.build(qs)
+    return lambda: dedupe.duplicate_groups(qs, index=index)
\ No newline at end of file
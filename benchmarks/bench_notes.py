@@ -0,0 +1,55 @@
+"""
+단권화 에디터(Tab 1) rerun 벤치마크
+
+streamlit.testing.v1.AppTest 로 app.py 를 서버 없이 실행한다. 저장소는 임시 SQLite 파일을
+환경변수(ACCOUNT_T_STORAGE / ACCOUNT_T_SQLITE_PATH)로 지정하므로 Firestore 가 필요 없다.
+측정 대상은 '챕터가 열린 상태에서 한 번 더 rerun' 하는 시간 (위젯 수에 비례).
+"""
+import contextlib
+import os
+import tempfile
+
+from benchmarks import benchmark, synthetic
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+@contextlib.contextmanager
+def _env(**values):
+    """values 로 환경변수를 잠시 바꾸고 원래 값으로 되돌린다 (같은 실행의 다른 벤치마크에 새지 않도록)"""
+    saved = {k: os.environ.get(k) for k in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for k, v in saved.items():
+            if v is None: os.environ.pop(k, None)
+            else: os.environ[k] = v
+
+
+def _note_app(sections):
+    """(AppTest, 저장소 환경변수). app.py 는 rerun 마다 환경변수로 저장소를 고르므로 run 할 때마다 _env 로 감싼다"""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+    from storage import SQLiteStorage
+
+    path = os.path.join(tempfile.mkdtemp(prefix="accountt_bench_"), "notes.sqlite3")
+    course = synthetic.theory_course(sections)
+    SQLiteStorage(path).set_document("courses", course["course_id"], course)
+    env = {"ACCOUNT_T_STORAGE": "sqlite", "ACCOUNT_T_SQLITE_PATH": path}
+    st.cache_data.clear()  # load_courses 캐시가 이전 케이스의 과목을 돌려주지 않도록
+    with _env(**env):
+        at = AppTest.from_file(APP_PATH, default_timeout=120).run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return at, env
+
+
+@benchmark("note_editor_rerun", params=[50, 500])
+def bench_note_editor_rerun(sections):
+    at, env = _note_app(sections)
+
+    def run():
+        with _env(**env):
+            at.run()
+    return run
\ No newline at end of file
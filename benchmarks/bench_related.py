@@ -0,0 +1,28 @@
+"""관련 문제 색인 벤치마크: 전체 이웃 계산, 저장된 색인 읽기, 관리자 저장 후 증분 갱신"""
+import related
+import storage
+from benchmarks import benchmark, synthetic
+
+
+@benchmark("related_build", params=[10_000], repeat=3)
+def bench_related_build(n):
+    qs = synthetic.question_bank(n)
+    return lambda: related.RelatedIndex.build(qs)
+
+
+@benchmark("related_load", params=[10_000])
+def bench_related_load(n):
+    # 관리자 첫 저장 때 전체 생성 대신 읽는 저장된 벡터 / df / 이웃 목록
+    store = storage.SQLiteStorage(":memory:")
+    related.rebuild(store, synthetic.question_bank(n))
+    return lambda: related.RelatedIndex.load(store)
+
+
+@benchmark("related_update", params=[10_000, 50_000])
+def bench_related_update(n):
+    # 관리자가 문제 5개 수정 + 1개 추가 -> 영향받는 이웃 목록만 다시 계산
+    qs = synthetic.question_bank(n)
+    index = related.RelatedIndex.build(qs)
+    new = synthetic.question_bank(1, seed=99)[0]   # lru_cache 된 목록이므로 복사해서 바꾼다
+    items = [dict(q, content_markdown=q['content_markdown'] + " 수정") for q in qs[:5]] + [dict(new, question_id="NEW_RELATED_1")]
+    return lambda: index.update(items)
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""문제 검색 엔진 벤치마크: 색인 생성, top-k 질의, 챕터 문제 관련도 정렬"""
+from benchmarks import benchmark, synthetic
+from search import SearchIndex
+
+BANK_SIZES = [10_000, 100_000]
+
+
+@benchmark("search_build", params=[10_000], repeat=3)
+def bench_search_build(n):
+    qs = synthetic.question_bank(n)
+    return lambda: SearchIndex.build(qs)
+
+
+@benchmark("search_topk", params=BANK_SIZES)
+def bench_search_topk(n):
+    index = SearchIndex.build(synthetic.question_bank(n))
+    return lambda: index.search("사채 상환 손익", k=50)
+
+
+@benchmark("search_rank_chapter", params=BANK_SIZES)
+def bench_search_rank(n):
+    # Tab 3: 챕터 키워드로 걸러진 문제(약 1/5)를 관련도 순으로
+    qs = synthetic.question_bank(n)
+    index = SearchIndex.build(qs)
+    ids = [q['question_id'] for q in qs[::5]]
+    return lambda: index.rank("사채 상환", ids)
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""Simulators.* 벤치마크 (큰 파라미터 격자)"""
+import numpy as np
+
+from benchmarks import benchmark, synthetic
+from simulators import Simulators, amortization_schedules, bond_prices, bond_yields
+
+
+@benchmark("simulator_bond_grid", params=[10, 100])
+def bench_bond_grid(n):
+    # 시장이자율 n개 × 기간 1~10년 -> 슬라이더를 끝까지 움직이는 것과 같은 호출 수
+    mrates = np.linspace(0.01, 0.15, n)
+    def run():
+        for m in mrates:
+            for p in range(1, 11):
+                Simulators.bond_basic(100000, 0.05, float(m), p)
+    return run
+
+
+@benchmark("simulator_bond_yields", params=[1_000, 100_000])
+def bench_bond_yields(n):
+    # 발행가 -> 유효이자율 역산 (문제은행 sim_config 일괄 검산 규모)
+    rng = np.random.default_rng(0)
+    face, crate, periods = 100000.0, rng.uniform(0, 0.12, n), rng.integers(1, 31, n)
+    price = bond_prices(face, crate, rng.uniform(0.0, 0.3, n), periods)
+    return lambda: bond_yields(price, face, crate, periods)
+
+
+@benchmark("simulator_annuity_schedules", params=[1_000, 100_000])
+def bench_annuity_schedules(n):
+    # 리스/할부 상각표 n건 (정상/선급 섞어서, 기간 1~30년) 을 누적 할인계수로 한 번에
+    rng = np.random.default_rng(0)
+    pmt, rate, periods = rng.uniform(1e4, 1e6, n), rng.uniform(0.0, 0.2, n), rng.integers(1, 31, n)
+    residual = np.where(rng.random(n) < 0.3, pmt, 0.0)
+    return lambda: (amortization_schedules(pmt, rate, periods, False, residual), amortization_schedules(pmt, rate, periods, True, residual))
+
+
+@benchmark("simulator_lease")
+def bench_lease():
+    return lambda: [Simulators.lease(100000, 0.08, n, due, 10000) for n in range(1, 31) for due in (False, True)]
+
+
+SWEEP_CASES = {
+    "bond": ({"face": 100000, "crate": 0.05, "periods": 10}, "mrate", np.arange(0.01, 0.1505, 0.001)),
+    "depreciation": ({"cost": 1000, "residual": 100, "life": 10}, "rate", np.arange(0.05, 0.905, 0.01)),
+    "entity_equity": ({"cost": 1000, "share": 0.3, "net_income": 500, "dividends": 100}, "share", np.arange(0, 1.005, 0.01)),
+}
+
+
+@benchmark("simulator_sweep", params=list(SWEEP_CASES))
+def bench_sweep(kind):
+    # 민감도 분석 한 번 = 슬라이더를 구간 끝까지 움직이는 100~150 번의 rerun 을 대신함
+    params, param, values = SWEEP_CASES[kind]
+    return lambda: Simulators.sweep(kind, params, param, values)
+
+
+@benchmark("simulator_depreciation", params=["SL", "DB", "SYD"])
+def bench_depreciation(method):
+    return lambda: [Simulators.depreciation(1_000_000, 100_000, life, method) for life in range(1, 51)]
+
+
+@benchmark("simulator_depreciation_compare", params=[10, 200])
+def bench_depreciation_compare(life):
+    units = list(range(1, life + 1))
+    return lambda: Simulators.depreciation_compare(1_000_000, 100_000, life, units=units)
+
+
+@benchmark("simulator_inventory", params=[1_000, 10_000])
+def bench_inventory(n):
+    tx = synthetic.inventory_stream(n)
+    return lambda: [Simulators.inventory(tx, m) for m in ("FIFO", "LIFO", "WAVG", "MAVG")]
+
+
+@benchmark("simulator_inventory_fifo")
+def bench_inventory_fifo():
+    return lambda: [Simulators.inventory_fifo(100, 100, 100, 120, s) for s in range(0, 201)]
+
+
+@benchmark("simulator_entity_equity_scenarios", params=[31, 1_000])
+def bench_equity_scenarios(n_scenarios):
+    rng = np.random.default_rng(0)
+    ni, dv = rng.uniform(-500, 2000, 30), rng.uniform(0, 300, 30)
+    shares = np.linspace(0.2, 0.5, n_scenarios)
+    return lambda: Simulators.entity_equity_scenarios(1_000_000, shares, ni, dv)
\ No newline at end of file
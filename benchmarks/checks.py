@@ -0,0 +1,233 @@
+"""
+계산 엔진 정답 확인 (known-answer / 왕복 검사, 관련 문제 해시 벡터 재현율)
+
+벤치마크는 시간만 재므로, 틀린 결과를 빠르게 내는 코드도 통과한다.
+여기 있는 검사는 교과서 예제 값과 역산 왕복으로 결과 자체를 확인하고,
+python -m benchmarks 는 측정 전에 이 검사를 먼저 돌려서 실패하면 측정하지 않는다.
+
+    python -m benchmarks.checks
+"""
+import math
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import numpy as np
+
+import related
+import storage
+from benchmarks import synthetic
+from simulators import Simulators, amortization_schedules, annuity_factors, annuity_payments, annuity_pv, bond_prices, bond_yields
+
+CHECKS = []
+
+
+def check(fn):
+    CHECKS.append(fn)
+    return fn
+
+
+def _close(actual, expected, tol, what):
+    actual, expected = np.asarray(actual, dtype=float), np.asarray(expected, dtype=float)
+    if actual.shape != expected.shape and expected.ndim:
+        raise AssertionError(f"{what}: 모양 {actual.shape} != {expected.shape}")
+    if not np.allclose(actual, expected, rtol=0, atol=tol):
+        raise AssertionError(f"{what}: {np.round(actual, 6)} != {np.round(expected, 6)} (허용 {tol})")
+
+
+# =========================================================
+# 1. 사채 (발행가 / 유효이자율)
+# =========================================================
+@check
+def bond_price_known_answer():
+    # 액면 100,000 / 표시 5% / 시장 8% / 3년: 5,000 × 2.577097 + 100,000 × 0.793832
+    _close(bond_prices(100000, 0.05, 0.08, 3), 92268.709, 0.01, "할인발행 발행가")
+    _close(bond_prices(100000, 0.10, 0.08, 3), 105154.194, 0.01, "할증발행 발행가")
+    _close(bond_prices(100000, 0.05, 0.05, [1, 3, 10]), [100000] * 3, 1e-6, "액면발행 발행가")
+    _close(bond_prices(100000, 0.05, 0.0, 3), 115000, 1e-6, "이자율 0 발행가")
+
+
+@check
+def bond_basic_matches_bond_prices():
+    price, df, _ = Simulators.bond_basic(100000, 0.05, 0.08, 3)
+    _close(price, int(bond_prices(100000, 0.05, 0.08, 3)), 0, "bond_basic 발행가")
+    _close(int(df["장부금액"].iloc[-1].replace(",", "")), 100000, 1, "만기 장부금액 = 액면")
+
+
+@check
+def bond_yield_round_trip():
+    # 발행가 -> 유효이자율 -> 발행가 (할인/할증/액면, 이자율 0, 긴 만기 포함)
+    crate, mrate, periods = np.meshgrid([0.0, 0.03, 0.05, 0.12], [0.0, 0.01, 0.08, 0.25, 1.5], [1, 3, 10, 30], indexing="ij")
+    crate, mrate, periods = crate.ravel(), mrate.ravel(), periods.ravel()
+    price = bond_prices(100000, crate, mrate, periods)
+    rate, converged = bond_yields(price, 100000, crate, periods)
+    if not converged.all():
+        raise AssertionError(f"수렴 실패 {int((~converged).sum())}건: mrate={mrate[~converged]}")
+    _close(rate, mrate, 1e-8, "역산 유효이자율")
+    _close(bond_prices(100000, crate, rate, periods), price, 1e-4, "역산 이자율로 다시 만든 발행가")
+
+
+@check
+def bond_yield_known_answer():
+    mrate, _, _ = Simulators.bond_yield(92269, 100000, 0.05, 3)
+    _close(mrate, 0.08, 1e-5, "발행가 92,269 의 유효이자율")
+
+
+@check
+def bond_yield_rejects_impossible_prices():
+    # 발행가 0, 현금흐름 합계보다 큰 발행가(이자율 < -99%), 잘못된 기간 -> NaN, converged=False
+    rate, converged = bond_yields([0, 1e13, 95000], 100000, 0.05, [3, 3, 0])
+    if converged.any() or not np.isnan(rate).all():
+        raise AssertionError(f"풀 수 없는 입력이 수렴으로 나옴: {rate}, {converged}")
+
+
+# =========================================================
+# 2. 연금 현재가치 / 상각표 (리스, 장기할부)
+# =========================================================
+@check
+def annuity_known_answer():
+    # 100,000 × 3회, 10%: 정상연금계수 2.486852, 선급연금계수 2.735537
+    _close(annuity_pv(100000, 0.10, 3), 248685.199, 0.01, "정상연금 현재가치")
+    _close(annuity_pv(100000, 0.10, 3, due=True), 273553.719, 0.01, "선급연금 현재가치")
+    _close(annuity_pv(100000, 0.08, 3, residual=10000), 265648.022, 0.01, "정상연금 + 보증잔존가치")
+    _close(annuity_factors(0.0, [1, 5]), [1, 5], 1e-12, "이자율 0 연금계수")
+    # 잔존가치 없이 만기 일시 지급만: 1 / 1.1^3
+    _close(annuity_pv(0, 0.10, 3, residual=1000), 751.315, 0.001, "만기 일시 지급")
+
+
+@check
+def annuity_payment_round_trip():
+    rate, periods = np.meshgrid([0.0, 1e-9, 0.03, 0.12, 0.5], [1, 4, 30], indexing="ij")
+    for due in (False, True):
+        pv = annuity_pv(12345.0, rate, periods, due, residual=5000)
+        _close(annuity_payments(pv, rate, periods, due, residual=5000), np.full(rate.shape, 12345.0), 1e-6, f"지급액 역산 (due={due})")
+
+
+@check
+def amortization_schedule_identities():
+    # 여러 건을 한 번에: 현재가치는 annuity_pv 와 같고, 마지막 장부금액 0, 원금 합 = 현재가치, 이자 합 = 총지급 - 현재가치
+    rng = np.random.default_rng(7)
+    pmt, rate, periods = rng.uniform(1e3, 1e6, 200), rng.uniform(0.0, 0.3, 200), rng.integers(1, 31, 200)
+    residual = np.where(rng.random(200) < 0.5, pmt * 0.5, 0.0)
+    for due in (False, True):
+        s = amortization_schedules(pmt, rate, periods, due, residual)
+        pv = annuity_pv(pmt, rate, periods, due, residual)
+        _close(s["현재가치"], pv, 1e-6, f"상각표 현재가치 (due={due})")
+        _close(s["장부금액"][np.arange(200), periods], np.zeros(200), 1e-6, f"만기 장부금액 (due={due})")
+        _close(s["원금상환"].sum(axis=1), pv, 1e-6, f"원금 상환 합계 (due={due})")
+        _close(s["이자"].sum(axis=1), s["현금흐름"].sum(axis=1) - pv, 1e-6, f"이자 합계 (due={due})")
+
+
+@check
+def lease_known_answer():
+    # 리스료 100,000 × 3회 기말, 8%, 보증잔존가치 10,000
+    liability, df, _ = Simulators.lease(100000, 0.08, 3, residual_guarantee=10000)
+    _close(liability, 265648, 0, "리스부채")
+    _close(df["이자비용"].iloc[1:].to_numpy(), [21251.842, 14951.989, 8148.148], 0.01, "연도별 이자비용")
+    _close(df["기말리스부채"].iloc[-1], 0, 1e-6, "만기 리스부채")
+    _close(df["기말사용권자산"].iloc[-1], 0, 1e-6, "만기 사용권자산")
+    # 선급: 첫 리스료는 계약일에 지급 -> 1차년도 이자 = (278,326 - 100,000) × 8%
+    liability, df, _ = Simulators.lease(100000, 0.08, 3, due=True)
+    _close(liability, 278326, 0, "선급 리스부채")
+    _close(df.loc[1, "이자비용"], 14266.118, 0.01, "선급 1차년도 이자비용")
+
+
+@check
+def installment_sale_known_answer():
+    # 계약금 500,000 + 1,000,000 × 3회 기말, 10%, 원가 2,000,000
+    revenue, df, insight = Simulators.installment_sale(1000000, 0.10, 3, down_payment=500000, cost=2000000)
+    _close(revenue, 2986851, 0, "할부판매 매출")
+    _close(df["이자수익"].iloc[1:].to_numpy(), [248685.199, 173553.719, 90909.091], 0.01, "연도별 이자수익")
+    _close(df["기말매출채권"].iloc[-1], 0, 1e-6, "만기 매출채권")
+    if "986,851" not in insight:
+        raise AssertionError("매출총이익 986,851 이 리포트에 없음")
+
+
+# =========================================================
+# 3. 관련 문제 (해시 벡터 이웃)
+# =========================================================
+@check
+def related_hashing_recall():
+    # 어휘가 넓은 한글 문제은행에서 DIM 차원 해시 벡터의 상위 k 이웃 vs 해시 없이 계산한 TF-IDF 상위 k 이웃
+    #   재현율: 정확한 이웃 중 찾은 비율 / 점수 비: 찾은 이웃의 정확한 유사도 합 ÷ 정확한 상위 k 의 유사도 합
+    #   (같은 데이터에서 DIM=256 은 0.66 / 0.93, 512 는 0.73 / 0.97, 1024 는 0.79 / 0.98)
+    qs, queries, k = synthetic.wide_question_bank(2000), 100, related.RELATED_K
+    index = related.RelatedIndex.build(qs, k=k)
+    weights = [{t: (1.0 + math.log(f)) * index._idf(t) for t, f in related._term_counts(q).items()} for q in qs]
+    norms = np.array([math.sqrt(sum(w * w for w in v.values())) for v in weights])
+    postings = {}
+    for d, v in enumerate(weights):
+        for t, w in v.items(): postings.setdefault(t, []).append((d, w))
+    postings = {t: (np.array([d for d, _ in p]), np.array([w for _, w in p])) for t, p in postings.items()}
+    hits, ratio = 0, 0.0
+    for d in range(queries):
+        exact = np.zeros(len(qs))
+        for t, w in weights[d].items():
+            docs, ws = postings[t]
+            exact[docs] += w * ws
+        exact /= norms * norms[d]
+        exact[d] = -1
+        want = np.argsort(-exact, kind="stable")[:k]
+        got = [index.row_of[qid] for qid, _ in index.neighbors[qs[d]['question_id']]]
+        hits += len(set(want) & set(got))
+        ratio += exact[got].sum() / exact[want].sum()
+    recall, ratio = hits / (queries * k), ratio / queries
+    if recall < 0.75 or ratio < 0.975:
+        raise AssertionError(f"DIM={related.DIM} 재현율 {recall:.3f} (기준 0.75), 점수 비 {ratio:.3f} (기준 0.975)")
+
+
+@check
+def related_store_round_trip():
+    # 전체 저장 -> load 로 복원한 색인이 같은 벡터/이웃을 갖고, 같은 증분 갱신 결과를 낸다
+    store = storage.SQLiteStorage(":memory:")
+    qs = synthetic.question_bank(300)
+    built = related.rebuild(store, qs)
+    loaded = related.RelatedIndex.load(store)
+    if loaded is None or set(loaded.row_of) != set(built.row_of):
+        raise AssertionError("저장한 색인을 다시 읽지 못함")
+    rows = [loaded.row_of[qid] for qid in built.question_ids]  # shard 순서로 읽으므로 행 순서는 다르다
+    _close(loaded.vectors[rows], built.vectors, 0, "복원한 벡터")
+    if loaded.neighbors != built.neighbors or loaded.df != built.df or loaded.n_docs != built.n_docs:
+        raise AssertionError("복원한 이웃 목록 / df 가 다름")
+    items = [dict(qs[0], content_markdown=qs[0]['content_markdown'] + " 수정"), dict(qs[1], question_id="NEW_RELATED_1")]
+    changed = loaded.update(items, [qs[2]['question_id']])
+    if changed != built.update(items, [qs[2]['question_id']]) or loaded.neighbors != built.neighbors:
+        raise AssertionError("복원한 색인의 증분 갱신 결과가 다름")
+    related.save_neighbors(store, loaded.neighbors, changed)
+    related.save_vectors(store, loaded, [q['question_id'] for q in items] + [qs[2]['question_id']])
+    again = related.RelatedIndex.load(store)
+    if set(again.row_of) != set(loaded.row_of) or again.neighbors != loaded.neighbors:
+        raise AssertionError("증분 저장 후 다시 읽은 색인이 다름")
+
+
+# =========================================================
+# 실행
+# =========================================================
+def run(keyword=None):
+    """검사 실행 -> [(이름, 오류 메시지), ...] (실패한 것만)"""
+    failures = []
+    for fn in CHECKS:
+        if keyword and keyword not in fn.__name__: continue
+        try:
+            fn()
+        except AssertionError as err:
+            failures.append((fn.__name__, str(err)))
+    return failures
+
+
+def main(argv=None):
+    keyword = (argv if argv is not None else sys.argv[1:]) or [None]
+    failures = run(keyword[0])
+    for name, msg in failures:
+        print(f"❌ {name}: {msg}")
+    if failures:
+        return 1
+    print(f"✅ 정답 확인 {len([f for f in CHECKS if not keyword[0] or keyword[0] in f.__name__])}개 통과")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+벤치마크 등록/측정/기준선 비교
+
+벤치마크 함수는 준비(setup)를 끝낸 뒤 '측정할 호출'을 함수로 돌려준다:
+
+    @benchmark("filter_keywords", params=[1_000, 10_000])
+    def bench_filter(n):
+        qs = synthetic.question_bank(n)
+        return lambda: advanced_filter_questions(qs, {...})
+"""
+import gc
+import json
+import os
+import statistics
+import time
+import tracemalloc
+
+REGISTRY = []
+
+
+def benchmark(name, params=(None,), repeat=None):
+    """벤치마크 등록 데코레이터. params 마다 '<name>[<param>]' 케이스가 하나씩 생긴다"""
+    def deco(setup):
+        for p in params:
+            case = name if p is None else f"{name}[{p}]"
+            REGISTRY.append({"name": case, "setup": setup, "param": p, "repeat": repeat})
+        return setup
+    return deco
+
+
+def measure(fn, repeat=5, trace_memory=True):
+    """워밍업 1회 + repeat회 시간 측정, 별도 1회는 tracemalloc 으로 최대 메모리 측정"""
+    fn()
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - t0) * 1000)
+    peak_kb = None
+    if trace_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+        finally:
+            tracemalloc.stop()
+    return {
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+        "max_ms": max(timings),
+        "peak_kb": peak_kb,
+        "repeat": repeat,
+    }
+
+
+def run_cases(cases, repeat=5, trace_memory=True, on_result=None):
+    results = {}
+    for case in cases:
+        args = () if case["param"] is None else (case["param"],)
+        fn = case["setup"](*args)
+        results[case["name"]] = measure(fn, case["repeat"] or repeat, trace_memory)
+        if on_result: on_result(case["name"], results[case["name"]])
+        del fn
+    return results
+
+
+def load_json(path, default=None):
+    if not os.path.exists(path):
+        return default
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_json(path, data):
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def compare(results, baseline, config):
+    """
+    기준선 대비 회귀 목록을 리턴: [(케이스, 항목, 기준값, 현재값, 비율), ...]
+    config: {"time_threshold": 0.25, "memory_threshold": 0.25, "min_time_ms": 0.2,
+             "overrides": {"케이스 이름 접두어": {"time_threshold": 0.5}}}
+    """
+    regressions = []
+    for name, cur in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        conf = dict(config)
+        for prefix, override in config.get("overrides", {}).items():
+            if name.startswith(prefix): conf.update(override)
+
+        # 아주 짧은 측정은 잡음이 커서 비교하지 않음
+        if max(base["median_ms"], cur["median_ms"]) >= conf.get("min_time_ms", 0.2):
+            ratio = cur["median_ms"] / max(base["median_ms"], 1e-9)
+            if ratio > 1 + conf.get("time_threshold", 0.25):
+                regressions.append((name, "median_ms", base["median_ms"], cur["median_ms"], ratio))
+        if base.get("peak_kb") and cur.get("peak_kb") and base["peak_kb"] >= conf.get("min_memory_kb", 64):
+            ratio = cur["peak_kb"] / base["peak_kb"]
+            if ratio > 1 + conf.get("memory_threshold", 0.25):
+                regressions.append((name, "peak_kb", base["peak_kb"], cur["peak_kb"], ratio))
+    return regressions
\ No newline at end of file
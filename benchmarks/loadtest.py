@@ -0,0 +1,176 @@
+"""
+동시 접속 부하 테스트 (서버 / Firestore 없이)
+
+streamlit.testing.v1.AppTest 세션 N개를 동시에 돌려서 학생 N명이 같은 머신을 쓰는 상황을 흉내낸다.
+AppTest 는 실행할 때마다 프로세스 전역 Runtime 을 바꿔치기하므로 한 프로세스에서 여러 세션을
+동시에 돌릴 수 없다. 그래서 세션 하나 = 프로세스 하나로 띄우고 시작 시점만 맞춘다
+(세션 사이에 st.cache_data / cache_resource 는 공유되지 않음 — 실제 서버보다 메모리는 많이,
+CPU 경합은 비슷하게 잡힌다). 저장소는 합성 데이터로 만든 스냅샷을 세션마다 메모리 SQLite 에
+올려서 쓴다 (ACCOUNT_T_STORAGE=sqlite, ACCOUNT_T_SNAPSHOT).
+
+학생 한 명은 steps 번 동안 무작위로
+  - 챕터 바꾸기 / 시뮬레이터 탭에서 슬라이더·입력값 움직이기 / 모의고사 다음 문제
+를 하고, 매 동작의 rerun 시간을 잰다. 세션 수별로 p50/p95 rerun 지연, CPU 사용률, RSS 를 보고한다.
+
+    python -m benchmarks.loadtest --sessions 1 2 4 8 --steps 20 --questions 5000
+"""
+import argparse
+import os
+import random
+import sys
+import multiprocessing
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks import harness, synthetic
+
+APP_PATH = os.path.join(ROOT, "app.py")
+ACTIONS = ("chapter", "simulator", "exam")
+
+
+def rss_mb():
+    """현재 RSS (리눅스 /proc, 없으면 최대 RSS 로 대신)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def build_snapshot(n_questions, chapters, out_dir=None):
+    """합성 문제은행 + 시뮬레이터 과목을 스냅샷 폴더로 (앱이 메모리 SQLite 로 부팅할 데이터)"""
+    import catalog
+    import snapshot
+    from storage import SQLiteStorage
+
+    out_dir = out_dir or tempfile.mkdtemp(prefix="accountt_load_")
+    seed = SQLiteStorage()
+    seed.save_batch("questions", synthetic.question_bank(n_questions), "question_id")
+    catalog.save_courses(seed, [synthetic.simulator_course(chapters)])
+    snapshot.export_snapshot(seed, out_dir)
+    return out_dir
+
+
+# =========================================================
+# 1. 학생 한 명의 시나리오
+# =========================================================
+def _timed_run(at, latencies):
+    t0 = time.perf_counter()
+    at.run()
+    latencies.append((time.perf_counter() - t0) * 1000)
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+
+def _do(at, action, rng, latencies):
+    if action == "chapter":
+        box = next(s for s in at.selectbox if s.label == "챕터 선택")
+        box.select_index(rng.randrange(len(box.options)))
+        _timed_run(at, latencies)
+    elif action == "simulator":
+        if at.session_state["student_view"] != "🧮 시뮬레이터 학습":
+            at.session_state["student_view"] = "🧮 시뮬레이터 학습"
+            _timed_run(at, latencies)
+        sliders = [s for s in at.main.slider if not isinstance(s.value, tuple)]
+        if sliders:
+            s = rng.choice(sliders)
+            s.set_value(rng.randint(s.min, s.max))
+        else:
+            n = rng.choice(at.main.number_input)
+            n.set_value((n.value or 0) + 1)
+        _timed_run(at, latencies)
+    elif action == "exam":
+        if at.session_state["student_view"] != "🔥 실전 모의고사":
+            at.session_state["student_view"] = "🔥 실전 모의고사"
+            _timed_run(at, latencies)
+        nxt = [b for b in at.button if b.label.startswith("다음 문제")]
+        if nxt and not nxt[0].disabled:
+            nxt[0].click()
+            _timed_run(at, latencies)
+
+
+def student_session(steps, seed, start, timeout=120):
+    """
+    AppTest 세션 하나 (자식 프로세스에서 실행). 첫 로드로 캐시를 채운 뒤 start 에서 다른 세션들을
+    기다렸다가 steps 번 무작위 동작. 지연(ms)과 CPU/RSS 를 dict 로 리턴
+    """
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    first = []
+    _timed_run(at, first)
+    if start is not None: start.wait()
+    latencies = []
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    for _ in range(steps):
+        _do(at, rng.choice(ACTIONS), rng, latencies)
+    return {"first_ms": first[0], "latencies": latencies, "cpu_s": time.process_time() - cpu0,
+            "wall_s": time.perf_counter() - wall0, "rss_mb": rss_mb()}
+
+
+# =========================================================
+# 2. 세션 수별 실행
+# =========================================================
+def run_load(sessions, steps, seed=0):
+    """학생 sessions 명을 동시에 돌리고 지연/CPU/RSS 요약을 리턴"""
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Manager() as manager, ctx.Pool(sessions) as pool:
+        start = manager.Barrier(sessions)
+        results = pool.starmap(student_session, [(steps, seed * 1000 + i, start) for i in range(sessions)])
+
+    reruns = np.array([ms for r in results for ms in r["latencies"]])
+    wall = max(r["wall_s"] for r in results)
+    rss = sum(r["rss_mb"] for r in results)
+    p50, p95 = np.percentile(reruns, [50, 95]) if len(reruns) else (0.0, 0.0)
+    return {
+        "sessions": sessions,
+        "reruns": int(len(reruns)),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "max_ms": float(reruns.max()) if len(reruns) else 0.0,
+        "first_load_p50_ms": float(np.median([r["first_ms"] for r in results])),
+        "reruns_per_s": len(reruns) / wall if wall else 0.0,
+        "cpu_pct": 100.0 * sum(r["cpu_s"] for r in results) / wall if wall else 0.0,  # 코어 1개 = 100
+        "rss_mb": rss,
+        "rss_per_session_mb": rss / sessions,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Accoun-T 동시 접속 부하 테스트 (AppTest)")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8], help="동시 세션 수 목록")
+    parser.add_argument("--steps", type=int, default=20, help="세션당 동작 수")
+    parser.add_argument("--questions", type=int, default=5000, help="합성 문제은행 크기")
+    parser.add_argument("--chapters", type=int, default=8)
+    parser.add_argument("--snapshot", default=None, help="합성 데이터 대신 쓸 스냅샷 폴더")
+    parser.add_argument("--output", default=None, help="결과를 JSON으로 저장")
+    args = parser.parse_args(argv)
+
+    snap = args.snapshot or build_snapshot(args.questions, args.chapters)
+    os.environ["ACCOUNT_T_STORAGE"] = "sqlite"
+    os.environ.pop("ACCOUNT_T_SQLITE_PATH", None)  # 메모리 SQLite
+    os.environ["ACCOUNT_T_SNAPSHOT"] = snap  # spawn 된 세션 프로세스가 물려받음
+
+    print(f"{'sessions':>8}{'reruns':>8}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'rerun/s':>9}{'CPU %':>8}{'RSS MB':>9}{'MB/sess':>9}")
+    rows = []
+    for n in args.sessions:
+        r = run_load(n, args.steps, seed=n)
+        rows.append(r)
+        print(f"{r['sessions']:>8}{r['reruns']:>8}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['max_ms']:>10.1f}"
+              f"{r['reruns_per_s']:>9.1f}{r['cpu_pct']:>8.0f}{r['rss_mb']:>9.0f}{r['rss_per_session_mb']:>9.1f}", flush=True)
+    if args.output:
+        harness.save_json(args.output, {"questions": args.questions, "steps": args.steps, "snapshot": snap, "results": rows})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
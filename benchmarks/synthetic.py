@@ -0,0 +1,131 @@
+"""
+벤치마크용 합성 데이터 (문제은행, 이론 마크다운, 거래 흐름)
+
+실제 questions 문서와 같은 필드 구조를 쓰고, 같은 seed 면 항상 같은 데이터가 나온다.
+"""
+import functools
+import itertools
+import random
+
+TOPICS = ["사채상환손익", "감가상각", "재고자산 원가흐름", "지분법", "리스부채", "충당부채",
+          "수익인식", "무형자산", "금융자산 손상", "현금흐름표", "법인세회계", "주당이익"]
+TAGS = ["사채", "상환", "유효이자율", "정액법", "정률법", "선입선출", "이동평균", "지분법",
+        "관계기업", "리스", "할인", "할증", "손상", "재평가", "충당부채", "수익"]
+WORDS = ["회사는", "20X1년", "초에", "액면금액", "표시이자율", "시장이자율", "취득원가", "잔존가치",
+         "내용연수", "매출원가", "기말재고", "장부금액", "당기순이익", "배당금", "지급하였다",
+         "계산하면", "얼마인가", "다음", "자료를", "이용하여", "단", "상환", "손익은"]
+EXAM_TYPES = ["CPA", "세무사", "감평", "관세사"]
+
+
+@functools.lru_cache(maxsize=8)
+def question_bank(n, seed=42):
+    """n개짜리 문제은행 (lru_cache: 같은 크기는 한 번만 생성)"""
+    rng = random.Random(seed)
+    questions = []
+    for i in range(n):
+        exam_type = rng.choice(EXAM_TYPES)
+        year = rng.randint(2010, 2025)
+        body = " ".join(rng.choices(WORDS, k=rng.randint(30, 80)))
+        questions.append({
+            "question_id": f"{year}_{exam_type}_{i:06d}",
+            "topic": rng.choice(TOPICS),
+            "engine_type": "General",
+            "exam_info": {"type": exam_type, "year": year},
+            "difficulty": rng.randint(1, 5),
+            "content_markdown": body,
+            "choices": {str(k): f"{rng.randint(1, 999) * 1000:,}원" for k in range(1, 6)},
+            "answer": rng.randint(1, 5),
+            "tags": rng.sample(TAGS, k=rng.randint(1, 4)),
+            "sim_config": None,
+        })
+    return questions
+
+
+@functools.lru_cache(maxsize=2)
+def wide_question_bank(n, topics=60, vocab=6000, seed=5):
+    """
+    어휘가 넓은 문제은행 (관련 문제 해시 벡터의 충돌/재현율 확인용).
+    question_bank 는 단어가 수십 개라 2-gram 이 몇백 개뿐이므로, 무작위 음절로 만든 단어 vocab 개를
+    Zipf 빈도로 섞고 주제마다 자주 쓰는 단어 80개를 더해 실제 문제은행처럼 2-gram 어휘가 만 개 이상 되게 한다.
+    """
+    rng = random.Random(seed)
+    syllables = [chr(0xAC00 + rng.randrange(11172)) for _ in range(1500)]
+    words = ["".join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(vocab)]
+    cum = list(itertools.accumulate(1.0 / (r + 1) for r in range(vocab)))
+    topic_words = [rng.sample(words, 80) for _ in range(topics)]
+    questions = []
+    for i in range(n):
+        t = rng.randrange(topics)
+        body = [rng.choice(topic_words[t]) if rng.random() < 0.35 else rng.choices(words, cum_weights=cum)[0]
+                for _ in range(rng.randint(60, 150))]
+        questions.append({
+            "question_id": f"WIDE_{i:06d}",
+            "topic": f"주제{t}",
+            "tags": rng.sample(topic_words[t], 2),
+            "content_markdown": " ".join(body),
+        })
+    return questions
+
+
+def theory_markdown(sections, seed=7):
+    """## 제목으로 나뉜 긴 이론 마크다운 (sections 개 블록)"""
+    rng = random.Random(seed)
+    parts = ["# 이론 정리"]
+    for i in range(sections):
+        parts.append(f"## {i + 1}. {rng.choice(TOPICS)}")
+        for _ in range(rng.randint(3, 8)):
+            parts.append("- " + " ".join(rng.choices(WORDS, k=rng.randint(8, 20))))
+    return "\n".join(parts)
+
+
+def inventory_stream(n, seed=3):
+    """보유수량을 넘지 않는 매입/판매 거래 흐름"""
+    rng = random.Random(seed)
+    tx, on_hand = [], 0
+    for _ in range(n):
+        if on_hand < 50 or rng.random() < 0.5:
+            qty = rng.randint(1, 100)
+            tx.append({"type": "buy", "qty": qty, "price": rng.randint(90, 130)})
+            on_hand += qty
+        else:
+            qty = rng.randint(1, on_hand)
+            tx.append({"type": "sell", "qty": qty})
+            on_hand -= qty
+    return tx
+
+
+def theory_course(sections, course_id="BENCH_NOTES"):
+    """이론 챕터 하나(## 블록 sections 개)짜리 courses 문서"""
+    return {
+        "course_id": course_id, "engine_type": "General", "title": "벤치마크 과목",
+        "chapters": [{
+            "chapter_id": 1, "title": f"{sections}개 섹션 챕터",
+            "theory_markdown": theory_markdown(sections),
+            "simulator_type": "default", "simulator_defaults": {}, "related_keywords": [],
+        }],
+    }
+
+
+SIM_CHAPTERS = [
+    ("bond", {"face": 100000, "crate": 0.05, "mrate": 0.08}),
+    ("depreciation_db", {"cost": 1000, "residual": 100, "life": 5}),
+    ("inventory", {}),
+    ("entity_equity", {"cost": 1000, "share": 0.3, "net_income": 500, "dividends": 100}),
+    ("lease", {"payment": 100000, "rate": 0.08, "periods": 3, "residual_guarantee": 10000}),
+    ("installment_sale", {"installment": 1000000, "rate": 0.1, "periods": 3, "down_payment": 500000, "cost": 2000000}),
+]
+
+
+def simulator_course(chapters=8, sections=20, course_id="LOAD_001", seed=11):
+    """시뮬레이터 종류를 돌려가며 쓰는 챕터 chapters 개짜리 courses 문서 (부하 테스트용)"""
+    rng = random.Random(seed)
+    return {
+        "course_id": course_id, "engine_type": "General", "title": "부하 테스트 과목",
+        "chapters": [{
+            "chapter_id": i + 1, "title": f"{rng.choice(TOPICS)} {i + 1}",
+            "theory_markdown": theory_markdown(sections, seed=seed + i),
+            "simulator_type": SIM_CHAPTERS[i % len(SIM_CHAPTERS)][0],
+            "simulator_defaults": SIM_CHAPTERS[i % len(SIM_CHAPTERS)][1],
+            "related_keywords": rng.sample(TAGS, k=2),
+        } for i in range(chapters)],
+    }
\ No newline at end of file
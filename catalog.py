@@ -0,0 +1,181 @@
+"""
+Accoun-T 과목 카탈로그 (Streamlit 없이 import 가능)
+
+사이드바에는 과목 헤더(course_id, engine_type, title)와 챕터 제목만 필요하고,
+학생은 한 번에 챕터 하나만 본다. 그래서 과목 문서는 두 가지 형태를 지원한다.
+
+  - embedded (기존) : courses/{course_id} 안에 chapters 배열 (theory_markdown 등 본문 포함)
+  - split (신규)    : courses/{course_id} 에는 헤더 + chapter_titles 만,
+                      본문은 courses/{course_id}/chapters/{chapter_id} 서브컬렉션에
+
+카탈로그는 헤더 필드만 골라 읽고(list_document_fields), 챕터 본문은 필요할 때 하나씩
+읽어 크기 제한이 있는 LRU 캐시(ChapterCache)에 둔다. embedded 과목도 그대로 읽히며,
+migrate_embedded_courses 로 split 형태로 옮길 수 있다.
+
+    python catalog.py migrate [--dry-run] [--credentials key.json]
+"""
+import argparse
+import json
+import threading
+import time
+from collections import OrderedDict
+
+HEADER_FIELDS = ["course_id", "engine_type", "title", "chapter_titles", "layout"]
+CHAPTER_TITLE_FIELDS = ("chapter_id", "title", "simulator_type")
+LAYOUT_SPLIT = "split"
+CHAPTER_CACHE_SIZE = 64
+CHAPTER_CACHE_TTL = 60  # 초. app.py 의 과목 목록 캐시(load_course_catalog, ttl=60)와 같은 주기
+
+
+def chapters_collection(course_id):
+    """챕터 본문 서브컬렉션 경로"""
+    return f"courses/{course_id}/chapters"
+
+
+def chapter_titles(chapters):
+    return [{k: ch.get(k) for k in CHAPTER_TITLE_FIELDS if k in ch} for ch in chapters or []]
+
+
+def split_course(course):
+    """embedded 과목 문서 -> (헤더 문서, [챕터 문서, ...])"""
+    chapters = course.get('chapters') or []
+    header = {k: v for k, v in course.items() if k != 'chapters'}
+    header['chapter_titles'] = chapter_titles(chapters)
+    header['layout'] = LAYOUT_SPLIT
+    return header, [dict(ch, course_id=course.get('course_id')) for ch in chapters]
+
+
+# =========================================================
+# 1. 읽기
+# =========================================================
+def load_catalog(store):
+    """과목 헤더 목록 (chapter_titles 포함). 아직 embedded 인 과목만 전체 문서를 읽어 제목을 만든다"""
+    catalog = []
+    for header in store.list_document_fields("courses", HEADER_FIELDS):
+        if header.get('layout') != LAYOUT_SPLIT:
+            full = store.get_document("courses", header.get('course_id')) or {}
+            header = dict(header, chapter_titles=chapter_titles(full.get('chapters')))
+        catalog.append(header)
+    return catalog
+
+
+def load_chapter(store, course_id, chapter_id):
+    """챕터 본문 하나 (split: 서브컬렉션 문서, embedded: 과목 문서에서 찾기)"""
+    chapter = store.get_document(chapters_collection(course_id), chapter_id)
+    if chapter is not None:
+        return chapter
+    course = store.get_document("courses", course_id) or {}
+    return next((ch for ch in course.get('chapters') or [] if str(ch.get('chapter_id')) == str(chapter_id)), None)
+
+
+def load_full_courses(store):
+    """관리자 화면용: 모든 과목을 embedded 형태(chapters 배열 포함)로"""
+    courses = []
+    for course in store.list_courses():
+        if course.get('layout') == LAYOUT_SPLIT:
+            chapters = store.list_documents(chapters_collection(course.get('course_id')))
+            order = {str(t.get('chapter_id')): i for i, t in enumerate(course.get('chapter_titles') or [])}
+            chapters.sort(key=lambda ch: order.get(str(ch.get('chapter_id')), len(order)))
+            course = {k: v for k, v in course.items() if k not in ('chapter_titles', 'layout')}
+            course['chapters'] = [{k: v for k, v in ch.items() if k != 'course_id'} for ch in chapters]
+        courses.append(course)
+    return courses
+
+
+class ChapterCache:
+    """
+    (course_id, chapter_id) -> 챕터 본문. 최근에 본 maxsize 개만 보관 (LRU).
+    이 프로세스의 저장은 invalidate 로 바로 반영하고, 다른 프로세스/CLI 의 저장은 ttl 초가 지나면 다시 읽어서 반영한다.
+    """
+
+    def __init__(self, maxsize=CHAPTER_CACHE_SIZE, ttl=CHAPTER_CACHE_TTL):
+        self.maxsize, self.ttl = maxsize, ttl
+        self._lock = threading.Lock()
+        self._items = OrderedDict()  # key -> (챕터, 읽은 시각)
+
+    def get(self, store, course_id, chapter_id):
+        key = (str(course_id), str(chapter_id))
+        with self._lock:
+            if key in self._items:
+                chapter, loaded_at = self._items[key]
+                if time.monotonic() - loaded_at < self.ttl:
+                    self._items.move_to_end(key)
+                    return chapter
+                del self._items[key]
+        loaded_at = time.monotonic()
+        chapter = load_chapter(store, course_id, chapter_id)
+        if chapter is not None:
+            with self._lock:
+                self._items[key] = (chapter, loaded_at)
+                self._items.move_to_end(key)
+                while len(self._items) > self.maxsize:
+                    self._items.popitem(last=False)
+        return chapter
+
+    def invalidate(self, course_id=None):
+        with self._lock:
+            if course_id is None:
+                self._items.clear()
+            else:
+                for key in [k for k in self._items if k[0] == str(course_id)]:
+                    del self._items[key]
+
+    def __len__(self):
+        return len(self._items)
+
+
+# =========================================================
+# 2. 쓰기 / 마이그레이션
+# =========================================================
+def save_courses(store, courses):
+    """embedded 형태로 받은 과목들을 split 형태로 저장 (빠진 챕터 문서는 삭제). 저장한 과목 수 리턴"""
+    count = 0
+    for course in courses:
+        if 'course_id' not in course: continue
+        header, chapters = split_course(course)
+        sub = chapters_collection(course['course_id'])
+        keep = {str(ch.get('chapter_id')) for ch in chapters}
+        for old in store.list_document_fields(sub, ["chapter_id"]):
+            if str(old.get('chapter_id')) not in keep:
+                store.delete_document(sub, old.get('chapter_id'))
+        store.save_batch(sub, chapters, "chapter_id")
+        store.set_document("courses", course['course_id'], header)
+        count += 1
+    return count
+
+
+def delete_course(store, course_id):
+    sub = chapters_collection(course_id)
+    for old in store.list_document_fields(sub, ["chapter_id"]):
+        store.delete_document(sub, old.get('chapter_id'))
+    store.delete_document("courses", course_id)
+
+
+def migrate_embedded_courses(store, dry_run=False):
+    """embedded 과목을 split 형태로 옮긴다. [(course_id, 챕터 수), ...] 리턴"""
+    migrated = []
+    for course in store.list_courses():
+        if course.get('layout') == LAYOUT_SPLIT: continue
+        migrated.append((course.get('course_id'), len(course.get('chapters') or [])))
+        if not dry_run:
+            save_courses(store, [course])
+    return migrated
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Accoun-T 과목 카탈로그 도구")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_mig = sub.add_parser("migrate", help="embedded 과목 -> chapters 서브컬렉션")
+    p_mig.add_argument("--dry-run", action="store_true")
+    p_mig.add_argument("--credentials", default=None, help="서비스계정 JSON 경로 (없으면 .streamlit/secrets.toml)")
+    args = parser.parse_args(argv)
+
+    import snapshot
+    store = snapshot._firestore_storage(args.credentials)
+    if args.command == "migrate":
+        result = migrate_embedded_courses(store, dry_run=args.dry_run)
+        print(json.dumps({"dry_run": args.dry_run, "courses": result}, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
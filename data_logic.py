@@ -0,0 +1,189 @@
+"""
+Accoun-T 데이터 로직 (Streamlit / DB 없이 import 가능한 순수 함수)
+
+문제 필터링(챕터별 키워드 매칭 캐시 포함), 시험지 구성, 단권화 노트 블록 파싱 등 app.py 의 데이터 처리 중
+저장소에 의존하지 않는 부분. 벤치마크와 오프라인 도구에서도 그대로 사용한다.
+"""
+import hashlib
+import json
+import threading
+import uuid  # 블록 ID 생성
+
+NOTE_PAGE_SIZE = 20  # 단권화 에디터 한 화면에 그리는 블록 수
+
+
+def matches_keywords(q, keywords):
+    """주제 + 본문 + 태그 중 하나라도 키워드를 포함하면 True (비싼 부분: 본문 문자열 검색)"""
+    search_text = (q.get('topic', '') + q.get('content_markdown', '')).lower()
+    tags = q.get('tags', [])
+    if isinstance(tags, list): search_text += " ".join(tags).lower()
+    return any(k.lower() in search_text for k in keywords)
+
+
+def passes_filters(q, filters):
+    """사이드바의 연도 / 시험 유형 / 난이도 조건 (싼 부분)"""
+    try: q_year = int(q.get('exam_info', {}).get('year', 0))
+    except: q_year = 0
+    if filters.get('years'):
+        min_y, max_y = filters['years']
+        if q_year != 0 and not (min_y <= q_year <= max_y): return False
+    q_exam = q.get('exam_info', {}).get('type', '기타')
+    if filters.get('exams') and q_exam not in filters['exams']: return False
+    try: q_diff = int(q.get('difficulty', 0))
+    except: q_diff = 0
+    if filters.get('difficulty'):
+        min_d, max_d = filters['difficulty']
+        if q_diff != 0 and not (min_d <= q_diff <= max_d): return False
+    return True
+
+
+INDEXED_FIELDS = ('topic', 'tags', 'content_markdown')  # 챕터 키워드 매칭(matches_keywords)과 검색 색인이 읽는 필드
+_VERSION_MASK = (1 << 64) - 1
+
+
+def question_digest(q):
+    """문제 하나의 question_id + INDEXED_FIELDS 해시 (64비트 정수)"""
+    raw = json.dumps([q.get('question_id')] + [q.get(f) for f in INDEXED_FIELDS], ensure_ascii=False, default=str)
+    return int.from_bytes(hashlib.blake2b(raw.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def question_bank_version(questions):
+    """
+    문제은행 데이터 버전: 문제별 question_digest 의 합 (mod 2^64, hex 문자열).
+    색인이 읽는 필드만 보므로 해설/난이도/보기 수정으로는 바뀌지 않고, 같은 내용이면 순서/프로세스와 상관없이 같다.
+    합이므로 저장/삭제된 문제만으로 다음 버전을 구할 수 있다 (bump_version).
+    """
+    return f"{sum(map(question_digest, questions)) & _VERSION_MASK:016x}"
+
+
+def bump_version(version, old_questions=(), new_questions=()):
+    """old_questions 를 빼고 new_questions 를 더한 버전 (전체를 다시 해시하지 않음)"""
+    v = int(version, 16) - sum(map(question_digest, old_questions)) + sum(map(question_digest, new_questions))
+    return f"{v & _VERSION_MASK:016x}"
+
+
+def advanced_filter_questions(all_qs, filters):
+    filtered = []
+    for q in all_qs:
+        if filters.get('keywords') and not matches_keywords(q, filters['keywords']): continue
+        if not passes_filters(q, filters): continue
+        filtered.append(q)
+    return filtered
+
+
+class ChapterQuestionIndex:
+    """
+    (course_id, chapter_id) -> 챕터 related_keywords 에 맞는 question_id 집합 캐시.
+    키워드 매칭은 학생마다 같으므로 데이터 버전(version)마다 챕터당 한 번만 계산하고,
+    요청 시에는 passes_filters(사이드바 조건)만 적용한다.
+    관리자 저장 시에는 update_questions / invalidate_course 로 해당 항목만 고친다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._entries = {}  # (course_id, chapter_id) -> (keywords tuple, set(question_id))
+
+    def question_ids(self, version, all_qs, course_id, chapter_id, keywords):
+        key, kws = (course_id, chapter_id), tuple(keywords)
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            entry = self._entries.get(key)
+        if entry and entry[0] == kws:  # 챕터 키워드가 바뀌었으면 다시 계산
+            return entry[1]
+        ids = {q['question_id'] for q in all_qs if 'question_id' in q and matches_keywords(q, kws)}
+        with self._lock:
+            if version == self._version: self._entries[key] = (kws, ids)
+        return ids
+
+    def chapter_questions(self, version, all_qs, course_id, chapter_id, keywords, filters):
+        """advanced_filter_questions(all_qs, {**filters, 'keywords': keywords}) 와 같은 결과"""
+        ids = self.question_ids(version, all_qs, course_id, chapter_id, keywords)
+        return [q for q in all_qs if q.get('question_id') in ids and passes_filters(q, filters)]
+
+    def update_questions(self, questions=(), deleted_ids=(), old_version=None, new_version=None):
+        """
+        저장/삭제된 문제만 각 챕터 키워드로 다시 판정 (전체 재계산 없음). 바뀐 챕터 키 목록 리턴.
+        캐시가 old_version 기준이면 new_version 으로 올려서, 다시 읽은 목록으로 조회할 때 항목을 버리지 않게 한다.
+        """
+        changed = []
+        with self._lock:
+            if new_version is not None and self._version == old_version:
+                self._version = new_version
+            for key, (kws, ids) in self._entries.items():
+                touched = False
+                for qid in deleted_ids:
+                    if qid in ids: ids.discard(qid); touched = True
+                for q in questions:
+                    qid = q.get('question_id')
+                    if qid is None: continue
+                    hit = matches_keywords(q, kws)
+                    if hit != (qid in ids):
+                        if hit: ids.add(qid)
+                        else: ids.discard(qid)
+                        touched = True
+                if touched: changed.append(key)
+        return changed
+
+    def invalidate_course(self, course_id):
+        """과목(챕터 키워드)이 저장/삭제되면 그 과목 항목만 버린다 (다음 조회 때 다시 계산)"""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == course_id]:
+                del self._entries[key]
+
+
+def get_exam_questions(all_q, exam_type, exam_year):
+    """특정 시험(예: 2024 CPA)의 문제들을 번호순으로 가져오기"""
+    filtered = [
+        q for q in all_q 
+        if q.get('exam_info', {}).get('type') == exam_type 
+        and q.get('exam_info', {}).get('year') == exam_year
+    ]
+    # question_id 기준으로 정렬 (예: 2024_CPA_01 -> 02 -> 03 ...)
+    return sorted(filtered, key=lambda x: x.get('question_id', ''))
+
+
+def parse_markdown_to_blocks(text):
+    """기존 통짜 마크다운을 ## 제목 기준으로 잘라서 블록 리스트로 변환"""
+    if not text: return []
+    lines = text.split('\n')
+    blocks = []
+    current_content = []
+
+    for line in lines:
+        if line.strip().startswith("## "):
+            # 이전 내용 저장
+            if current_content:
+                blocks.append({
+                    "id": str(uuid.uuid4())[:8],
+                    "content": "\n".join(current_content),
+                    "type": "system"
+                })
+            current_content = [line]
+        else:
+            current_content.append(line)
+
+    # 마지막 블록 저장
+    if current_content:
+        blocks.append({
+            "id": str(uuid.uuid4())[:8],
+            "content": "\n".join(current_content),
+            "type": "system"
+        })
+    return blocks
+
+
+def block_title(block, max_len=30):
+    """블록 첫 줄(## 제목)을 목차용 짧은 제목으로"""
+    first = block.get('content', '').lstrip().split('\n', 1)[0].lstrip('#').strip()
+    return first[:max_len] + ("…" if len(first) > max_len else "")
+
+
+def note_page_window(n_blocks, page, page_size=NOTE_PAGE_SIZE):
+    """블록 n개를 page_size 씩 나눴을 때 page(0부터)의 [start, end) 범위, 전체 페이지 수, 보정된 page"""
+    n_pages = max(1, -(-n_blocks // page_size))
+    page = min(max(page, 0), n_pages - 1)
+    start = page * page_size
+    return start, min(start + page_size, n_blocks), n_pages, page
\ No newline at end of file
@@ -0,0 +1,244 @@
+"""
+Accoun-T 유사(중복) 문제 탐지 (Streamlit / DB 없이 import 가능)
+
+같은 문제가 question_id 만 조금 바뀐 채 여러 번 들어오는 것을 막기 위해
+content_markdown + choices 를 문자 shingle 집합으로 보고 MinHash 서명을 만든 뒤,
+서명을 BANDS 개 구간으로 나눈 LSH 버킷에 넣는다. 새 문제는 자기 버킷들에 들어 있는
+후보만 서명으로 유사도를 확인하므로 문항 하나당 비용이 문제은행 크기와 거의 무관하다.
+
+    index = DuplicateIndex.build(questions)
+    index.query(new_question)                  # [(question_id, 유사도), ...]
+    check_batch(index, items)                  # 가져오기 묶음 검사
+    duplicate_groups(questions)                # 문제은행 전체 중복 보고서
+"""
+import re
+import threading
+
+import numpy as np
+
+NUM_PERM = 128           # MinHash 해시 함수 개수
+BANDS, ROWS = 16, 8      # BANDS * ROWS == NUM_PERM. 후보가 되는 유사도 문턱 ≈ (1/BANDS)^(1/ROWS) ≈ 0.71
+SHINGLE = 5              # 문자 n-gram 길이 (공백/문장부호 제거 후)
+DUP_THRESHOLD = 0.8      # 추정 Jaccard 유사도가 이 이상이면 중복 의심
+
+# 해시 함수 i: x(32비트) -> (A_i * x + B_i) mod 2^64 의 상위 32비트 (multiply-shift, 나머지 연산 없음)
+_rng = np.random.default_rng(20240101)  # 고정 seed: 프로세스가 달라도 같은 서명
+_A = _rng.integers(0, 2**63, NUM_PERM, dtype=np.uint64) * np.uint64(2) + np.uint64(1)   # 홀수
+_B = _rng.integers(0, 2**63, NUM_PERM, dtype=np.uint64)
+_EMPTY = np.full(NUM_PERM, 2**32 - 1, dtype=np.uint32)
+_SHIFT = np.uint64(32)
+_NOISE = re.compile(r"[^0-9a-z가-힣]+")
+_POW = np.uint64(65537) ** np.arange(SHINGLE - 1, -1, -1, dtype=np.uint64)  # 코드포인트(≤ 0xFFFF) 자리값
+
+
+def question_text(q):
+    """비교 대상 텍스트: 지문 + 보기 (보기 번호 순)"""
+    choices = q.get('choices') or {}
+    if isinstance(choices, dict):
+        choices = [choices[k] for k in sorted(choices, key=str)]
+    elif not isinstance(choices, list):
+        choices = [choices]
+    return " ".join([str(q.get('content_markdown') or "")] + [str(c) for c in choices])
+
+
+def normalize(text):
+    """소문자화 + 공백/문장부호 제거"""
+    return _NOISE.sub("", str(text or "").lower())
+
+
+def shingles(text):
+    """문자 SHINGLE-gram 집합 (짧으면 통째로 하나). signatures 가 배열로 하는 일을 읽기 쉽게 쓴 참고용"""
+    s = normalize(text)
+    if len(s) <= SHINGLE:
+        return {s} if s else set()
+    return {s[i:i + SHINGLE] for i in range(len(s) - SHINGLE + 1)}
+
+
+def _shingle_hashes(texts):
+    """
+    정규화된 텍스트들 -> (문서 번호, shingle 해시) 배열. 모든 문서를 코드포인트 배열 하나로 이어 붙이고
+    길이 SHINGLE 창의 다항식 해시를 한 번에 계산한 뒤, 문서 경계를 넘는 창은 버린다.
+    SHINGLE 보다 짧은 문서는 \0 으로 채워 창 하나로 만든다.
+    """
+    texts = [t if len(t) >= SHINGLE else t.ljust(SHINGLE, "\0") for t in texts]
+    lens = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+    codes = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    win = np.lib.stride_tricks.sliding_window_view(codes, SHINGLE)
+    h = (win * _POW).sum(axis=1)                     # uint64 에서 자연스럽게 mod 2^64
+    starts = np.concatenate(([0], np.cumsum(lens)[:-1]))
+    doc = np.repeat(np.arange(len(texts)), lens)[:len(h)]
+    keep = np.arange(len(h)) <= (starts + lens - SHINGLE)[doc]
+    h = h[keep]
+    return doc[keep], (h ^ (h >> _SHIFT)) & np.uint64(0xFFFFFFFF)
+
+
+def signatures(questions, chunk=32):
+    """
+    문제 목록의 MinHash 서명 (n, NUM_PERM) uint32 와 유효 여부 (텍스트가 빈 문제는 False)
+    chunk 개 문서씩 (NUM_PERM × shingle 수) 행렬 연산 한 번 + 문서별 최소값(reduceat)
+    """
+    texts = [normalize(question_text(q)) for q in questions]
+    valid = np.array([bool(t) for t in texts], dtype=bool)
+    sigs = np.tile(_EMPTY, (len(texts), 1))
+    idx = np.flatnonzero(valid)
+    for lo in range(0, len(idx), chunk):
+        part = idx[lo:lo + chunk]
+        doc, x = _shingle_hashes([texts[i] for i in part])
+        order = np.lexsort((x, doc))
+        doc, x = doc[order], x[order]
+        first = np.flatnonzero(np.r_[True, (doc[1:] != doc[:-1]) | (x[1:] != x[:-1])])  # 문서 안 중복 shingle 제거
+        doc, x = doc[first], x[first]
+        hv = np.multiply(_A[:, None], x[None, :])   # (NUM_PERM, shingle 수). 임시 배열 하나로 제자리 연산
+        hv += _B[:, None]
+        hv >>= _SHIFT
+        bounds = np.flatnonzero(np.r_[True, doc[1:] != doc[:-1]])
+        sigs[part[doc[bounds]]] = np.minimum.reduceat(hv, bounds, axis=1).T
+    return sigs, valid
+
+
+def signature(q):
+    """MinHash 서명 (NUM_PERM,) uint32. 텍스트가 비어 있으면 None"""
+    sigs, valid = signatures([q])
+    return sigs[0] if valid[0] else None
+
+
+def similarity(sig_a, sig_b):
+    """두 서명의 일치 비율 = Jaccard 유사도 추정치"""
+    return float(np.count_nonzero(sig_a == sig_b)) / NUM_PERM
+
+
+def _band_keys(sig):
+    return [(b, sig[b * ROWS:(b + 1) * ROWS].tobytes()) for b in range(BANDS)]
+
+
+class DuplicateIndex:
+    """question_id -> MinHash 서명 + LSH 버킷. 저장/삭제된 문제만 add/remove 로 반영"""
+
+    def __init__(self, threshold=DUP_THRESHOLD):
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._sigs = {}       # qid -> 서명
+        self._buckets = {}    # (band, 키 bytes) -> {qid, ...}
+
+    @classmethod
+    def build(cls, questions, threshold=DUP_THRESHOLD):
+        index = cls(threshold)
+        index.update(questions)
+        return index
+
+    def __len__(self):
+        return len(self._sigs)
+
+    def __contains__(self, qid):
+        return qid in self._sigs
+
+    def _remove(self, qid):
+        sig = self._sigs.pop(qid, None)
+        if sig is None: return
+        for key in _band_keys(sig):
+            bucket = self._buckets.get(key)
+            if bucket is None: continue
+            bucket.discard(qid)
+            if not bucket: del self._buckets[key]
+
+    def update(self, questions=(), deleted_ids=()):
+        """저장된 문제는 서명을 새로 넣고 (같은 ID 는 교체), 삭제된 ID 는 뺀다"""
+        questions = [q for q in questions if q.get('question_id') is not None]
+        sigs, valid = signatures(questions)
+        with self._lock:
+            for qid in deleted_ids:
+                self._remove(qid)
+            for q, sig, ok in zip(questions, sigs, valid):
+                qid = q.get('question_id')
+                self._remove(qid)
+                if not ok: continue
+                self._sigs[qid] = sig
+                for key in _band_keys(sig):
+                    self._buckets.setdefault(key, set()).add(qid)
+
+    def _candidates(self, sig):
+        found = set()
+        for key in _band_keys(sig):
+            found |= self._buckets.get(key, set())
+        return found
+
+    def query(self, q, threshold=None, exclude=()):
+        """q 와 유사도가 threshold 이상인 색인 문제 [(question_id, 유사도), ...] (유사도 내림차순)"""
+        sig = signature(q)
+        if sig is None:
+            return []
+        threshold = self.threshold if threshold is None else threshold
+        skip = set(exclude) | {q.get('question_id')}
+        with self._lock:
+            cands = [qid for qid in self._candidates(sig) if qid not in skip]
+            sims = [(qid, similarity(sig, self._sigs[qid])) for qid in cands]
+        return sorted([(qid, s) for qid, s in sims if s >= threshold], key=lambda x: (-x[1], str(x[0])))
+
+    def pairs(self, threshold=None):
+        """색인 안에서 유사도가 threshold 이상인 쌍 [(qid_a, qid_b, 유사도), ...]. 같은 버킷에 든 문제끼리만 비교"""
+        threshold = self.threshold if threshold is None else threshold
+        seen, found = set(), []
+        with self._lock:
+            for bucket in self._buckets.values():
+                if len(bucket) < 2: continue
+                members = sorted(bucket, key=str)
+                for i, a in enumerate(members):
+                    for b in members[i + 1:]:
+                        if (a, b) in seen: continue
+                        seen.add((a, b))
+                        sim = similarity(self._sigs[a], self._sigs[b])
+                        if sim >= threshold: found.append((a, b, sim))
+        return found
+
+
+def check_batch(index, items, threshold=None):
+    """
+    가져올 문제 묶음 검사: 문제은행(index)과 묶음 안 앞선 문항 모두와 비교한다.
+    이미 색인에 있는 question_id 는 기존 문제 수정이므로 검사하지 않는다.
+    리턴: [{"question_id", "duplicate_of", "similarity"}, ...] (묶음 순서, 문항당 가장 비슷한 것 하나)
+    """
+    batch = DuplicateIndex(index.threshold if threshold is None else threshold)
+    found = []
+    for q in items:
+        qid = q.get('question_id')
+        if qid in index: continue
+        hits = index.query(q, threshold) + batch.query(q, threshold)
+        if hits:
+            dup, sim = max(hits, key=lambda x: x[1])
+            found.append({"question_id": qid, "duplicate_of": dup, "similarity": round(sim, 3)})
+        else:
+            batch.update([q])
+    return found
+
+
+def duplicate_groups(questions, threshold=DUP_THRESHOLD, index=None):
+    """
+    문제은행 전체 중복 보고서: LSH 버킷을 공유하는 쌍 중 유사한 것들을 묶는다 (union-find)
+    index 를 주면 그 색인(questions 와 같은 문제들)을 그대로 쓴다.
+    각 묶음의 첫 번째(question_id 순)를 원본으로 보고 나머지를 중복 후보로.
+    리턴: [{"keep": qid, "duplicates": [(qid, 원본과의 유사도), ...]}, ...] (묶음이 큰 순)
+    """
+    index = index or DuplicateIndex.build(questions, threshold)
+    parent = {}
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]  # 경로 압축
+            x = parent[x]
+        return x
+
+    for a, b, _ in index.pairs(threshold):
+        parent.setdefault(a, a); parent.setdefault(b, b)
+        ra, rb = find(a), find(b)
+        if ra != rb: parent[max(ra, rb, key=str)] = min(ra, rb, key=str)
+
+    groups = {}
+    for qid in parent:
+        groups.setdefault(find(qid), set()).add(qid)
+    report = []
+    for members in groups.values():
+        keep, *rest = sorted(members, key=str)
+        base = index._sigs[keep]
+        report.append({"keep": keep, "duplicates": [(qid, round(similarity(base, index._sigs[qid]), 3)) for qid in rest]})
+    report.sort(key=lambda g: (-len(g["duplicates"]), str(g["keep"])))
+    return report
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""
+Accoun-T 실전 모의고사 답안지 (Streamlit / DB 없이 import 가능)
+
+시험지 한 벌(같은 유형·연도의 문제들)에 대한 응시 기록을 문항 순서대로 정렬된
+작은 numpy 배열로 들고 있다가, 제출할 때 채점/문항별 시간/주제별 정답률을 한 번에 계산해
+문서 하나(exam_attempts)로 저장한다. 풀이 도중에는 저장소에 쓰지 않는다.
+
+    attempt = ExamAttempt(questions, "CPA", 2024)
+    attempt.answer(0, 3); attempt.visit(1)
+    attempt.finish(); doc = attempt.to_doc("student_demo")
+"""
+import datetime
+import time
+import uuid
+
+import numpy as np
+
+UNANSWERED = 0  # answers 배열에서 '미응답'
+
+
+def _choice_no(value):
+    """정답/선택 번호를 1~N 정수로 (알 수 없으면 0)"""
+    try:
+        return int(str(value).strip().split(".")[0])
+    except (TypeError, ValueError):
+        return 0
+
+
+class ExamAttempt:
+    """
+    시험지 한 벌에 대한 답안지. i 번째 원소 = question_ids[i] 문항
+      answers : int8    선택한 번호 (0 = 미응답)
+      key     : int8    정답 번호
+      elapsed : float32 문항별 머문 시간(초), 이전/다음으로 이동할 때 누적
+      topic   : int16   topics 목록의 인덱스
+    """
+
+    def __init__(self, questions, exam_type, exam_year, now=None):
+        now = time.time() if now is None else now
+        self.attempt_id = uuid.uuid4().hex[:12]
+        self.exam_type, self.exam_year = exam_type, exam_year
+        self.question_ids = [q.get('question_id') for q in questions]
+        n = len(self.question_ids)
+        self.answers = np.zeros(n, dtype=np.int8)
+        self.key = np.array([_choice_no(q.get('answer')) for q in questions], dtype=np.int8)
+        self.elapsed = np.zeros(n, dtype=np.float32)
+        self.topics, topic_idx = np.unique([q.get('topic') or "기타" for q in questions], return_inverse=True)
+        self.topic = topic_idx.astype(np.int16)
+        self.current = 0
+        self.started_at = now
+        self._entered_at = now
+        self.submitted_at = None
+
+    @property
+    def submitted(self):
+        return self.submitted_at is not None
+
+    def matches(self, exam_type, exam_year, questions):
+        """같은 시험지(유형, 연도, 문항 ID 순서)인지"""
+        return (self.exam_type, self.exam_year) == (exam_type, exam_year) and \
+            self.question_ids == [q.get('question_id') for q in questions]
+
+    # --- 풀이 중 ---
+    def visit(self, idx, now=None):
+        """idx 번 문항으로 이동. 직전 문항에 머문 시간을 누적한다"""
+        idx = min(max(idx, 0), len(self.question_ids) - 1)
+        if self.submitted or idx == self.current:
+            return idx
+        now = time.time() if now is None else now
+        self.elapsed[self.current] += now - self._entered_at
+        self.current, self._entered_at = idx, now
+        return idx
+
+    def answer(self, idx, choice):
+        if not self.submitted:
+            self.answers[idx] = _choice_no(choice)
+
+    def finish(self, now=None):
+        """제출: 현재 문항 시간을 마감 (이후 답안 변경 불가)"""
+        if self.submitted:
+            return
+        now = time.time() if now is None else now
+        self.elapsed[self.current] += now - self._entered_at
+        self.submitted_at = now
+
+    def reopen(self):
+        """제출 취소 (답안지 저장 실패 시): 제출 시각까지 잰 시간은 두고 그 시점부터 다시 잰다"""
+        if self.submitted:
+            self._entered_at, self.submitted_at = self.submitted_at, None
+
+    # --- 채점 ---
+    def result(self):
+        """점수, 문항별 정오/시간, 주제별 정답률 (배열 연산 한 번)"""
+        n = len(self.question_ids)
+        answered = self.answers != UNANSWERED
+        hit = answered & (self.answers == self.key)
+        n_topics = len(self.topics)
+        t_total = np.bincount(self.topic, minlength=n_topics)
+        t_hit = np.bincount(self.topic, weights=hit, minlength=n_topics)
+        t_time = np.bincount(self.topic, weights=self.elapsed, minlength=n_topics)
+        return {
+            "total": n,
+            "answered": int(answered.sum()),
+            "correct": int(hit.sum()),
+            "score": round(100.0 * hit.sum() / n, 1) if n else 0.0,
+            "time_total_sec": round(float(self.elapsed.sum()), 1),
+            "correct_flags": hit.tolist(),
+            "topics": [
+                {"topic": str(self.topics[t]), "total": int(t_total[t]), "correct": int(t_hit[t]),
+                 "accuracy": round(float(t_hit[t] / t_total[t]), 3), "time_sec": round(float(t_time[t]), 1)}
+                for t in range(n_topics)
+            ],
+        }
+
+    def to_doc(self, user_id):
+        """exam_attempts 컬렉션에 한 번에 저장할 문서"""
+        res = self.result()
+        iso = lambda ts: datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).isoformat() if ts is not None else None
+        return {
+            "attempt_id": self.attempt_id,
+            "user_id": user_id,
+            "exam_type": self.exam_type,
+            "exam_year": self.exam_year,
+            "question_ids": self.question_ids,
+            "answers": self.answers.tolist(),
+            "elapsed_sec": [round(float(t), 1) for t in self.elapsed],
+            "started_at": iso(self.started_at),
+            "submitted_at": iso(self.submitted_at),
+            "score": res["score"],
+            "correct": res["correct"],
+            "answered": res["answered"],
+            "total": res["total"],
+            "topics": res["topics"],
+        }
\ No newline at end of file
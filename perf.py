@@ -0,0 +1,145 @@
+"""
+Accoun-T 성능 계측 (프로세스 단위)
+
+Streamlit 은 위젯을 건드릴 때마다 app.py 전체를 다시 실행하므로, 한 번의 rerun 안에서
+어느 단계(데이터 로드, 사이드바, 탭 렌더링, 시뮬레이터, 저장소 쓰기)가 시간을 쓰는지
+span 으로 재고 이름별로 모아서 백분위수로 보여준다.
+
+    with perf.span("student.notes"):
+        ...
+    perf.instrument_class(Simulators, "simulator")      # 정적 메서드 호출마다 자동 측정
+    perf.summary()        # [{"name", "count", "p50_ms", "p95_ms", ...}, ...]
+    perf.prometheus_text()
+"""
+import contextlib
+import contextvars
+import functools
+import json
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+MAX_SAMPLES = 2000  # 이름별로 최근 N개만 보관 (메모리 상한)
+
+_lock = threading.Lock()
+_samples = {}   # name -> deque[ms]
+_counts = {}    # name -> 전체 호출 수 (deque 에서 밀려난 것 포함)
+_totals = {}    # name -> 전체 누적 ms
+
+# 지금 실행 중인 기능(span 이름). 저장소 사용량 집계의 태그로 쓰인다 (storage.MeteredStorage)
+_current_feature = contextvars.ContextVar("perf_feature", default="untagged")
+
+
+def current_feature():
+    return _current_feature.get()
+
+
+def record(name, ms):
+    with _lock:
+        if name not in _samples:
+            _samples[name] = deque(maxlen=MAX_SAMPLES)
+            _counts[name] = 0
+            _totals[name] = 0.0
+        _samples[name].append(ms)
+        _counts[name] += 1
+        _totals[name] += ms
+
+
+@contextlib.contextmanager
+def span(name, tag=True):
+    """
+    with 블록의 실행 시간을 name 으로 기록 (예외로 빠져나가도 기록)
+    tag=True 면 블록 안의 저장소 호출이 이 이름(기능)으로 집계된다.
+    """
+    token = _current_feature.set(name) if tag else None
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, (time.perf_counter() - t0) * 1000)
+        if token is not None: _current_feature.reset(token)
+
+
+def timed(name, tag=False):
+    """함수 데코레이터 버전의 span (기본은 기능 태그를 바꾸지 않음)"""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name, tag=tag):
+                return fn(*args, **kwargs)
+        wrapper._perf_wrapped = True
+        return wrapper
+    return deco
+
+
+def instrument_class(cls, prefix):
+    """
+    클래스의 public 정적 메서드를 모두 span 으로 감싼다.
+    Streamlit rerun 마다 호출돼도 한 번만 감싸도록 표시를 남긴다.
+    """
+    if getattr(cls, "_perf_instrumented", False):
+        return cls
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("_") or not isinstance(value, staticmethod):
+            continue
+        setattr(cls, attr, staticmethod(timed(f"{prefix}.{attr}")(value.__func__)))
+    cls._perf_instrumented = True
+    return cls
+
+
+def instrument_object(obj, methods, prefix):
+    """객체(예: 저장소 인스턴스)의 지정한 메서드들을 span 으로 감싼다"""
+    for attr in methods:
+        fn = getattr(obj, attr, None)
+        if fn is None or getattr(fn, "_perf_wrapped", False):
+            continue
+        setattr(obj, attr, timed(f"{prefix}.{attr}")(fn))
+    return obj
+
+
+def reset():
+    with _lock:
+        _samples.clear(); _counts.clear(); _totals.clear()
+
+
+def summary():
+    """이름별 호출 수 / 누적 / 백분위수 (최근 MAX_SAMPLES 기준)"""
+    with _lock:
+        snap = {name: (np.fromiter(vals, dtype=float), _counts[name], _totals[name]) for name, vals in _samples.items()}
+    rows = []
+    for name, (vals, count, total) in sorted(snap.items()):
+        if not len(vals): continue
+        p50, p95, p99 = np.percentile(vals, [50, 95, 99])
+        rows.append({
+            "name": name, "count": count, "total_ms": total,
+            "p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99), "max_ms": float(vals.max()),
+        })
+    return rows
+
+
+def export_json(path=None):
+    data = json.dumps({"generated_at": time.time(), "spans": summary()}, indent=2, ensure_ascii=False)
+    if path:
+        with open(path, "w", encoding="utf-8") as f: f.write(data)
+    return data
+
+
+def _prom_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def prometheus_text(path=None, metric="accountt_span_ms"):
+    """Prometheus text exposition 형식 (summary 타입)"""
+    lines = [f"# HELP {metric} Streamlit rerun stage latency in milliseconds", f"# TYPE {metric} summary"]
+    for row in summary():
+        label = f'span="{_prom_label(row["name"])}"'
+        for q, key in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+            lines.append(f'{metric}{{{label},quantile="{q}"}} {row[key]:.3f}')
+        lines.append(f"{metric}_sum{{{label}}} {row['total_ms']:.3f}")
+        lines.append(f"{metric}_count{{{label}}} {row['count']}")
+    text = "\n".join(lines) + "\n"
+    if path:
+        with open(path, "w", encoding="utf-8") as f: f.write(text)
+    return text
\ No newline at end of file
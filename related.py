@@ -0,0 +1,324 @@
+"""
+Accoun-T 관련 문제 색인 (Streamlit 없이 import 가능)
+
+Tab 3 에서 문제를 열었을 때 "비슷한 기출"을 딕셔너리 조회 한 번으로 보여주기 위해,
+문제마다 코사인 유사도 상위 k개 이웃을 미리 계산해서 저장소에 둔다.
+
+  - 특징: content_markdown / tags / topic 을 search.tokenize (한글 2-gram) 로 쪼갠 TF-IDF
+  - 벡터: 용어를 부호 있는 feature hashing 으로 DIM 차원에 접어 넣은 float32 (행 단위 L2 정규화)
+          -> 유사도 계산은 블록 단위 행렬곱, 새 문제 하나는 (n, DIM) @ (DIM,) 한 번
+  - 저장: related_questions/{shard_NN} 문서 RELATED_SHARDS 개에 {question_id: {"ids", "scores"}}
+          (Firestore 는 배열 안 배열을 못 넣고 문서 크기 제한이 있어서 묶음으로 나눔)
+          related_vectors/{shard_NN} 문서 VECTOR_SHARDS 개에 벡터(0 이 아닌 칸만)와 df, meta 문서에 DIM / n_docs
+
+전체 생성(O(n²))은 오프라인 CLI 나 관리자 '다시 만들기' 버튼으로만 한다.
+앱은 저장된 벡터와 이웃 목록을 읽어 두고(RelatedIndex.load), 문제를 저장/삭제하면 바뀐 행만 그 행렬과 비교해서
+영향받는 이웃 목록을 다시 계산한다.
+
+    python related.py build [--k 10] [--credentials key.json]
+"""
+import argparse
+import base64
+import functools
+import json
+import math
+import threading
+import zlib
+from collections import Counter
+
+import numpy as np
+
+from search import tokenize
+
+COLLECTION = "related_questions"
+VECTOR_COLLECTION = "related_vectors"
+META_ID = "meta"
+RELATED_K = 10
+RELATED_SHARDS = 128
+VECTOR_SHARDS = 256
+DIM = 1024     # 한글 2-gram 어휘(수만 개)를 접어 넣는 차원. 256 은 충돌이 많다 (benchmarks.checks related_hashing_recall)
+FIELD_WEIGHTS = {"content_markdown": 1.0, "tags": 2.0, "topic": 2.0}
+BLOCK = 1024   # 전체 생성 시 한 번에 유사도를 계산하는 행 수 (BLOCK × n float32)
+
+
+def shard_of(question_id, shards=RELATED_SHARDS):
+    return f"shard_{zlib.crc32(str(question_id).encode('utf-8')) % shards:03d}"
+
+
+def _term_counts(q):
+    tf = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        value = q.get(field)
+        text = " ".join(map(str, value)) if isinstance(value, list) else (value or "")
+        for tok in tokenize(text):
+            tf[tok] += weight
+    return tf
+
+
+@functools.lru_cache(maxsize=200_000)
+def _slot(term):
+    """용어 -> (차원, 부호). 부호를 섞어야 충돌한 용어끼리 내적이 한쪽으로 쏠리지 않는다"""
+    h = zlib.crc32(term.encode("utf-8"))
+    return h % DIM, 1.0 if (h >> 31) & 1 else -1.0
+
+
+class RelatedIndex:
+    """question_id -> 정규화된 TF-IDF 해시 벡터 + 상위 k 이웃"""
+
+    def __init__(self, k=RELATED_K):
+        self.k = k
+        self._lock = threading.Lock()
+        self.question_ids = []
+        self.row_of = {}
+        self.vectors = np.zeros((0, DIM), dtype=np.float32)
+        self.df, self.n_docs = Counter(), 0
+        self.neighbors = {}   # qid -> [(qid, score), ...] 점수 내림차순
+
+    # --- 벡터 ---
+    def _idf(self, term):
+        return math.log((1 + self.n_docs) / (1 + self.df.get(term, 0))) + 1.0
+
+    def _vector(self, tf):
+        v = np.zeros(DIM, dtype=np.float32)
+        for term, f in tf.items():
+            d, sign = _slot(term)
+            v[d] += sign * (1.0 + math.log(f)) * self._idf(term)
+        norm = float(np.linalg.norm(v))
+        return v / norm if norm else v
+
+    def _top_k(self, scores, row):
+        """scores (n,) 에서 자기 자신과 비어 있는 행(삭제)을 빼고 상위 k [(qid, score)]"""
+        scores[row] = -np.inf
+        if len(scores) > self.k:
+            top = np.argpartition(-scores, self.k - 1)[:self.k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.lexsort((top, -scores[top]))]
+        return [(self.question_ids[j], round(float(scores[j]), 4)) for j in top
+                if np.isfinite(scores[j]) and scores[j] > 0 and self.question_ids[j] is not None]
+
+    @classmethod
+    def build(cls, questions, k=RELATED_K):
+        index = cls(k)
+        questions = [q for q in questions if q.get('question_id') is not None]
+        counts = [_term_counts(q) for q in questions]
+        for tf in counts:
+            index.df.update(tf.keys())
+        index.n_docs = len(questions)
+        index.question_ids = [q['question_id'] for q in questions]
+        index.row_of = {qid: i for i, qid in enumerate(index.question_ids)}
+        index.vectors = np.vstack([index._vector(tf) for tf in counts]) if counts else np.zeros((0, DIM), dtype=np.float32)
+        index.neighbors = {qid: [] for qid in index.question_ids}
+        X, kk = index.vectors, min(k, max(len(index.question_ids) - 1, 0))
+        for lo in range(0, len(X) if kk else 0, BLOCK):
+            sims = X[lo:lo + BLOCK] @ X.T
+            rows = np.arange(len(sims))
+            sims[rows, lo + rows] = -np.inf   # 자기 자신 제외
+            top = np.argpartition(-sims, kk - 1, axis=1)[:, :kk]   # 블록 전체를 한 번에 top-k
+            top_s = np.take_along_axis(sims, top, axis=1)
+            order = np.argsort(-top_s, axis=1, kind="stable")
+            top, top_s = np.take_along_axis(top, order, axis=1), np.take_along_axis(top_s, order, axis=1)
+            for i in rows:
+                index.neighbors[index.question_ids[lo + i]] = [
+                    (index.question_ids[j], round(float(sc), 4)) for j, sc in zip(top[i], top_s[i]) if sc > 0]
+        return index
+
+    @classmethod
+    def load(cls, store):
+        """save_vectors 로 저장된 벡터/df 와 load_neighbors 이웃 목록으로 복원 (저장된 색인이 없거나 DIM 이 다르면 None)"""
+        meta = store.get_document(VECTOR_COLLECTION, META_ID)
+        if not meta or meta.get('dim') != DIM:
+            return None
+        index = cls(meta.get('k') or RELATED_K)
+        index.n_docs = meta.get('n_docs') or 0
+        rows = []
+        for doc in store.list_documents(VECTOR_COLLECTION):
+            index.df.update(doc.get('df') or {})
+            for qid, packed in (doc.get('vectors') or {}).items():
+                index.question_ids.append(qid)
+                rows.append(_unpack_vector(packed))
+        index.row_of = {qid: i for i, qid in enumerate(index.question_ids)}
+        index.vectors = np.vstack(rows) if rows else np.zeros((0, DIM), dtype=np.float32)
+        neighbors = load_neighbors(store)
+        index.neighbors = {qid: neighbors.get(qid, []) for qid in index.question_ids}
+        return index
+
+    def __len__(self):
+        return len(self.row_of)
+
+    # --- 증분 갱신 ---
+    def update(self, questions=(), deleted_ids=()):
+        """
+        저장/삭제된 문제를 반영하고 이웃 목록이 바뀐 question_id 집합을 리턴 (삭제된 ID 포함)
+          - 저장된 문제: 벡터를 새로 만들고 자기 이웃을 다시 계산
+          - 다른 문제: 새 점수가 자기 k번째보다 크면 끼워 넣고, 바뀐/삭제된 문제가 이웃이었으면 다시 계산
+        IDF 는 전체 생성 때 값을 그대로 쓴다 (새 용어는 df=0). 오래 쌓이면 rebuild 로 다시 만든다.
+        """
+        changed = set()
+        with self._lock:
+            touched = set(deleted_ids) | {q.get('question_id') for q in questions}
+            touched.discard(None)
+            for qid in deleted_ids:
+                row = self.row_of.pop(qid, None)
+                if row is None: continue
+                self.vectors[row] = 0
+                self.question_ids[row] = None
+                self.neighbors.pop(qid, None)
+                changed.add(qid)
+            new_rows = []
+            for q in questions:
+                qid = q.get('question_id')
+                if qid is None: continue
+                v = self._vector(_term_counts(q))
+                row = self.row_of.get(qid)
+                if row is None:
+                    row = len(self.question_ids)
+                    self.question_ids.append(qid)
+                    self.row_of[qid] = row
+                    new_rows.append(v)
+                else:
+                    self.vectors[row] = v
+            if new_rows:
+                self.vectors = np.vstack([self.vectors, np.asarray(new_rows, dtype=np.float32)])
+
+            saved = [q.get('question_id') for q in questions if q.get('question_id') is not None]
+            X = self.vectors
+            # 행마다 이웃 목록에 끼어들려면 넘어야 하는 점수 (k개 미만이면 0)
+            kth = np.zeros(len(self.question_ids), dtype=np.float32)
+            for other, nbrs in self.neighbors.items():
+                if len(nbrs) >= self.k: kth[self.row_of[other]] = nbrs[-1][1]
+            for qid in saved:
+                row = self.row_of[qid]
+                scores = X @ X[row]
+                self.neighbors[qid] = self._top_k(scores.copy(), row)
+                changed.add(qid)
+                for j in np.flatnonzero(scores > kth):
+                    other = self.question_ids[j]
+                    if other is None or other == qid or other in touched: continue
+                    self.neighbors[other] = self._merge(self.neighbors.get(other, []), qid, float(scores[j]))
+                    if len(self.neighbors[other]) >= self.k: kth[j] = self.neighbors[other][-1][1]
+                    changed.add(other)
+            # 바뀐/삭제된 문제를 이웃으로 갖고 있던 문제는 처음부터 다시 계산 (점수가 내려갔을 수 있음)
+            for other, nbrs in list(self.neighbors.items()):
+                if other in touched or not any(n in touched for n, _ in nbrs): continue
+                row = self.row_of[other]
+                self.neighbors[other] = self._top_k(X @ X[row], row)
+                changed.add(other)
+        return changed
+
+    def _merge(self, current, qid, score):
+        merged = [(n, s) for n, s in current if n != qid] + [(qid, round(score, 4))]
+        merged.sort(key=lambda x: -x[1])
+        return merged[:self.k]
+
+
+# =========================================================
+# 저장소 입출력 (shard 문서)
+# =========================================================
+def _pack(nbrs):
+    return {"ids": [n for n, _ in nbrs], "scores": [s for _, s in nbrs]}
+
+
+def save_neighbors(store, neighbors, question_ids=None):
+    """
+    이웃 목록을 shard 문서에 저장. question_ids 를 주면 그 문제들이 속한 shard 만 읽어서 고쳐 쓴다
+    (neighbors 에 없는 ID 는 삭제된 것으로 보고 shard 에서 뺀다). 저장한 shard 수 리턴
+    """
+    if question_ids is None:
+        shards = {}
+        for qid, nbrs in neighbors.items():
+            shards.setdefault(shard_of(qid), {})[str(qid)] = _pack(nbrs)
+        for old in store.list_document_fields(COLLECTION, ["shard"]):
+            if old.get('shard') not in shards:
+                store.delete_document(COLLECTION, old.get('shard'))
+    else:
+        shards = {}
+        for qid in question_ids:
+            sid = shard_of(qid)
+            if sid not in shards:
+                shards[sid] = dict((store.get_document(COLLECTION, sid) or {}).get('neighbors') or {})
+            if qid in neighbors: shards[sid][str(qid)] = _pack(neighbors[qid])
+            else: shards[sid].pop(str(qid), None)
+    for sid, entries in shards.items():
+        store.set_document(COLLECTION, sid, {"shard": sid, "neighbors": entries})
+    return len(shards)
+
+
+def _pack_vector(v):
+    """0 이 아닌 칸만 (uint16 칸 번호 + float32 값) 을 base64 문자열로"""
+    slots = np.flatnonzero(v).astype(np.uint16)
+    return base64.b64encode(slots.tobytes() + v[slots].astype(np.float32).tobytes()).decode("ascii")
+
+
+def _unpack_vector(packed):
+    raw = base64.b64decode(packed)
+    n = len(raw) // 6
+    v = np.zeros(DIM, dtype=np.float32)
+    v[np.frombuffer(raw[:2 * n], dtype=np.uint16)] = np.frombuffer(raw[2 * n:], dtype=np.float32)
+    return v
+
+
+def save_vectors(store, index, question_ids=None):
+    """
+    벡터를 related_vectors shard 문서에 저장. question_ids 를 주면 그 문제들이 속한 shard 만 읽어서 고쳐 쓴다
+    (색인에 없는 ID 는 삭제된 것으로 보고 뺀다). df / meta 는 전체 저장 때만 쓴다 (증분 갱신은 IDF 를 바꾸지 않음)
+    """
+    shards = {}
+    if question_ids is None:
+        for qid, row in index.row_of.items():
+            shards.setdefault(shard_of(qid, VECTOR_SHARDS), {"vectors": {}, "df": {}})["vectors"][str(qid)] = _pack_vector(index.vectors[row])
+        for term, n in index.df.items():
+            shards.setdefault(shard_of(term, VECTOR_SHARDS), {"vectors": {}, "df": {}})["df"][term] = n
+        for old in store.list_document_fields(VECTOR_COLLECTION, ["shard"]):
+            if old.get('shard') and old['shard'] not in shards:
+                store.delete_document(VECTOR_COLLECTION, old['shard'])
+    else:
+        for qid in question_ids:
+            sid = shard_of(qid, VECTOR_SHARDS)
+            if sid not in shards:
+                doc = store.get_document(VECTOR_COLLECTION, sid) or {}
+                shards[sid] = {"vectors": dict(doc.get('vectors') or {}), "df": doc.get('df') or {}}
+            row = index.row_of.get(qid)
+            if row is not None: shards[sid]["vectors"][str(qid)] = _pack_vector(index.vectors[row])
+            else: shards[sid]["vectors"].pop(str(qid), None)
+    for sid, entry in shards.items():
+        store.set_document(VECTOR_COLLECTION, sid, {"shard": sid, **entry})
+    if question_ids is None:
+        store.set_document(VECTOR_COLLECTION, META_ID, {"dim": DIM, "k": index.k, "n_docs": index.n_docs, "shards": VECTOR_SHARDS})
+    return len(shards)
+
+
+def rebuild(store, questions, k=RELATED_K):
+    """전체 생성 후 이웃 목록과 벡터를 모두 저장 (CLI build / 관리자 '다시 만들기'). 만든 색인 리턴"""
+    index = RelatedIndex.build(questions, k=k)
+    save_neighbors(store, index.neighbors)
+    save_vectors(store, index)
+    return index
+
+
+def load_neighbors(store):
+    """question_id -> [(question_id, score), ...] (shard 문서 RELATED_SHARDS 개 이하를 읽는다)"""
+    neighbors = {}
+    for doc in store.list_documents(COLLECTION):
+        for qid, packed in (doc.get('neighbors') or {}).items():
+            neighbors[qid] = list(zip(packed.get('ids') or [], packed.get('scores') or []))
+    return neighbors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Accoun-T 관련 문제 색인")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build", help="문제은행 전체로 이웃 목록과 벡터를 만들어 저장")
+    p_build.add_argument("--k", type=int, default=RELATED_K)
+    p_build.add_argument("--credentials", default=None, help="서비스계정 JSON 경로 (없으면 .streamlit/secrets.toml)")
+    args = parser.parse_args(argv)
+
+    import snapshot
+    store = snapshot._firestore_storage(args.credentials)
+    if args.command == "build":
+        index = rebuild(store, store.list_questions(), k=args.k)
+        print(json.dumps({"questions": len(index), "k": args.k, "dim": DIM, "shards": RELATED_SHARDS, "vector_shards": VECTOR_SHARDS}, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""
+Accoun-T 문제 검색 엔진 (Streamlit / DB 없이 import 가능)
+
+topic / tags / content_markdown 을 문자 n-gram 으로 색인하고 BM25 로 순위를 매긴다.
+한글 단어는 띄어쓰기와 상관없이 2-gram 으로 쪼개므로 "사채 상환" 으로 "사채상환손익" 이 찾아진다.
+영문/숫자는 단어 그대로 색인한다.
+
+색인은 용어별 posting 을 CSR 형태의 numpy 배열(indptr / doc / weight)로 들고 있다.
+weight 는 build 때 미리 계산한 BM25 항(idf × tf 포화 × 길이 보정)이라
+질의 한 번은 질의 용어 수만큼의 bincount + argpartition(top-k) 이다.
+
+    index = SearchIndex.build(questions)
+    index.search("사채 상환", k=20)              # [(question_id, score), ...]
+    index.rank("사채 상환", ["2024_CPA_01", ...])  # 주어진 문제들을 관련도 순으로
+"""
+import functools
+import re
+from array import array
+from collections import Counter
+
+import numpy as np
+
+FIELD_WEIGHTS = {"topic": 3.0, "tags": 2.0, "content_markdown": 1.0}  # 필드별 tf 가중치
+BM25_K1 = 1.2
+BM25_B = 0.75
+NGRAM = 2
+
+_WORD = re.compile(r"[0-9a-z]+|[가-힣]+")
+_HANGUL = re.compile(r"[가-힣]")
+
+
+@functools.lru_cache(maxsize=200_000)
+def _word_tokens(word):
+    if len(word) > NGRAM - 1 and _HANGUL.match(word):
+        return tuple(word[i:i + NGRAM] for i in range(len(word) - NGRAM + 1))
+    return (word,)
+
+
+def tokenize(text):
+    """소문자화 후 한글 단어는 문자 2-gram (한 글자 단어는 그대로), 영문/숫자는 단어 단위"""
+    tokens = []
+    for word in _WORD.findall(str(text or "").lower()):
+        tokens.extend(_word_tokens(word))  # 같은 단어가 반복되는 본문에서 n-gram 분해 재사용
+    return tokens
+
+
+def _field_text(q, field):
+    value = q.get(field)
+    if isinstance(value, list): return " ".join(map(str, value))
+    return value or ""
+
+
+class SearchIndex:
+    """문제 목록에 대한 BM25 색인 (읽기 전용, 바뀌면 다시 build)"""
+
+    def __init__(self, question_ids, vocab, indptr, post_doc, post_tf, doc_len):
+        self.question_ids = question_ids
+        self.doc_of = {qid: d for d, qid in enumerate(question_ids)}
+        self.vocab = vocab
+        self.indptr, self.post_doc = indptr, post_doc
+        n = len(question_ids)
+        df = np.diff(indptr)
+        idf = np.log1p((n - df + 0.5) / (df + 0.5))
+        avg = float(doc_len.mean()) if n else 1.0
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len / (avg or 1.0))
+        term_of = np.repeat(np.arange(len(df)), df)
+        self.post_w = (idf[term_of] * post_tf * (BM25_K1 + 1) / (post_tf + norm[post_doc])).astype(np.float32)
+
+    @classmethod
+    def build(cls, questions):
+        vocab = {}
+        terms, docs, tfs = array("i"), array("i"), array("f")
+        doc_len = np.zeros(len(questions), dtype=np.float32)
+        question_ids = []
+        for d, q in enumerate(questions):
+            question_ids.append(q.get('question_id'))
+            tf = Counter()
+            for field, weight in FIELD_WEIGHTS.items():
+                for tok in tokenize(_field_text(q, field)):
+                    tf[tok] += weight
+            for tok, f in tf.items():
+                terms.append(vocab.setdefault(tok, len(vocab)))
+                docs.append(d)
+                tfs.append(f)
+            doc_len[d] = sum(tf.values())
+        terms = np.frombuffer(terms, dtype=np.int32)
+        order = np.argsort(terms, kind="stable")  # 용어별로 모으기 (같은 용어 안에서는 문서 순서 유지)
+        indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=len(vocab)), out=indptr[1:])
+        return cls(question_ids, vocab,
+                   indptr, np.frombuffer(docs, dtype=np.int32)[order], np.frombuffer(tfs, dtype=np.float32)[order],
+                   doc_len)
+
+    def __len__(self):
+        return len(self.question_ids)
+
+    def scores(self, query):
+        """모든 문서의 BM25 점수 배열 (질의와 겹치는 용어가 없으면 0)"""
+        scores = np.zeros(len(self.question_ids), dtype=np.float32)
+        for tok, qtf in Counter(tokenize(query)).items():
+            tid = self.vocab.get(tok)
+            if tid is None: continue
+            lo, hi = self.indptr[tid], self.indptr[tid + 1]
+            if hi - lo > len(scores) // 8:  # 흔한 용어: 전체 길이 bincount 가 fancy-index 보다 빠름
+                scores += qtf * np.bincount(self.post_doc[lo:hi], weights=self.post_w[lo:hi], minlength=len(scores)).astype(np.float32)
+            else:  # posting 안에서 문서는 한 번씩만 나오므로 fancy-index += 가 안전
+                scores[self.post_doc[lo:hi]] += qtf * self.post_w[lo:hi]
+        return scores
+
+    def search(self, query, k=20, question_ids=None):
+        """
+        점수 상위 k개 [(question_id, score), ...]. 점수 0 (겹치는 용어 없음)은 제외
+        question_ids 를 주면 그 문제들 안에서만 찾는다.
+        """
+        scores = self.scores(query)
+        if question_ids is not None:
+            mask = np.zeros(len(scores), dtype=bool)
+            mask[[self.doc_of[qid] for qid in question_ids if qid in self.doc_of]] = True
+            scores[~mask] = 0
+        hits = np.flatnonzero(scores > 0)
+        if k is not None and len(hits) > k:
+            hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        hits = hits[np.lexsort((hits, -scores[hits]))]  # 점수 내림차순, 같으면 원래 순서
+        return [(self.question_ids[d], float(scores[d])) for d in hits]
+
+    def rank(self, query, question_ids):
+        """주어진 문제 ID 들을 관련도 순으로 (색인에 없거나 점수 0 인 것은 원래 순서대로 뒤에)"""
+        scores = np.append(self.scores(query), np.float32(0))  # 마지막 칸: 색인에 없는 문제용 0점
+        docs = np.fromiter((self.doc_of.get(qid, -1) for qid in question_ids), dtype=np.int64, count=len(question_ids))
+        order = np.lexsort((np.arange(len(docs)), -scores[docs]))
+        return [question_ids[i] for i in order]
\ No newline at end of file
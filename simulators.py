@@ -0,0 +1,736 @@
+"""
+Accoun-T 시뮬레이터 엔진
+
+Streamlit 없이 import 할 수 있도록 app.py 에서 분리한 계산 로직.
+"""
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+DEP_METHOD_NAMES = {"SL": "정액법", "DB": "정률법", "SYD": "연수합계법", "UOP": "생산량비례법"}
+INV_METHOD_NAMES = {"FIFO": "선입선출법", "LIFO": "후입선출법", "WAVG": "총평균법", "MAVG": "이동평균법"}
+PAYMENT_TIMING = {"end": "기말 지급 (정상연금)", "due": "기초 지급 (선급연금)"}
+
+
+# =========================================================
+# 1. 벡터화 계산 엔진 (NumPy)
+# =========================================================
+def depreciation_schedules(cost, residual, life, methods=("SL", "DB", "SYD"), rate=None, units=None, total_units=None):
+    """
+    같은 자산에 대해 여러 상각방법의 기말장부금액 경로를 한 번에 계산한다.
+    리턴: {method: ndarray(길이 life+1, 0년차=cost ~ life년차=residual)}
+
+    - DB  : rate 미지정 시 1 - (residual/cost)^(1/life). 잔존가치 아래로 내려가지 않도록 clamp,
+            마지막 해에 잔액을 정리 (기존 Simulators.depreciation 과 동일한 규칙)
+    - UOP : units = 연도별 생산량 (길이 life), total_units 미지정 시 합계 사용
+    모든 방법은 life년 후 잔존가치로 정확히 수렴해야 하며, 아니면 ValueError.
+    """
+    life = int(life)
+    if life < 1:
+        raise ValueError("내용연수는 1년 이상이어야 합니다.")
+    base = cost - residual
+    t = np.arange(life + 1)  # 0 ~ life
+    paths = {}
+    for method in methods:
+        if method == "SL":
+            bv = cost - base * t / life
+        elif method == "SYD":
+            syd = life * (life + 1) / 2
+            # 누적 상각비율 = sum_{k=1..t} (life-k+1)/syd
+            cum = (t * life - t * (t - 1) / 2) / syd
+            bv = cost - base * cum
+        elif method == "DB":
+            r = rate if rate else (1 - (residual / cost) ** (1 / life) if cost > 0 else 0.0)
+            bv = np.maximum(cost * (1 - r) ** t, residual)
+            bv[-1] = residual  # 마지막 해 잔액 정리
+        elif method == "UOP":
+            if units is None:
+                raise ValueError("생산량비례법에는 연도별 생산량(units)이 필요합니다.")
+            u = np.asarray(units, dtype=float)
+            if u.shape != (life,):
+                raise ValueError(f"units 길이({u.size})가 내용연수({life})와 다릅니다.")
+            total = total_units if total_units else u.sum()
+            if total <= 0:
+                raise ValueError("총 생산량은 0보다 커야 합니다.")
+            bv = cost - base * np.concatenate(([0.0], np.cumsum(u))) / total
+        else:
+            raise ValueError(f"알 수 없는 상각방법: {method}")
+        paths[method] = np.asarray(bv, dtype=float)
+
+    # 수렴 검증: 부동소수 오차 범위 안이면 잔존가치로 딱 맞추고, 벗어나면 에러
+    tol = 1e-9 * max(abs(cost), 1.0)
+    for method, bv in paths.items():
+        if abs(bv[-1] - residual) > tol:
+            raise ValueError(f"{DEP_METHOD_NAMES.get(method, method)}: 기말장부 {bv[-1]:,.0f} ≠ 잔존가치 {residual:,.0f}")
+        bv[-1] = residual
+    return paths
+
+
+def depreciation_path_grid(cost, residual, life, method, rate=None):
+    """
+    depreciation_schedules 의 SL / SYD / DB 규칙을 파라미터 배열에 대해 한 번에 계산 (민감도 분석용)
+    cost, residual, rate : 스칼라 또는 (V,) 배열. 리턴: 기말장부 (V, life+1)
+    """
+    life = int(life)
+    if life < 1:
+        raise ValueError("내용연수는 1년 이상이어야 합니다.")
+    cost, residual = (np.atleast_1d(np.asarray(a, dtype=float))[:, None] for a in (cost, residual))
+    t = np.arange(life + 1)
+    if method == "SL":
+        bv = cost - (cost - residual) * t / life
+    elif method == "SYD":
+        bv = cost - (cost - residual) * (t * life - t * (t - 1) / 2) / (life * (life + 1) / 2)
+    elif method == "DB":
+        if rate is None:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                r = np.where(cost > 0, 1 - (residual / cost) ** (1 / life), 0.0)
+        else:
+            r = np.atleast_1d(np.asarray(rate, dtype=float))[:, None]
+        bv = np.maximum(cost * (1 - r) ** t, residual)
+        bv[:, -1] = residual[:, 0]  # 마지막 해 잔액 정리
+    else:
+        raise ValueError(f"민감도 분석을 지원하지 않는 상각방법: {method}")
+    return bv
+
+
+def inventory_costing(transactions, method="FIFO"):
+    """
+    매입/판매가 섞인 거래 흐름을 순서대로 처리해서 거래별 매출원가와 재고를 계산한다.
+    transactions: [{"type": "buy", "qty": 100, "price": 100}, {"type": "sell", "qty": 50}, ...]
+                  (기초재고는 첫 번째 buy 로 넣는다)
+    method: FIFO / LIFO (계속기록 원가층), WAVG (총평균, 기간 말 단가), MAVG (이동평균)
+
+    원가층은 deque([lot_id, 남은수량, 단가]) 로 관리 -> O(거래 수 + 소진된 원가층 수)
+    리턴: (ledger, layers)
+      ledger : 컬럼별 리스트 dict (구분, 수량, 단가, 매출원가, 재고수량, 재고금액) - DataFrame 변환용
+      layers : 기말 원가층 [[lot_id, 수량, 단가], ...] (평균법은 평균단가 1개 층)
+    """
+    if method not in INV_METHOD_NAMES:
+        raise ValueError(f"알 수 없는 재고자산 원가흐름: {method}")
+
+    layers = deque()
+    kinds, qtys, prices, cogs_col, onhand_col, value_col = [], [], [], [], [], []
+    on_hand = 0
+    value = 0
+    lot_id = 0
+    total_buy_qty = 0
+    total_buy_cost = 0
+
+    for tx in transactions:
+        kind = tx["type"]
+        qty = tx["qty"]
+        if qty < 0:
+            raise ValueError(f"수량은 음수일 수 없습니다: {tx}")
+
+        if kind == "buy":
+            price = tx.get("price")
+            if price is None or price != price:  # None / NaN
+                raise ValueError(f"매입 거래에는 단가가 필요합니다: {tx}")
+            cost = qty * price
+            if method in ("FIFO", "LIFO"):
+                layers.append([lot_id, qty, price])
+            lot_id += 1
+            on_hand += qty
+            value += cost
+            total_buy_qty += qty
+            total_buy_cost += cost
+            cogs = 0
+        elif kind == "sell":
+            if qty > on_hand:
+                raise ValueError(f"재고 부족: 판매 {qty:,}개 > 보유 {on_hand:,}개")
+            if method in ("FIFO", "LIFO"):
+                cogs = 0
+                remaining = qty
+                take_left = method == "FIFO"
+                while remaining > 0:
+                    layer = layers[0] if take_left else layers[-1]
+                    used = min(remaining, layer[1])
+                    cogs += used * layer[2]
+                    layer[1] -= used
+                    remaining -= used
+                    if layer[1] == 0:
+                        layers.popleft() if take_left else layers.pop()
+                price = cogs / qty if qty else 0
+            elif method == "MAVG":
+                price = value / on_hand if on_hand else 0
+                cogs = qty * price
+            else:  # WAVG: 단가는 기간 말에 확정 -> 아래에서 일괄 계산
+                price = cogs = 0
+            on_hand -= qty
+            value -= cogs
+        else:
+            raise ValueError(f"거래 구분은 buy/sell 이어야 합니다: {tx}")
+
+        kinds.append(kind); qtys.append(qty); prices.append(price)
+        cogs_col.append(cogs); onhand_col.append(on_hand); value_col.append(value)
+
+    if method == "WAVG":
+        avg = total_buy_cost / total_buy_qty if total_buy_qty else 0
+        for i, kind in enumerate(kinds):
+            if kind == "sell":
+                prices[i] = avg
+                cogs_col[i] = qtys[i] * avg
+            value_col[i] = onhand_col[i] * avg
+        value = on_hand * avg
+    if method in ("WAVG", "MAVG"):
+        layers = deque([[0, on_hand, value / on_hand if on_hand else 0]] if on_hand else [])
+
+    ledger = {"구분": kinds, "수량": qtys, "단가": prices, "매출원가": cogs_col, "재고수량": onhand_col, "재고금액": value_col}
+    return ledger, [list(layer) for layer in layers]
+
+
+def equity_method_paths(cost, share_rate, net_income, dividends):
+    """
+    지분법 다기간 장부금액 경로 (반복문 없이 누적합으로 계산)
+    net_income, dividends : 연도별 피투자회사 순이익/배당 (T,) 또는 시나리오별 (S, T)
+    share_rate : 스칼라 / 연도별 지분율 (T,) / 시나리오 격자 (S, T) 또는 (S, 1)
+    리턴: {"지분법이익": 인식액 (..., T), "배당금수령": (..., T), "기말장부": (..., T+1, 0번째 = 취득원가)}
+
+    장부금액이 0이 되면 이후 손실은 인식하지 않고, 이후 이익은 미인식 손실을 먼저
+    상계한 뒤에 인식한다 -> 누적 경로에 0 하한을 씌운 것과 같다.
+    """
+    ni = np.asarray(net_income, dtype=float)
+    dv = np.asarray(dividends, dtype=float)
+    if ni.ndim not in (1, 2) or dv.ndim not in (1, 2) or ni.shape[-1] != dv.shape[-1]:
+        raise ValueError("순이익과 배당은 같은 길이의 연도별 배열이어야 합니다.")
+    share = np.asarray(share_rate, dtype=float)
+    if share.ndim == 1 and share.shape[-1] != ni.shape[-1]:
+        raise ValueError(f"연도별 지분율 길이({share.size})가 기간 수({ni.shape[-1]})와 다릅니다. 시나리오는 (S, 1) 형태로 주세요.")
+    if np.any((share < 0) | (share > 1)):
+        raise ValueError("지분율은 0~1 사이여야 합니다.")
+
+    income = share * ni                      # broadcasting: (T,) / (S, T)
+    div_received = share * dv
+    income, div_received = np.broadcast_arrays(income, div_received)
+    raw = cost + np.cumsum(income - div_received, axis=-1)
+    opening = np.full(raw.shape[:-1] + (1,), float(cost))
+    book = np.concatenate([opening, np.maximum(raw, 0.0)], axis=-1)
+    recognized = np.diff(book, axis=-1) + div_received   # 0 하한 반영 후 실제 인식한 지분법손익
+    return {"지분법이익": recognized, "배당금수령": div_received, "기말장부": book}
+
+
+YIELD_TOL = 1e-10        # 이자율 허용오차 (구간 폭)
+YIELD_MAX_ITER = 200     # 이분법만으로도 충분히 수렴하는 상한
+YIELD_BRACKET = (-0.99, 10.0)
+YIELD_VERIFY_TOL = 1e-4  # sim_config 검증: 역산한 이자율과 mrate 차이 허용 (0.01%p)
+
+# 민감도 분석(sweep)으로 훑을 수 있는 파라미터: 시뮬레이터 종류 -> {파라미터: 표시 이름}
+SWEEP_PARAMS = {
+    "bond": {"mrate": "시장이자율", "crate": "표시이자율"},
+    "depreciation": {"residual": "잔존가치", "rate": "상각률(정률법)"},
+    "entity_equity": {"share": "지분율", "net_income": "순이익(연)"},
+}
+
+
+def sweep_kind(sim_type):
+    """챕터 simulator_type -> SWEEP_PARAMS 키 (민감도 분석 미지원이면 None)"""
+    return next((kind for kind in SWEEP_PARAMS if kind in (sim_type or "")), None)
+
+
+# =========================================================
+# 1-1. 현재가치 / 유효이자율 상각 공통 엔진 (사채, 리스, 장기할부)
+# =========================================================
+def _discount(rate, periods):
+    """(v_n, 1 - v_n). 1 - v_n 을 expm1 으로 바로 구해서 이자율이 0 에 가까워도 자릿수를 잃지 않는다"""
+    log_v_n = -periods * np.log1p(rate)
+    return np.exp(log_v_n), -np.expm1(log_v_n)
+
+
+def _annuity_factor(rate, periods, one_minus_v_n, due):
+    zero = rate == 0
+    factor = np.where(zero, periods, one_minus_v_n / np.where(zero, 1.0, rate))
+    return factor * (1 + rate) if due else factor
+
+
+def annuity_factors(rate, periods, due=False):
+    """
+    1원씩 periods 회 받는 연금의 현재가치계수 (스칼라/배열 broadcasting)
+    due=False: 정상연금 (기말 지급), due=True: 선급연금 (기초 지급) = 정상연금 × (1 + rate)
+    """
+    rate, periods = np.asarray(rate, dtype=float), np.asarray(periods, dtype=float)
+    return _annuity_factor(rate, periods, _discount(rate, periods)[1], due)
+
+
+def annuity_pv(payment, rate, periods, due=False, residual=0.0):
+    """정기 지급액 payment 의 연금 현재가치 + 마지막 시점(periods)에 받는 residual 의 현재가치"""
+    rate, periods = np.asarray(rate, dtype=float), np.asarray(periods, dtype=float)
+    v_n, one_minus = _discount(rate, periods)   # 연금계수와 잔존가치 할인에 같이 씀
+    return np.asarray(payment, dtype=float) * _annuity_factor(rate, periods, one_minus, due) + np.asarray(residual, dtype=float) * v_n
+
+
+def annuity_payments(pv, rate, periods, due=False, residual=0.0):
+    """annuity_pv 의 역: 현재가치 pv 를 회수하는 정기 지급액 (리스제공자의 리스료 산정 등)"""
+    rate, periods = np.asarray(rate, dtype=float), np.asarray(periods, dtype=float)
+    v_n, one_minus = _discount(rate, periods)
+    return (np.asarray(pv, dtype=float) - np.asarray(residual, dtype=float) * v_n) / _annuity_factor(rate, periods, one_minus, due)
+
+
+def amortization_schedules(payment, rate, periods, due=False, residual=0.0):
+    """
+    정기 지급 + 마지막 시점 residual(보증잔존가치, 액면 등) 현금흐름의 유효이자율 상각표 (여러 건을 한 번에)
+    인자는 스칼라/배열 (broadcasting, 모양 S). 시점 t = 0..N (N = 최대 기간) 축을 마지막에 붙인다.
+      할인계수 v_t = Π(1/(1+r)) 누적곱, 현재가치 = Σ CF_t v_t
+      t 시점 지급 직후 장부금액 B_t = (t 이후 현금흐름의 현재가치 합) / v_t  -> 역방향 누적합 한 번
+      t 기 이자 = B_{t-1} × r, 원금 상환 = B_{t-1} - B_t  (기간이 끝난 뒤 t > periods 는 모두 0)
+    리턴 dict: 현재가치 (S), 현금흐름 / 할인계수 / 이자 / 원금상환 / 장부금액 (S, N+1)
+    """
+    payment, rate, periods, residual = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (payment, rate, periods, residual)))
+    if (periods < 1).any() or (periods != np.round(periods)).any():
+        raise ValueError("기간은 1 이상의 정수여야 합니다.")
+    if (rate <= -1).any():
+        raise ValueError("이자율은 -100% 보다 커야 합니다.")
+    n = periods[..., None]
+    t = np.arange(int(periods.max()) + 1)
+    paid = (t < n) if due else ((t >= 1) & (t <= n))
+    cash = payment[..., None] * paid + residual[..., None] * (t == n)
+    step = np.broadcast_to(1 / (1 + rate[..., None]), cash.shape).copy()
+    step[..., 0] = 1.0
+    disc = np.cumprod(step, axis=-1)
+    tail = np.cumsum((cash * disc)[..., ::-1], axis=-1)[..., ::-1]   # t 이후(포함) 현금흐름의 현재가치
+    after = np.zeros_like(tail)
+    after[..., :-1] = tail[..., 1:]
+    book = np.where(t <= n, after / disc, 0.0)
+    interest = np.zeros_like(book)
+    interest[..., 1:] = book[..., :-1] * rate[..., None] * (t[1:] <= n)
+    principal = cash - interest
+    return {"현재가치": tail[..., 0], "현금흐름": cash, "할인계수": disc, "이자": interest, "원금상환": principal, "장부금액": book}
+
+
+def bond_prices(face, crate, mrate, periods):
+    """
+    사채 발행가(현재가치) 배열. 인자는 스칼라/배열 모두 가능 (broadcasting)
+    연 1회 표시이자 face*crate (정상연금), 만기 periods 에 액면 상환 (residual)
+    """
+    face = np.asarray(face, dtype=float)
+    return annuity_pv(face * np.asarray(crate, dtype=float), mrate, periods, residual=face)
+
+
+def _bond_price_slope(face, crate, mrate, periods):
+    """dP/dr (뉴턴 스텝용). 현금흐름이 양수면 항상 음수"""
+    v = 1 / (1 + mrate)
+    v_n = v ** periods
+    small = np.abs(mrate) < 1e-8
+    safe = np.where(small, 1.0, mrate)
+    d_annuity = np.where(small, -periods * (periods + 1) / 2, periods * v_n * v / safe - (1 - v_n) / safe ** 2)
+    return face * crate * d_annuity - periods * face * v_n * v
+
+
+def bond_yields(price, face, crate, periods, tol=YIELD_TOL, max_iter=YIELD_MAX_ITER):
+    """
+    발행가 -> 유효이자율 (여러 사채를 배열로 한 번에). 리턴: (rate, converged) 배열
+    가격은 이자율에 대해 단조감소·볼록이므로 해를 감싸는 [lo, hi] 구간을 유지하면서 뉴턴 스텝을 쓰고,
+    스텝이 구간을 벗어나면 이분법으로 대신한다. 구간은 매 반복 줄어들고, 이자율 변화 또는 구간 폭이
+    tol 보다 작아지면 수렴으로 본다 (max_iter 안에 못 끝난 원소는 converged=False, rate=NaN).
+    해가 YIELD_BRACKET 밖이거나 입력이 잘못된 원소(발행가/액면/기간 <= 0, 표시이자율 < 0)는 NaN.
+    """
+    price, face, crate, periods = np.broadcast_arrays(*(np.atleast_1d(np.asarray(a, dtype=float)) for a in (price, face, crate, periods)))
+    lo = np.full(price.shape, YIELD_BRACKET[0])
+    hi = np.full(price.shape, YIELD_BRACKET[1])
+    ok = (price > 0) & (face > 0) & (crate >= 0) & (periods >= 1)
+    ok &= (bond_prices(face, crate, lo, periods) >= price) & (bond_prices(face, crate, hi, periods) <= price)
+    rate = np.where(ok, np.clip(crate, lo, hi), np.nan)
+    active = ok.copy()
+    for _ in range(max_iter):
+        if not active.any(): break
+        r, f, c, n, p = rate[active], face[active], crate[active], periods[active], price[active]
+        err = bond_prices(f, c, r, n) - p
+        # 가격이 목표보다 높으면 이자율이 더 높아야 함
+        lo[active] = np.where(err > 0, r, lo[active])
+        hi[active] = np.where(err <= 0, r, hi[active])
+        slope = _bond_price_slope(f, c, r, n)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = r - err / slope
+        a_lo, a_hi = lo[active], hi[active]
+        bisect = ~np.isfinite(step) | (step < a_lo) | (step > a_hi)
+        nxt = np.where(bisect, (a_lo + a_hi) / 2, step)
+        done = (np.abs(nxt - r) < tol) | (a_hi - a_lo < tol) | (np.abs(err) < tol * p)
+        rate[active] = nxt
+        active[np.flatnonzero(active)[done]] = False
+    converged = ok & ~active
+    rate[ok & active] = np.nan
+    return rate, converged
+
+
+# =========================================================
+# 2. Simulators (화면용 표/리포트)
+# =========================================================
+class Simulators:
+    @staticmethod
+    def bond_basic(face, crate, mrate, periods, redeem_stats=None):
+        """
+        redeem_stats = {'period': 2, 'amount': 98000} (선택사항)
+        """
+        cash_flow = face * crate
+        pv_principal = face / ((1 + mrate) ** periods)
+        pv_interest = sum([cash_flow / ((1 + mrate) ** t) for t in range(1, periods + 1)])
+        price = pv_principal + pv_interest
+        
+        data = []
+        book_value = price
+        data.append({"기간": 0, "유효이자": "-", "표시이자": "-", "상각액": "-", "장부금액": f"{int(book_value):,}"})
+        
+        # 상각표 작성
+        bv_dict = {0: book_value} # 기간별 장부금액 저장
+        
+        for t in range(1, periods + 1):
+            ie = book_value * mrate
+            cp = face * crate
+            am = ie - cp
+            book_value += am
+            bv_dict[t] = book_value
+            data.append({
+                "기간": t,
+                "유효이자": f"{int(ie):,}", "표시이자": f"{int(cp):,}",
+                "상각액": f"{int(am):,}", "장부금액": f"{int(book_value):,}"
+            })
+            
+        # [Insight 생성]
+        diff_type = "할인" if mrate > crate else ("할증" if mrate < crate else "액면")
+        
+        # (A) 기본 리포트
+        insight = f"""
+        **📊 분석 리포트**
+        1. **발행 형태**: 시장이자율({mrate*100}%)이 표시이자율({crate*100}%)보다 {('높아' if mrate > crate else '낮아')} **{diff_type}발행**되었습니다.
+        2. **장부금액 추세**: 만기({periods}년)로 갈수록 장부금액이 **{int(price):,}원**에서 **{int(face):,}원**을 향해 {('증가' if diff_type=='할인' else '감소')}합니다.
+        """
+
+        # (B) 조기상환 리포트 (추가된 부분 ✨)
+        if redeem_stats:
+            r_period = redeem_stats['period']
+            r_amt = redeem_stats['amount']
+            r_bv = bv_dict.get(r_period, 0)
+            
+            gain_loss = r_bv - r_amt
+            gl_text = "상환이익(Gain)" if gain_loss >= 0 else "상환손실(Loss)"
+            
+            insight += f"""
+            ---
+            **💰 조기상환 손익 분석 ({r_period}년 말 상환 가정)**
+            1. **장부상 빚**: {r_period}년 말 시점의 장부금액은 **{int(r_bv):,}원**입니다.
+            2. **실제 갚은 돈**: **{int(r_amt):,}원**을 지급하고 빚을 청산했습니다.
+            3. **결론**: 장부보다 {('적게' if gain_loss > 0 else '많이')} 주었으므로, **{abs(int(gain_loss)):,}원의 {gl_text}**이 발생합니다.
+            """
+            
+        return int(price), pd.DataFrame(data).set_index("기간"), insight
+
+    @staticmethod
+    def bond_yield(price, face, crate, periods):
+        """
+        발행가 -> 유효이자율 역산 후 그 이자율로 상각표 작성
+        리턴: (유효이자율, DataFrame, insight). 해가 없으면 ValueError
+        """
+        rate, converged = bond_yields(price, face, crate, periods)
+        if not converged[0]:
+            raise ValueError(f"발행가 {int(price):,}원에 맞는 유효이자율을 찾을 수 없습니다. (액면·표시이자율·기간을 확인하세요)")
+        mrate = float(rate[0])
+        _, df, _ = Simulators.bond_basic(face, crate, mrate, periods)
+        diff_type = "할인" if price < face else ("할증" if price > face else "액면")
+        insight = f"""
+        **📊 분석 리포트 (유효이자율 역산)**
+        1. **유효이자율**: 발행가 **{int(price):,}원**을 만드는 시장이자율은 **{mrate * 100:.4f}%** 입니다.
+        2. **발행 형태**: 발행가가 액면({int(face):,}원)보다 {('낮아' if price < face else '높아') if diff_type != '액면' else '같아'} **{diff_type}발행**이며, 유효이자율은 표시이자율({crate * 100:g}%)보다 {('높습니다' if mrate > crate else '낮습니다') if diff_type != '액면' else '같습니다'}.
+        3. **검산**: 아래 상각표는 이 이자율로 만든 것이며, {periods}년 후 장부금액이 액면으로 수렴합니다.
+        """
+        return mrate, df, insight
+
+    @staticmethod
+    def bond_verify_configs(questions, tol=YIELD_VERIFY_TOL):
+        """
+        문제은행의 bond_basic sim_config 를 한 번에 검산한다.
+        params 에 발행가(price / issue_price)가 있는 설정만 그 값으로 유효이자율을 역산해서 mrate 와 비교한다.
+        발행가가 없는 설정은 검산할 근거가 없으므로 상태 '발행가 없음' 으로만 표시한다.
+        df 컬럼: 문제ID, 액면, 표시이자율, 시장이자율, 기간, 발행가, 역산이자율, 오차, 상태(정상/불일치/오류/발행가 없음)
+        """
+        rows = []
+        for q in questions:
+            conf = q.get('sim_config')
+            if not isinstance(conf, dict) or conf.get('type') != "bond_basic": continue
+            prm = conf.get('params') or {}
+            rows.append((q.get('question_id'), prm.get('face', 100000), prm.get('crate', 0.05), prm.get('mrate', 0.08),
+                         prm.get('periods', 3), prm.get('price', prm.get('issue_price'))))
+        cols = ["문제ID", "액면", "표시이자율", "시장이자율", "기간", "발행가"]
+        df = pd.DataFrame(rows, columns=cols)
+        if df.empty:
+            return df.assign(역산이자율=[], 오차=[], 상태=[])
+        num = df[cols[1:]].apply(pd.to_numeric, errors="coerce")
+        given = num["발행가"].notna().to_numpy()
+        df["발행가"] = num["발행가"]
+        rate, converged = bond_yields(num["발행가"].fillna(0).to_numpy(dtype=float), num["액면"], num["표시이자율"], num["기간"])
+        rate = np.where(given, rate, np.nan)
+        df["역산이자율"] = rate
+        df["오차"] = np.abs(rate - num["시장이자율"].to_numpy())
+        df["상태"] = np.select([~given, ~converged | np.isnan(df["오차"]), df["오차"] > tol], ["발행가 없음", "오류", "불일치"], "정상")
+        return df
+
+    @staticmethod
+    def depreciation(cost, residual, life, method, rate=None, units=None):
+        life = int(life)
+        bv = depreciation_schedules(cost, residual, life, (method,), rate, units)[method]
+        dep = bv[:-1] - bv[1:]
+
+        data = [{"연도": 0, "기초장부": "-", "상각비": "-", "기말장부": f"{int(cost):,}"}]
+        for t in range(1, life + 1):
+            data.append({
+                "연도": t, "기초장부": f"{int(bv[t-1]):,}",
+                "상각비": f"{int(dep[t-1]):,}", "기말장부": f"{int(bv[t]):,}"
+            })
+        book_value = bv[-1]
+            
+        # [Insight 생성]
+        method_map = DEP_METHOD_NAMES
+        trend = "매년 일정합니다" if method == "SL" else "초기에 크고 점차 감소합니다 (가속상각)"
+        insight = f"""
+        **📊 분석 리포트**
+        1. **상각 방법**: **{method_map.get(method, method)}**을 적용했습니다.
+        2. **비용 추세**: 감가상각비가 **{trend}**.
+        3. **최종 잔액**: {life}년 후 장부금액(**{int(book_value):,}원**)은 잔존가치(**{int(residual):,}원**)와 정확히 일치합니다.
+        """
+        return pd.DataFrame(data).set_index("연도"), insight
+
+    @staticmethod
+    def depreciation_compare(cost, residual, life, rate=None, units=None, methods=None):
+        """
+        여러 상각방법을 한 번에 계산해서 겹쳐 그리기 좋은 long-format 표로 리턴
+        df 컬럼: 연도, 방법, 상각비, 기말장부 (모두 숫자, 0년차 상각비 = 0)
+        """
+        life = int(life)
+        if methods is None:
+            methods = ("SL", "DB", "SYD") + (("UOP",) if units is not None else ())
+        paths = depreciation_schedules(cost, residual, life, methods, rate, units)
+
+        years = np.arange(life + 1)
+        bv = np.vstack([paths[m] for m in methods])                    # (방법 수, life+1)
+        dep = np.hstack([np.zeros((len(methods), 1)), -np.diff(bv, axis=1)])
+        df = pd.DataFrame({
+            "연도": np.tile(years, len(methods)),
+            "방법": np.repeat([DEP_METHOD_NAMES.get(m, m) for m in methods], life + 1),
+            "상각비": dep.ravel(),
+            "기말장부": bv.ravel(),
+        })
+
+        # [Insight 생성]
+        first_year = {DEP_METHOD_NAMES.get(m, m): dep[i, 1] for i, m in enumerate(methods)}
+        fastest = max(first_year, key=first_year.get)
+        slowest = min(first_year, key=first_year.get)
+        insight = f"""
+        **📊 분석 리포트 (상각방법 비교)**
+        1. **1차년도 비용**: **{fastest}**이 {int(first_year[fastest]):,}원으로 가장 크고, **{slowest}**이 {int(first_year[slowest]):,}원으로 가장 작습니다.
+        2. **총 상각액**: 방법과 관계없이 {life}년간 총 **{int(cost - residual):,}원**(원가 - 잔존가치)을 비용으로 인식합니다.
+        3. **최종 잔액**: 모든 방법이 {life}년 후 잔존가치(**{int(residual):,}원**)로 정확히 수렴합니다. 차이는 '언제' 비용을 인식하느냐뿐입니다.
+        """
+        return df, insight
+
+    @staticmethod
+    def inventory_fifo(base_qty, base_price, buy_qty, buy_price, sell_qty):
+        # 기초 1층 + 매입 1층 + 판매 1건짜리 거래 흐름 (판매량은 보유량까지만)
+        ledger, layers = inventory_costing([
+            {"type": "buy", "qty": base_qty, "price": base_price},
+            {"type": "buy", "qty": buy_qty, "price": buy_price},
+            {"type": "sell", "qty": min(sell_qty, base_qty + buy_qty)},
+        ], "FIFO")
+        cogs = ledger["매출원가"][-1]
+        ending = ledger["재고금액"][-1]
+        remaining = {lot: qty for lot, qty, _ in layers}
+        rem_base, rem_buy = remaining.get(0, 0), remaining.get(1, 0)
+        
+        # [Insight 생성]
+        price_trend = "상승" if buy_price > base_price else "하락"
+        profit_effect = "과대계상(이익 ↑)" if price_trend == "상승" else "과소계상(이익 ↓)"
+        insight = f"""
+        **📊 분석 리포트 (FIFO 가정)**
+        1. **물가 추세**: 단가가 {base_price}원에서 {buy_price}원으로 **{price_trend}**했습니다.
+        2. **손익 효과**: 선입선출법은 옛날 싼 재고를 먼저 비용(원가) 처리하므로, 현재 시점에는 이익이 **{profit_effect}**되는 경향이 있습니다.
+        3. **재고 상태**: 기말재고({int(ending):,}원)는 가장 **최근에 구입한 단가**로 구성되어 현행가치에 가깝습니다.
+        """
+        return cogs, ending, rem_base, rem_buy, insight
+
+    @staticmethod
+    def inventory(transactions, method="FIFO"):
+        """
+        임의 길이의 매입/판매 거래 흐름 시뮬레이션
+        리턴: (매출원가 합계, 기말재고, 거래별 원장 DataFrame, insight)
+        """
+        ledger, layers = inventory_costing(transactions, method)
+        df = pd.DataFrame(ledger)
+        df.index = pd.RangeIndex(1, len(df) + 1, name="번호")
+        df["구분"] = df["구분"].map({"buy": "매입", "sell": "판매"})
+        cogs = float(df["매출원가"].sum())
+        ending = float(df["재고금액"].iloc[-1]) if len(df) else 0.0
+
+        # [Insight 생성]
+        name = INV_METHOD_NAMES[method]
+        sold = int(df.loc[df["구분"] == "판매", "수량"].sum())
+        avg_cost = cogs / sold if sold else 0
+        insight = f"""
+        **📊 분석 리포트 ({name})**
+        1. **거래 규모**: 총 {len(df):,}건의 거래에서 **{sold:,}개**를 판매했고, 매출원가는 **{int(cogs):,}원**(개당 평균 {avg_cost:,.1f}원)입니다.
+        2. **기말재고**: {int(df['재고수량'].iloc[-1]) if len(df) else 0:,}개, **{int(ending):,}원**이 {len(layers)}개의 원가층으로 남아 있습니다.
+        3. **검증**: 매출원가 + 기말재고 = 판매가능재고 원가 ({int(cogs + ending):,}원)로 항상 일치합니다.
+        """
+        return cogs, ending, df, insight
+
+    @staticmethod
+    def entity_equity(cost, share_rate, net_income, dividends):
+        equity_income = net_income * share_rate
+        div_received = dividends * share_rate
+        ending_bv = cost + equity_income - div_received
+        
+        data = [
+            {"구분": "1. 기초 취득원가", "금액": cost, "효과": "자산(+)"},
+            {"구분": "2. 지분법이익(NI)", "금액": equity_income, "효과": "자산 증가(↑)"},
+            {"구분": "3. 배당금수령(Div)", "금액": div_received, "효과": "자산 감소(↓)"},
+            {"구분": "4. 기말 장부금액", "금액": ending_bv, "효과": "최종 잔액"}
+        ]
+        
+        # [Insight 생성]
+        insight = f"""
+        **📊 분석 리포트**
+        1. **성장의 공유**: 피투자회사가 번 돈({int(net_income):,}) 중 내 몫(**{int(equity_income):,}**)만큼 내 자산도 늘어났습니다.
+        2. **배당의 의미**: 배당금(**{int(div_received):,}**)은 수익이 아니라, 투자했던 돈을 일부 **회수(자산 감소)**한 것으로 처리됩니다.
+        3. **최종 결과**: 기초보다 장부금액이 **{int(ending_bv - cost):,}원** 변동했습니다.
+        """
+        return int(ending_bv), pd.DataFrame(data), insight
+
+    @staticmethod
+    def entity_equity_multi(cost, share_rate, net_incomes, dividends):
+        """
+        다기간 지분법: 연도별 순이익/배당(/지분율) 배열을 받아 장부금액 시계열을 만든다.
+        리턴: (기말 장부금액, 연도별 DataFrame, insight)
+        """
+        paths = equity_method_paths(cost, share_rate, net_incomes, dividends)
+        years = len(paths["지분법이익"])
+        book = paths["기말장부"]
+        df = pd.DataFrame({
+            "기초장부": book[:-1],
+            "지분법이익": paths["지분법이익"],
+            "배당금수령": paths["배당금수령"],
+            "기말장부": book[1:],
+        }, index=pd.RangeIndex(1, years + 1, name="연도"))
+
+        # [Insight 생성]
+        total_income = df["지분법이익"].sum()
+        total_div = df["배당금수령"].sum()
+        floor_note = " (장부금액이 0에 도달한 해가 있어 초과 손실은 인식하지 않았습니다)" if (book[1:] == 0).any() else ""
+        insight = f"""
+        **📊 분석 리포트 ({years}개 연도)**
+        1. **누적 지분법이익**: {years}년간 내 몫의 순이익 **{int(total_income):,}원**만큼 장부금액이 늘었습니다.
+        2. **누적 배당 회수**: 받은 배당 **{int(total_div):,}원**은 투자금 회수이므로 장부금액에서 차감됩니다.
+        3. **최종 결과**: 장부금액이 **{int(cost):,}원 → {int(book[-1]):,}원**으로 변동했습니다{floor_note}.
+        """
+        return int(book[-1]), df, insight
+
+    @staticmethod
+    def entity_equity_scenarios(cost, share_rates, net_incomes, dividends):
+        """
+        지분율 시나리오(예: 0.2~0.5)를 한 번에 계산 -> 연도 × 시나리오 장부금액 표
+        """
+        shares = np.asarray(share_rates, dtype=float).reshape(-1, 1)   # (S, 1)
+        book = equity_method_paths(cost, shares, net_incomes, dividends)["기말장부"]
+        return pd.DataFrame(
+            book.T,
+            index=pd.RangeIndex(0, book.shape[1], name="연도"),
+            columns=[f"지분 {s * 100:g}%" for s in shares.ravel()],
+        )
+
+    @staticmethod
+    def _schedule_frame(sched, columns):
+        """amortization_schedules 결과(한 건) -> 기간별 DataFrame (기간 0 = 최초 인식 시점)"""
+        data = {name: sched[key] for name, key in columns.items()}
+        return pd.DataFrame(data, index=pd.RangeIndex(0, len(sched["장부금액"]), name="기간"))
+
+    @staticmethod
+    def lease(payment, rate, periods, due=False, residual_guarantee=0):
+        """
+        리스이용자: 리스료(정상/선급연금) + 보증잔존가치 지급예상액의 현재가치 = 리스부채 = 사용권자산
+        사용권자산은 리스기간 동안 정액법으로 상각 (잔존가치 0)
+        리턴: (리스부채, 기간별 DataFrame, insight)
+        """
+        sched = amortization_schedules(payment, rate, periods, due, residual_guarantee)
+        liability = float(sched["현재가치"])
+        df = Simulators._schedule_frame(sched, {"지급액": "현금흐름", "이자비용": "이자", "부채감소": "원금상환", "기말리스부채": "장부금액"})
+        df["감가상각비"] = np.where(df.index >= 1, liability / periods, 0.0)
+        df["기말사용권자산"] = liability - df["감가상각비"].cumsum()
+
+        # [Insight 생성]
+        pv_residual = residual_guarantee * (1 + rate) ** -periods
+        total_cash = df["지급액"].sum()
+        first = df.loc[1]
+        insight = f"""
+        **📊 분석 리포트 (리스이용자)**
+        1. **최초 인식**: 리스료 {int(payment):,}원 × {periods}회({'기초' if due else '기말'} 지급)의 현재가치 **{int(liability - pv_residual):,}원**{f" + 보증잔존가치 {int(residual_guarantee):,}원의 현재가치 **{int(pv_residual):,}원**" if residual_guarantee else ""} = 리스부채 **{int(liability):,}원** (사용권자산도 같은 금액).
+        2. **총 이자비용**: 실제 지급액 합계 {int(total_cash):,}원과 리스부채의 차이 **{int(total_cash - liability):,}원**이 리스기간에 걸쳐 유효이자율({rate * 100:g}%)로 인식됩니다.
+        3. **1차년도 비용**: 이자비용 {int(first['이자비용']):,}원 + 감가상각비 {int(first['감가상각비']):,}원 = **{int(first['이자비용'] + first['감가상각비']):,}원**{' (첫 리스료는 계약일에 지급해서 1차년도 이자가 그만큼 작습니다)' if due else ''}.
+        """
+        return int(liability), df, insight
+
+    @staticmethod
+    def installment_sale(installment, rate, periods, due=False, down_payment=0, cost=None):
+        """
+        장기할부판매(판매자): 매출 = 계약금 + 할부금 현재가치, 명목금액과의 차이는 유효이자율법으로 이자수익
+        cost(매출원가)를 주면 판매시점 매출총이익까지. 리턴: (매출액, 기간별 DataFrame, insight)
+        """
+        sched = amortization_schedules(installment, rate, periods, due)
+        receivable = float(sched["현재가치"])
+        revenue = receivable + down_payment
+        df = Simulators._schedule_frame(sched, {"회수액": "현금흐름", "이자수익": "이자", "채권회수": "원금상환", "기말매출채권": "장부금액"})
+
+        # [Insight 생성]
+        nominal = installment * periods + down_payment
+        gp_line = f"\n        4. **매출총이익**: 매출 {int(revenue):,}원 - 매출원가 {int(cost):,}원 = **{int(revenue - cost):,}원** (판매시점에 전액 인식)" if cost is not None else ""
+        insight = f"""
+        **📊 분석 리포트 (장기할부판매)**
+        1. **매출 인식**: 명목 대금 {int(nominal):,}원이 아니라 계약금 {int(down_payment):,}원 + 할부금 현재가치 {int(receivable):,}원 = **{int(revenue):,}원**을 판매시점 매출로 인식합니다.
+        2. **이자수익**: 차이 **{int(nominal - revenue):,}원**은 {periods}년에 걸쳐 유효이자율({rate * 100:g}%)로 이자수익이 됩니다. 1차년도 이자수익은 **{int(df.loc[1, '이자수익']):,}원**입니다.
+        3. **채권 추세**: 매출채권 장부금액이 {int(df['기말매출채권'].iloc[0]):,}원에서 0원으로 줄어듭니다.{gp_line}
+        """
+        return int(revenue), df, insight
+
+    @staticmethod
+    def sweep(kind, params, param, values):
+        """
+        민감도 분석: params(simulator_defaults 형식)에서 param 하나만 values 범위로 바꿔가며 한 번에 계산
+        리턴: (paths, headline, insight)
+          paths    : DataFrame (index = 파라미터 값, columns = 연도 0..T) 장부금액 경로 -> 히트맵
+          headline : Series (index = 파라미터 값) 대표 결과 -> 곡선
+            bond: 발행가 / depreciation: 1차년도 상각비 / entity_equity: 기말장부
+        """
+        if param not in SWEEP_PARAMS.get(kind, {}):
+            raise ValueError(f"민감도 분석을 지원하지 않는 파라미터: {kind}.{param}")
+        v = np.asarray(values, dtype=float)
+        p = dict(params, **{param: v})
+        if kind == "bond":
+            n = int(p.get('periods', 3))
+            t = np.arange(n + 1)
+            # t년 말 장부금액 = 남은 현금흐름의 현재가치
+            book = bond_prices(p.get('face', 100000), np.reshape(p.get('crate', 0.05), (-1, 1)), np.reshape(p.get('mrate', 0.08), (-1, 1)), n - t)
+            headline, head_name = book[:, 0], "발행가"
+        elif kind == "depreciation":
+            n = int(p.get('life', 5))
+            method = p.get('method', "SL") if param != "rate" else "DB"
+            book = depreciation_path_grid(p.get('cost', 1000), p.get('residual', 100), n, method, p.get('rate') if method == "DB" else None)
+            headline, head_name = book[:, 0] - book[:, 1], "1차년도 상각비"
+        else:
+            years = p.get('years') or [{}] * 3
+            ni = np.array([y.get('net_income', params.get('net_income', 0)) for y in years], dtype=float)
+            dv = np.array([y.get('dividends', params.get('dividends', 0)) for y in years], dtype=float)
+            share = np.reshape(p.get('share', 0.2), (-1, 1))
+            if param == "net_income":
+                ni = np.broadcast_to(v[:, None], (len(v), len(years)))
+            book = equity_method_paths(p.get('cost', 1000), share, ni, dv)["기말장부"]
+            headline, head_name = book[:, -1], "기말장부"
+
+        label = SWEEP_PARAMS[kind][param]
+        index = pd.Index(v, name=label)
+        paths = pd.DataFrame(np.broadcast_to(book, (len(v), book.shape[-1])), index=index,
+                             columns=pd.RangeIndex(0, book.shape[-1], name="연도"))
+        headline = pd.Series(np.broadcast_to(headline, v.shape), index=index, name=head_name)
+
+        lo, hi = headline.idxmin(), headline.idxmax()
+        insight = f"""
+        **📊 분석 리포트 ({label} {v.min():g} ~ {v.max():g}, {len(v)}개 값)**
+        1. **{head_name} 범위**: {int(headline.min()):,}원 ({label} {lo:g}) ~ {int(headline.max()):,}원 ({label} {hi:g})
+        2. **방향**: {label} 값이 커질수록 {head_name}는 {('커집니다' if headline.iloc[-1] > headline.iloc[0] else ('작아집니다' if headline.iloc[-1] < headline.iloc[0] else '변하지 않습니다'))}.
+        3. **히트맵**: 아래 표는 {label} 값(행)별 연도(열) 장부금액입니다.
+        """
+        return paths, headline, insight
\ No newline at end of file
@@ -0,0 +1,217 @@
+"""
+Accoun-T 스냅샷 도구
+
+Firestore의 questions / courses / user_notes / exam_attempts / user_stats 컬렉션을 페이지 단위로 읽어
+gzip JSONL 파일 + manifest.json 형태로 저장하고, 저장된 스냅샷을 다시
+로컬 저장소(storage.SQLiteStorage)에 올려 앱을 Firestore 없이 부팅할 수 있게 해준다.
+
+사용 예:
+    python snapshot.py export --out snapshots/20260101 --credentials key.json
+    python snapshot.py verify snapshots/20260101
+"""
+import argparse
+import datetime
+import gzip
+import hashlib
+import io
+import json
+import os
+import zipfile
+
+SNAPSHOT_FORMAT = "account-t-snapshot"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_COLLECTIONS = ("questions", "courses", "user_notes", "exam_attempts", "user_stats")
+# 부모 컬렉션 -> 서브컬렉션. 스냅샷에서는 "<부모>.<서브>" 이름, 문서 ID "<부모ID>/<문서ID>" 로 저장
+SNAPSHOT_SUBCOLLECTIONS = {"courses": "chapters"}
+MANIFEST_NAME = "manifest.json"
+DEFAULT_PAGE_SIZE = 500
+
+
+def _json_default(value):
+    """Firestore 전용 타입(Timestamp 등)을 JSON으로 직렬화"""
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.hex()
+    return str(value)
+
+
+def document_path(snapshot_name, doc_id):
+    """스냅샷의 (컬렉션 이름, 문서 ID) -> 저장소의 (컬렉션 경로, 문서 ID)"""
+    if "." not in snapshot_name:
+        return snapshot_name, doc_id
+    parent, sub = snapshot_name.split(".", 1)
+    parent_id, child_id = str(doc_id).split("/", 1)
+    return f"{parent}/{parent_id}/{sub}", child_id
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# =========================================================
+# 1. Export (저장소 -> 파일)
+# =========================================================
+def export_snapshot(store, out_dir, collections=SNAPSHOT_COLLECTIONS, page_size=DEFAULT_PAGE_SIZE, on_page=None):
+    """
+    store(storage.Storage)의 iter_pages로 컬렉션을 페이지 단위로 읽어
+    컬렉션별 <name>.jsonl.gz 파일을 만들고 manifest.json을 기록한다.
+    한 줄 = {"id": 문서ID, "data": 문서내용}
+    on_page(collection_name, count_so_far): 진행상황 콜백 (선택사항)
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "page_size": page_size,
+        "collections": {},
+    }
+
+    def write_collection(name, sources):
+        """sources: [(저장소 컬렉션 경로, 문서 ID 앞에 붙일 접두어), ...] -> <name>.jsonl.gz"""
+        file_name = f"{name}.jsonl.gz"
+        path = os.path.join(out_dir, file_name)
+        count, ids = 0, []
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            for collection_path, prefix in sources:
+                for page in store.iter_pages(collection_path, page_size):
+                    for doc_id, data in page:
+                        line = {"id": prefix + str(doc_id), "data": data}
+                        f.write(json.dumps(line, ensure_ascii=False, default=_json_default))
+                        f.write("\n")
+                        count += 1
+                        ids.append(doc_id)
+                    if on_page: on_page(name, count)
+        manifest["collections"][name] = {
+            "file": file_name,
+            "count": count,
+            "sha256": _sha256(path),
+            "bytes": os.path.getsize(path),
+        }
+        return ids
+
+    for name in collections:
+        ids = write_collection(name, [(name, "")])
+        sub = SNAPSHOT_SUBCOLLECTIONS.get(name)
+        if sub:
+            write_collection(f"{name}.{sub}", [(f"{name}/{pid}/{sub}", f"{pid}/") for pid in ids])
+
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return manifest
+
+
+def snapshot_to_zip_bytes(snapshot_dir):
+    """관리자 화면 다운로드용: 스냅샷 폴더를 zip 바이트로 묶기"""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as zf:  # 이미 gzip 압축됨
+        for file_name in sorted(os.listdir(snapshot_dir)):
+            zf.write(os.path.join(snapshot_dir, file_name), arcname=file_name)
+    return buf.getvalue()
+
+
+# =========================================================
+# 2. Load (파일 -> 메모리)
+# =========================================================
+def read_manifest(snapshot_dir):
+    with open(os.path.join(snapshot_dir, MANIFEST_NAME), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"스냅샷 형식이 아닙니다: {snapshot_dir}")
+    if manifest.get("version", 0) > SNAPSHOT_VERSION:
+        raise ValueError(f"지원하지 않는 스냅샷 버전입니다: {manifest.get('version')}")
+    return manifest
+
+
+def iter_snapshot_docs(snapshot_dir, collection_name, manifest=None):
+    """(문서ID, 문서내용) 을 한 줄씩 읽어서 돌려준다"""
+    manifest = manifest or read_manifest(snapshot_dir)
+    info = manifest["collections"].get(collection_name)
+    if not info:
+        return
+    with gzip.open(os.path.join(snapshot_dir, info["file"]), "rt", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip(): continue
+            row = json.loads(line)
+            yield row["id"], row["data"]
+
+
+def verify_snapshot(snapshot_dir, manifest=None):
+    """manifest의 sha256과 실제 파일을 비교 (손상 시 ValueError)"""
+    manifest = manifest or read_manifest(snapshot_dir)
+    for name, info in manifest["collections"].items():
+        if _sha256(os.path.join(snapshot_dir, info["file"])) != info["sha256"]:
+            raise ValueError(f"스냅샷 파일이 손상되었습니다: {info['file']}")
+    return manifest
+
+
+def load_snapshot(snapshot_dir, collections=None, verify=True):
+    """스냅샷 폴더를 {컬렉션: {문서ID: 문서내용}} 형태로 로드"""
+    manifest = verify_snapshot(snapshot_dir) if verify else read_manifest(snapshot_dir)
+    names = collections or list(manifest["collections"].keys())
+    data = {}
+    for name in names:
+        info = manifest["collections"].get(name)
+        data[name] = dict(iter_snapshot_docs(snapshot_dir, name, manifest))
+        if info and verify and len(data[name]) != info["count"]:
+            raise ValueError(f"문서 수 불일치: {name} ({len(data[name])} != {info['count']})")
+    return data
+
+
+# =========================================================
+# 3. CLI
+# =========================================================
+def _firestore_storage(credentials_path=None):
+    """서비스계정 JSON 또는 .streamlit/secrets.toml 의 [firestore] 섹션으로 접속"""
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+
+    if not firebase_admin._apps:
+        if credentials_path:
+            cred = credentials.Certificate(credentials_path)
+        else:
+            import tomllib
+            with open(os.path.join(".streamlit", "secrets.toml"), "rb") as f:
+                key_dict = dict(tomllib.load(f)["firestore"])
+            if "private_key" in key_dict:
+                key_dict["private_key"] = key_dict["private_key"].replace("\\n", "\n")
+            cred = credentials.Certificate(key_dict)
+        firebase_admin.initialize_app(cred)
+    import storage
+    return storage.FirestoreStorage(firestore.client())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Accoun-T Firestore 스냅샷 도구")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_exp = sub.add_parser("export", help="Firestore -> 스냅샷 폴더")
+    p_exp.add_argument("--out", default=os.path.join("snapshots", datetime.datetime.now().strftime("%Y%m%d_%H%M%S")))
+    p_exp.add_argument("--credentials", default=None, help="서비스계정 JSON 경로 (없으면 .streamlit/secrets.toml)")
+    p_exp.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    p_exp.add_argument("--collections", nargs="+", default=list(SNAPSHOT_COLLECTIONS))
+
+    p_ver = sub.add_parser("verify", help="스냅샷 무결성 확인")
+    p_ver.add_argument("path")
+
+    args = parser.parse_args(argv)
+    if args.command == "export":
+        store = _firestore_storage(args.credentials)
+        manifest = export_snapshot(
+            store, args.out, args.collections, args.page_size,
+            on_page=lambda name, n: print(f"  {name}: {n:,}", flush=True),
+        )
+        print(json.dumps(manifest, indent=2, ensure_ascii=False))
+    elif args.command == "verify":
+        data = load_snapshot(args.path)
+        for name, docs in data.items():
+            print(f"{name}: {len(docs):,} docs OK")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
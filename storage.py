@@ -0,0 +1,528 @@
+"""
+Accoun-T 저장소 계층
+
+앱의 데이터 함수들은 Firestore 클라이언트를 직접 쓰지 않고 Storage 인터페이스를 통해
+읽고 쓴다. 구현체는 두 가지:
+  - FirestoreStorage : 운영용 (firebase_admin Firestore 클라이언트)
+  - SQLiteStorage    : 로컬/오프라인용 (파일 또는 ":memory:"), 스냅샷으로 초기 데이터 적재 가능
+
+설정 (secrets.toml 의 [storage] 섹션 또는 환경변수):
+    backend = "firestore" | "sqlite"        (ACCOUNT_T_STORAGE)
+    path    = "data/account_t.db"           (ACCOUNT_T_SQLITE_PATH, 기본 ":memory:")
+    seed_snapshot = "snapshots/20260101"    (ACCOUNT_T_SNAPSHOT, DB가 비어있을 때만 적재)
+"""
+import contextvars
+import datetime
+import json
+import os
+import sqlite3
+import threading
+
+import perf
+import snapshot
+
+
+def _index_keys(collection_name, data):
+    """SQLite 보조 인덱스 컬럼(k1, k2, k3) 추출: 컬렉션별로 자주 찾는 필드"""
+    if collection_name == "questions":
+        info = data.get("exam_info") or {}
+        if not isinstance(info, dict): info = {}
+        return info.get("type"), info.get("year"), None
+    if collection_name == "user_notes":
+        return data.get("user_id"), data.get("course_id"), data.get("chapter_id")
+    if collection_name == "courses":
+        return data.get("engine_type"), None, None
+    if collection_name == "exam_attempts":
+        return data.get("user_id"), data.get("exam_type"), data.get("exam_year")
+    if collection_name == "user_stats":
+        return data.get("user_id"), None, None
+    return None, None, None
+
+
+def _key(value):
+    return None if value is None else str(value)
+
+
+def _merge_nested(dst, src, add=False):
+    """중첩 dict 병합 (add=True 면 숫자는 더하고, 아니면 덮어쓴다)"""
+    for k, v in src.items():
+        if isinstance(v, dict):
+            if not isinstance(dst.get(k), dict): dst[k] = {}
+            _merge_nested(dst[k], v, add)
+        elif add:
+            dst[k] = (dst.get(k) or 0) + v
+        else:
+            dst[k] = v
+    return dst
+
+
+# =========================================================
+# 1. 인터페이스
+# =========================================================
+class Storage:
+    """저장소 인터페이스 (문서 단위 CRUD + 자주 쓰는 조회)"""
+    backend = "base"
+
+    # --- 문서 단위 ---
+    def get_document(self, collection_name, doc_id):
+        raise NotImplementedError
+
+    def set_document(self, collection_name, doc_id, data):
+        raise NotImplementedError
+
+    def update_document(self, collection_name, doc_id, fields):
+        """일부 필드만 갱신 (문서가 없으면 KeyError)"""
+        raise NotImplementedError
+
+    def delete_document(self, collection_name, doc_id):
+        raise NotImplementedError
+
+    def increment_document(self, collection_name, doc_id, increments, fields=None):
+        """
+        중첩 dict increments 의 숫자만큼 원자적으로 더하고 fields 는 덮어쓴다 (문서가 없으면 생성).
+        누적 집계(user_stats)를 전체 이력 재계산 없이 갱신할 때 사용.
+        """
+        raise NotImplementedError
+
+    def save_batch(self, collection_name, items, id_field):
+        """id_field가 있는 항목만 한 번에 저장하고 저장 건수를 리턴"""
+        raise NotImplementedError
+
+    # --- 조회 ---
+    def list_documents(self, collection_name):
+        raise NotImplementedError
+
+    def list_document_fields(self, collection_name, fields):
+        """문서마다 지정한 최상위 필드만 (없는 필드는 빠짐). 큰 본문 필드를 읽지 않을 때 사용"""
+        return [{k: d[k] for k in fields if k in d} for d in self.list_documents(collection_name)]
+
+    def iter_pages(self, collection_name, page_size=snapshot.DEFAULT_PAGE_SIZE):
+        """문서 ID 순으로 [(doc_id, data), ...] 페이지를 차례로 돌려준다 (스냅샷용)"""
+        raise NotImplementedError
+
+    def find_exam_questions(self, exam_type, exam_year):
+        """특정 시험(유형, 연도)의 문제들"""
+        raise NotImplementedError
+
+    def find_user_notes(self, user_id, course_id=None, chapter_id=None):
+        raise NotImplementedError
+
+    def server_timestamp(self):
+        """updated_at 등에 넣을 '저장 시각' 값"""
+        return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+    # --- 편의 함수 ---
+    def list_questions(self):
+        return self.list_documents("questions")
+
+    def list_courses(self):
+        return self.list_documents("courses")
+
+    def get_question(self, question_id):
+        return self.get_document("questions", question_id)
+
+
+# =========================================================
+# 2. Firestore 구현
+# =========================================================
+class FirestoreStorage(Storage):
+    backend = "firestore"
+
+    def __init__(self, client):
+        self.client = client
+
+    def _doc(self, collection_name, doc_id):
+        return self.client.collection(collection_name).document(str(doc_id))
+
+    def get_document(self, collection_name, doc_id):
+        doc = self._doc(collection_name, doc_id).get()
+        return doc.to_dict() if doc.exists else None
+
+    def set_document(self, collection_name, doc_id, data):
+        self._doc(collection_name, doc_id).set(data)
+
+    def update_document(self, collection_name, doc_id, fields):
+        from google.api_core.exceptions import NotFound
+        try:
+            self._doc(collection_name, doc_id).update(fields)
+        except NotFound:
+            raise KeyError(f"No document to update: {collection_name}/{doc_id}")
+
+    def delete_document(self, collection_name, doc_id):
+        self._doc(collection_name, doc_id).delete()
+
+    def increment_document(self, collection_name, doc_id, increments, fields=None):
+        from firebase_admin import firestore
+
+        def as_increments(d):
+            return {k: as_increments(v) if isinstance(v, dict) else firestore.Increment(v) for k, v in d.items()}
+        # set(merge=True) 는 중첩 map 을 병합하고, Increment 는 서버에서 더해진다
+        self._doc(collection_name, doc_id).set(_merge_nested(as_increments(increments), fields or {}), merge=True)
+
+    def save_batch(self, collection_name, items, id_field):
+        batch = self.client.batch()
+        count = 0
+        for item in items:
+            if id_field in item:
+                batch.set(self._doc(collection_name, item[id_field]), item)
+                count += 1
+        batch.commit()
+        return count
+
+    def list_documents(self, collection_name):
+        return [doc.to_dict() for doc in self.client.collection(collection_name).stream()]
+
+    def list_document_fields(self, collection_name, fields):
+        # projection 쿼리: 지정한 필드만 전송된다
+        return [doc.to_dict() for doc in self.client.collection(collection_name).select(list(fields)).stream()]
+
+    def iter_pages(self, collection_name, page_size=snapshot.DEFAULT_PAGE_SIZE):
+        from firebase_admin import firestore
+
+        base = self.client.collection(collection_name).order_by(firestore.FieldPath.document_id()).limit(page_size)
+        last_doc = None
+        while True:
+            query = base.start_after(last_doc) if last_doc is not None else base
+            docs = list(query.stream())
+            if not docs:
+                break
+            yield [(doc.id, doc.to_dict()) for doc in docs]
+            if len(docs) < page_size:
+                break
+            last_doc = docs[-1]
+
+    def find_exam_questions(self, exam_type, exam_year):
+        from google.cloud.firestore_v1.base_query import FieldFilter
+
+        query = (self.client.collection("questions")
+                 .where(filter=FieldFilter("exam_info.type", "==", exam_type))
+                 .where(filter=FieldFilter("exam_info.year", "==", exam_year)))
+        return [doc.to_dict() for doc in query.stream()]
+
+    def find_user_notes(self, user_id, course_id=None, chapter_id=None):
+        from google.cloud.firestore_v1.base_query import FieldFilter
+
+        query = self.client.collection("user_notes").where(filter=FieldFilter("user_id", "==", user_id))
+        if course_id is not None:
+            query = query.where(filter=FieldFilter("course_id", "==", course_id))
+        if chapter_id is not None:
+            query = query.where(filter=FieldFilter("chapter_id", "==", chapter_id))
+        return [doc.to_dict() for doc in query.stream()]
+
+    def server_timestamp(self):
+        from firebase_admin import firestore
+        return firestore.SERVER_TIMESTAMP
+
+
+# =========================================================
+# 3. SQLite 구현 (로컬/오프라인)
+# =========================================================
+class SQLiteStorage(Storage):
+    """
+    모든 컬렉션을 docs 테이블 하나에 JSON으로 저장한다.
+    (collection, doc_id) 가 기본키이고, k1~k3 는 컬렉션별 조회 키:
+      questions  : exam_type, exam_year
+      user_notes : user_id, course_id, chapter_id
+      courses    : engine_type
+      exam_attempts : user_id, exam_type, exam_year
+      user_stats : user_id
+    서브컬렉션은 "courses/{course_id}/chapters" 같은 경로 문자열을 컬렉션 이름으로 쓴다.
+    """
+    backend = "sqlite"
+
+    def __init__(self, path=":memory:"):
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        # Streamlit 세션(스레드)들이 연결 하나를 공유하므로 직접 잠금
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS docs (
+                    collection TEXT NOT NULL,
+                    doc_id     TEXT NOT NULL,
+                    data       TEXT NOT NULL,
+                    k1 TEXT, k2 TEXT, k3 TEXT,
+                    PRIMARY KEY (collection, doc_id)
+                )""")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_docs_keys ON docs (collection, k1, k2, k3)")
+
+    def _put(self, collection_name, doc_id, data):
+        k1, k2, k3 = _index_keys(collection_name, data)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO docs (collection, doc_id, data, k1, k2, k3) VALUES (?, ?, ?, ?, ?, ?)",
+            (collection_name, str(doc_id), json.dumps(data, ensure_ascii=False, default=str), _key(k1), _key(k2), _key(k3)),
+        )
+
+    def _select(self, sql, params):
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def get_document(self, collection_name, doc_id):
+        rows = self._select("SELECT data FROM docs WHERE collection = ? AND doc_id = ?", (collection_name, str(doc_id)))
+        return rows[0] if rows else None
+
+    def set_document(self, collection_name, doc_id, data):
+        with self._lock, self._conn:
+            self._put(collection_name, doc_id, data)
+
+    def update_document(self, collection_name, doc_id, fields):
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT data FROM docs WHERE collection = ? AND doc_id = ?", (collection_name, str(doc_id))
+            ).fetchone()
+            if row is None:
+                raise KeyError(f"No document to update: {collection_name}/{doc_id}")
+            data = json.loads(row[0])
+            data.update(fields)
+            self._put(collection_name, doc_id, data)
+
+    def delete_document(self, collection_name, doc_id):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM docs WHERE collection = ? AND doc_id = ?", (collection_name, str(doc_id)))
+
+    def increment_document(self, collection_name, doc_id, increments, fields=None):
+        with self._lock, self._conn:  # 읽기-더하기-쓰기를 한 트랜잭션으로
+            row = self._conn.execute(
+                "SELECT data FROM docs WHERE collection = ? AND doc_id = ?", (collection_name, str(doc_id))
+            ).fetchone()
+            data = json.loads(row[0]) if row else {}
+            _merge_nested(data, increments, add=True)
+            _merge_nested(data, fields or {})
+            self._put(collection_name, doc_id, data)
+
+    def save_batch(self, collection_name, items, id_field):
+        count = 0
+        with self._lock, self._conn:  # 한 트랜잭션으로 저장
+            for item in items:
+                if id_field in item:
+                    self._put(collection_name, item[id_field], item)
+                    count += 1
+        return count
+
+    def list_documents(self, collection_name):
+        return self._select("SELECT data FROM docs WHERE collection = ? ORDER BY doc_id", (collection_name,))
+
+    def list_document_fields(self, collection_name, fields):
+        fields = list(fields)
+        marks = ", ".join("?" * len(fields))
+        return self._select(
+            f"SELECT (SELECT json_group_object(key, value) FROM json_each(docs.data) WHERE key IN ({marks})) "
+            "FROM docs WHERE collection = ? ORDER BY doc_id",
+            (*fields, collection_name),
+        )
+
+    def iter_pages(self, collection_name, page_size=snapshot.DEFAULT_PAGE_SIZE):
+        last_id = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT doc_id, data FROM docs WHERE collection = ? AND doc_id > ? ORDER BY doc_id LIMIT ?",
+                    (collection_name, last_id, page_size),
+                ).fetchall()
+            if not rows:
+                break
+            yield [(doc_id, json.loads(data)) for doc_id, data in rows]
+            if len(rows) < page_size:
+                break
+            last_id = rows[-1][0]
+
+    def find_exam_questions(self, exam_type, exam_year):
+        return self._select(
+            "SELECT data FROM docs WHERE collection = 'questions' AND k1 = ? AND k2 = ? ORDER BY doc_id",
+            (_key(exam_type), _key(exam_year)),
+        )
+
+    def find_user_notes(self, user_id, course_id=None, chapter_id=None):
+        sql = "SELECT data FROM docs WHERE collection = 'user_notes' AND k1 = ?"
+        params = [_key(user_id)]
+        if course_id is not None:
+            sql += " AND k2 = ?"; params.append(_key(course_id))
+        if chapter_id is not None:
+            sql += " AND k3 = ?"; params.append(_key(chapter_id))
+        return self._select(sql + " ORDER BY doc_id", params)
+
+    def is_empty(self):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM docs LIMIT 1").fetchone() is None
+
+    def import_snapshot(self, snapshot_dir, collections=None):
+        """스냅샷 폴더의 문서들을 그대로 적재 (문서 ID 유지). 컬렉션별 적재 건수 리턴"""
+        manifest = snapshot.verify_snapshot(snapshot_dir)
+        counts = {}
+        for name in collections or list(manifest["collections"].keys()):
+            n = 0
+            with self._lock, self._conn:
+                for doc_id, data in snapshot.iter_snapshot_docs(snapshot_dir, name, manifest):
+                    self._put(*snapshot.document_path(name, doc_id), data)  # 서브컬렉션은 원래 경로로
+                    n += 1
+            counts[name] = n
+        return counts
+
+
+# =========================================================
+# 4. 사용량 집계 래퍼 (문서 읽기/쓰기/삭제 수, 대략적인 바이트)
+# =========================================================
+_current_session = contextvars.ContextVar("storage_session", default="-")
+
+
+def set_current_session(session_id):
+    """이번 rerun(스레드)의 세션 ID. MeteredStorage 가 세션별로 집계할 때 사용"""
+    _current_session.set(session_id or "-")
+
+
+class MeteredStorage(Storage):
+    """
+    다른 Storage 를 감싸서 호출마다 문서 단위 읽기/쓰기/삭제 수와 대략적인 payload 바이트를
+    (세션, 기능) 별로 센다. 기능 태그는 perf.span 이름 (예: student.tab3_questions).
+    Firestore 과금 기준에 맞춰 조회는 결과가 0건이어도 읽기 1회로 센다.
+    """
+    BYTES_SAMPLE = 20  # 바이트는 앞쪽 N개 문서 평균 × 문서 수로 추정 (대량 조회 시 JSON 직렬화 비용 절약)
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.backend = inner.backend
+        self._lock = threading.Lock()
+        self._stats = {}  # (session, feature) -> {reads, writes, deletes, bytes_read, bytes_written, calls}
+
+    def __getattr__(self, name):  # import_snapshot, is_empty 등 구현체 전용 메서드
+        return getattr(self.inner, name)
+
+    @classmethod
+    def _approx_bytes(cls, docs):
+        docs = [d for d in docs if d is not None]
+        if not docs:
+            return 0
+        sample = docs[:cls.BYTES_SAMPLE]
+        size = sum(len(json.dumps(d, ensure_ascii=False, default=str).encode("utf-8")) for d in sample)
+        return int(size / len(sample) * len(docs))
+
+    def _count(self, reads=0, writes=0, deletes=0, bytes_read=0, bytes_written=0):
+        key = (_current_session.get(), perf.current_feature())
+        with self._lock:
+            row = self._stats.setdefault(key, {"calls": 0, "reads": 0, "writes": 0, "deletes": 0, "bytes_read": 0, "bytes_written": 0})
+            row["calls"] += 1
+            row["reads"] += reads
+            row["writes"] += writes
+            row["deletes"] += deletes
+            row["bytes_read"] += bytes_read
+            row["bytes_written"] += bytes_written
+
+    # --- 읽기 ---
+    def get_document(self, collection_name, doc_id):
+        doc = self.inner.get_document(collection_name, doc_id)
+        self._count(reads=1, bytes_read=self._approx_bytes([doc]))
+        return doc
+
+    def list_documents(self, collection_name):
+        docs = self.inner.list_documents(collection_name)
+        self._count(reads=max(len(docs), 1), bytes_read=self._approx_bytes(docs))
+        return docs
+
+    def list_document_fields(self, collection_name, fields):
+        docs = self.inner.list_document_fields(collection_name, fields)
+        self._count(reads=max(len(docs), 1), bytes_read=self._approx_bytes(docs))
+        return docs
+
+    def iter_pages(self, collection_name, page_size=snapshot.DEFAULT_PAGE_SIZE):
+        for page in self.inner.iter_pages(collection_name, page_size):
+            self._count(reads=len(page), bytes_read=self._approx_bytes([d for _, d in page]))
+            yield page
+
+    def find_exam_questions(self, exam_type, exam_year):
+        docs = self.inner.find_exam_questions(exam_type, exam_year)
+        self._count(reads=max(len(docs), 1), bytes_read=self._approx_bytes(docs))
+        return docs
+
+    def find_user_notes(self, user_id, course_id=None, chapter_id=None):
+        docs = self.inner.find_user_notes(user_id, course_id, chapter_id)
+        self._count(reads=max(len(docs), 1), bytes_read=self._approx_bytes(docs))
+        return docs
+
+    # --- 쓰기 ---
+    def set_document(self, collection_name, doc_id, data):
+        self.inner.set_document(collection_name, doc_id, data)
+        self._count(writes=1, bytes_written=self._approx_bytes([data]))
+
+    def update_document(self, collection_name, doc_id, fields):
+        self.inner.update_document(collection_name, doc_id, fields)
+        self._count(writes=1, bytes_written=self._approx_bytes([fields]))
+
+    def delete_document(self, collection_name, doc_id):
+        self.inner.delete_document(collection_name, doc_id)
+        self._count(deletes=1)
+
+    def increment_document(self, collection_name, doc_id, increments, fields=None):
+        self.inner.increment_document(collection_name, doc_id, increments, fields)
+        self._count(writes=1, bytes_written=self._approx_bytes([{**increments, **(fields or {})}]))
+
+    def save_batch(self, collection_name, items, id_field):
+        count = self.inner.save_batch(collection_name, items, id_field)
+        self._count(writes=count, bytes_written=self._approx_bytes([i for i in items if id_field in i]))
+        return count
+
+    def server_timestamp(self):
+        return self.inner.server_timestamp()
+
+    # --- 집계 조회 ---
+    def usage(self, by=("session", "feature")):
+        """집계 행 리스트. by 로 묶는 기준을 고른다 (("feature",) 면 세션 합산)"""
+        with self._lock:
+            items = [(dict(zip(("session", "feature"), key)), dict(row)) for key, row in self._stats.items()]
+        merged = {}
+        for key, row in items:
+            group = tuple(key[k] for k in by)
+            acc = merged.setdefault(group, dict.fromkeys(row, 0))
+            for k, v in row.items(): acc[k] += v
+        return [dict(zip(by, group), **row) for group, row in sorted(merged.items())]
+
+    def reset_usage(self):
+        with self._lock:
+            self._stats.clear()
+
+    def prometheus_text(self, metric="accountt_storage"):
+        lines = []
+        rows = self.usage(by=("feature",))
+        for field, kind in (("reads", "docs"), ("writes", "docs"), ("deletes", "docs"), ("bytes_read", "bytes"), ("bytes_written", "bytes")):
+            name = f"{metric}_{field}_total"
+            lines.append(f"# TYPE {name} counter")
+            for row in rows:
+                lines.append(f'{name}{{backend="{self.backend}",feature="{row["feature"]}",unit="{kind}"}} {row[field]}')
+        return "\n".join(lines) + "\n"
+
+
+# =========================================================
+# 5. 설정 -> 저장소 생성
+# =========================================================
+def storage_config_from_env(section=None):
+    """secrets.toml [storage] 섹션(dict)에 환경변수를 덮어써서 최종 설정을 만든다"""
+    conf = dict(section or {})
+    if os.environ.get("ACCOUNT_T_STORAGE"): conf["backend"] = os.environ["ACCOUNT_T_STORAGE"]
+    if os.environ.get("ACCOUNT_T_SQLITE_PATH"): conf["path"] = os.environ["ACCOUNT_T_SQLITE_PATH"]
+    if os.environ.get("ACCOUNT_T_SNAPSHOT"): conf["seed_snapshot"] = os.environ["ACCOUNT_T_SNAPSHOT"]
+    # 스냅샷만 지정한 경우: 메모리 SQLite에 스냅샷을 올려서 부팅
+    if "backend" not in conf and conf.get("seed_snapshot"):
+        conf["backend"] = "sqlite"
+    conf.setdefault("backend", "firestore")
+    return conf
+
+
+def create_storage(conf, firestore_client_factory=None):
+    """
+    conf['backend'] 에 맞는 Storage를 만든다.
+    firestore_client_factory: Firestore 클라이언트를 만드는 함수 (인증은 호출하는 쪽 담당)
+    """
+    backend = conf.get("backend", "firestore")
+    if backend == "firestore":
+        if firestore_client_factory is None:
+            raise ValueError("Firestore 백엔드에는 클라이언트 생성 함수가 필요합니다.")
+        return FirestoreStorage(firestore_client_factory())
+    if backend == "sqlite":
+        store = SQLiteStorage(conf.get("path", ":memory:"))
+        seed = conf.get("seed_snapshot")
+        if seed and store.is_empty():
+            store.import_snapshot(seed)
+        return store
+    raise ValueError(f"알 수 없는 저장소 백엔드: {backend}")
\ No newline at end of file